@@ -1,8 +1,24 @@
+import io
+import secrets
 import streamlit as st
 import pandas as pd
-import joblib
-import plotly.graph_objects as go
-import plotly.express as px
+
+# plotly is imported lazily when a chart first renders; the model is served from the
+# slim JSON artifact when available, so neither sklearn nor joblib load at startup
+from scoring import (
+    FEATURE_COLUMNS, TIER_LABELS, TARGET_COLUMN,
+    PASS_THRESHOLD, DISTINCTION_THRESHOLD, write_scored_csv,
+)
+from registry import ModelRegistry
+from telemetry import TELEMETRY, span
+from render import minify_css, compact_html, gauge_figure, fill_gauge, driver_figure, fill_drivers
+from whatif import SWEEP_LABELS, sweep
+from optimizer import TIER_TARGETS, plan_for
+from peers import SLICE_FEATURES, PeerIndex
+from attribution import FEATURE_LABELS, Attributor
+from fairness import BIAS_THRESHOLD, MIN_SLICE_ROWS, audit_frame
+from validation import ERROR, validate_frame
+from auditlog import AuditLog
 
 # ==========================================
 # 1. Page Configuration
@@ -19,7 +35,7 @@ st.set_page_config(
 # Inspired by: Bloomberg Terminal × Vercel Dashboard
 # Fonts: DM Mono (monospace data) + Syne (bold headings)
 # ==========================================
-st.markdown("""
+APP_CSS = """
 <link rel="preconnect" href="https://fonts.googleapis.com">
 <link href="https://fonts.googleapis.com/css2?family=Syne:wght@400;700;800&family=DM+Mono:wght@300;400;500&family=DM+Sans:wght@300;400;500&display=swap" rel="stylesheet">
 
@@ -519,89 +535,100 @@ hr { border-color: var(--border) !important; }
 .plotly .hoverlayer .hovertext { font-family: 'DM Mono', monospace !important; }
 
 </style>
-""", unsafe_allow_html=True)
+"""
 
 
-# ==========================================
-# 2. Model Initialization
-# ==========================================
 @st.cache_resource
-def load_model():
-    return joblib.load('ultimate_student_huber_pipeline.pkl')
+def page_css(css):
+    # Minified once per process; the stylesheet is re-sent on every rerun, so its size is paid each time
+    return minify_css(css)
 
-try:
-    pipeline = load_model()
-    model_loaded = True
-except:
-    model_loaded = False
+with span('render_css'):
+    st.markdown(page_css(APP_CSS), unsafe_allow_html=True)
 
 
 # ==========================================
-# 3. Sidebar
+# 2. Model Initialization
 # ==========================================
-with st.sidebar:
-    # Brand Header
-    st.markdown("""
-    <div class="sidebar-brand">
-        <div class="brand-tag">● EduMetrics AI</div>
-        <div class="brand-name">Student<br>Intelligence</div>
-        <div class="brand-sub">v2.4.1 — Huber Regression Engine</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-    with st.form("student_input_form"):
-        st.markdown('<span class="sidebar-section-label">Study Habits</span>', unsafe_allow_html=True)
-
-        hours_studied    = st.slider("Weekly Study Hours", 0, 40, 10)
-        attendance       = st.slider("Class Attendance (%)", 0, 100, 80)
-        previous_scores  = st.slider("Previous Exam Average", 0, 100, 70)
-        tutoring_sessions= st.slider("Monthly Tutoring Sessions", 0, 10, 0)
-
-        st.markdown('<span class="sidebar-section-label">Lifestyle & Environment</span>', unsafe_allow_html=True)
+@st.cache_resource
+def get_registry():
+    # One per server process: watches models/ and hot-swaps newly published versions once they
+    # pass the golden check; each version has its own micro-batching queue and prediction cache
+    return ModelRegistry().start()
 
-        sleep_hours      = st.slider("Nightly Sleep (hrs)", 4, 12, 7)
-        physical_activity= st.slider("Weekly Exercise (hrs)", 0, 20, 3)
-        extracurriculars = st.selectbox("Extracurricular Activities", ["Yes", "No"])
-        internet_access  = st.selectbox("Reliable Home Internet", ["Yes", "No"])
-        distance_from_home=st.selectbox("Distance to School", ["Near", "Moderate", "Far"])
+@st.cache_resource
+def get_peer_index(version_dir, _predictor):
+    # Built once per model version; each forecast is then binary searches plus one BallTree query
+    return PeerIndex.from_csv(_predictor)
 
-        st.markdown('<span class="sidebar-section-label">Personal Factors</span>', unsafe_allow_html=True)
+@st.cache_resource
+def get_attributor(version_dir, _predictor):
+    return Attributor(_predictor)
 
-        motivation_level = st.select_slider("Motivation Level", ["Low", "Medium", "High"], value="Medium")
-        peer_influence   = st.select_slider("Peer Study Influence", ["Negative", "Neutral", "Positive"], value="Neutral")
-        learning_disabilities = st.selectbox("Documented Learning Disability", ["No", "Yes"])
-        gender           = st.selectbox("Gender", ["Female", "Male"])
+@st.cache_data(max_entries=4)
+def get_fairness_report(file_id, model_hash, _roster_df, _predicted):
+    # The batch tab reruns on every interaction (downloads included); the bootstrap runs once per upload and model
+    return audit_frame(_roster_df, _predicted)
 
-        with st.expander("Household & School Details"):
-            family_income      = st.select_slider("Family Income", ["Low", "Medium", "High"], value="Medium")
-            parental_involvement=st.select_slider("Parental Involvement", ["Low", "Medium", "High"], value="Medium")
-            parental_education = st.selectbox("Parents' Education", ["High School", "College", "Postgraduate"])
-            school_type        = st.selectbox("School Type", ["Public", "Private"])
-            teacher_quality    = st.select_slider("Teacher Quality", ["Low", "Medium", "High"], value="Medium")
+@st.cache_resource
+def get_audit_log():
+    # One writer thread per server process; logging only enqueues, so it never delays a render
+    return AuditLog()
 
-        submitted = st.form_submit_button("▶  Run Prediction Engine")
-        st.markdown('<div class="submit-hint">Analysis powered by ML pipeline</div>', unsafe_allow_html=True)
+def audit_log_or_warn():
+    # The audit trail must never cost a prediction: an unusable log (read-only directory,
+    # a file named audit/) only warns, and the next rerun tries to open it again
+    try:
+        return get_audit_log()
+    except OSError as e:
+        st.warning(f"Prediction audit log unavailable: {e}")
+        return None
 
+# Random per-browser-session id, so the audit trail can group one visitor's predictions
+audit_session = st.session_state.setdefault('audit_session', secrets.randbits(63))
 
-# ==========================================
-# 4. Main Canvas
-# ==========================================
-if not submitted:
+model_error = None
+try:
+    # Snapshot one version for the whole script run, so a swap mid-run never mixes models
+    with span('model_load'):
+        model = get_registry().current()
+    predictor, manifest = model.predictor, model.manifest
+    model_loaded = True
+except (OSError, ValueError, KeyError) as e:
+    model_loaded = False
+    model_error  = str(e)
+
+# Headline numbers come from the loaded model's manifest, never from hard-coded copy
+if model_loaded:
+    stat_students = f"{manifest['data']['rows']:,}"
+    # Online updates only carry test metrics while the original training CSV is still available
+    test_metrics  = manifest.get('test')
+    stat_r2       = f"{test_metrics['r2']:.2f}" if test_metrics else "—"
+    stat_mae      = f"{test_metrics['mae']:.2f}" if test_metrics else "—"
+    model_label   = f"Huber Regression · {manifest['version']}"
+else:
+    stat_students = stat_r2 = stat_mae = "—"
+    model_label   = "Unavailable"
+
+
+@st.cache_data
+def landing_html(model_label, stat_students, stat_r2, stat_mae):
+    # Formatted and compacted once per model version instead of on every rerun
     # ---- STATUS BAR ----
-    st.markdown("""
+    status_bar = f"""
     <div class="status-bar">
         <span class="status-label"><span class="status-dot"></span>&nbsp; System Online</span>
         <span class="status-text">|</span>
-        <span class="status-text">MODEL: Huber Regression</span>
+        <span class="status-text">MODEL: {model_label}</span>
         <span class="status-text">|</span>
-        <span class="status-text">DATASET: 6,607 students</span>
+        <span class="status-text">DATASET: {stat_students} students</span>
         <span class="status-text">|</span>
-        <span class="status-text">ACCURACY: R² = 0.98</span>
+        <span class="status-text">ACCURACY: Test R² = {stat_r2}</span>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
     # ---- HERO ----
-    st.markdown("""
+    hero = """
     <div class="hero-section">
         <div class="hero-eyebrow">● Academic Intelligence Platform</div>
         <div class="hero-title">Predict your<br><span>exam score</span><br>before it happens.</div>
@@ -611,13 +638,13 @@ if not submitted:
             on the left to generate your personal forecast.
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
     # ---- STAT STRIP ----
-    st.markdown("""
+    stat_strip = f"""
     <div class="stat-strip">
         <div class="stat-item">
-            <div class="stat-value">6,607</div>
+            <div class="stat-value">{stat_students}</div>
             <div class="stat-label">Students Analyzed</div>
         </div>
         <div class="stat-item">
@@ -625,18 +652,18 @@ if not submitted:
             <div class="stat-label">Input Features</div>
         </div>
         <div class="stat-item">
-            <div class="stat-value">0.98</div>
-            <div class="stat-label">R² Score</div>
+            <div class="stat-value">{stat_r2}</div>
+            <div class="stat-label">Test R² Score</div>
         </div>
         <div class="stat-item">
-            <div class="stat-value">&lt; 2.1</div>
-            <div class="stat-label">Avg. MAE (Points)</div>
+            <div class="stat-value">{stat_mae}</div>
+            <div class="stat-label">Test MAE (Points)</div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
 
     # ---- FEATURE CARDS ----
-    st.markdown("""
+    feature_cards = """
     <div class="feature-grid">
         <div class="feature-card">
             <span class="feature-icon">📡</span>
@@ -654,275 +681,525 @@ if not submitted:
             <div class="feature-desc">Every insight is tied to a specific input you can change — no generic advice, only targeted interventions.</div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+    return tuple(compact_html(block) for block in (status_bar, hero, stat_strip, feature_cards))
+
+
+def session_figure(name, build, *args):
+    # Styled once per browser session; reruns only write new data into the figure
+    figures = st.session_state.setdefault('figures', {})
+    if name not in figures:
+        figures[name] = build(*args)
+    return figures[name]
 
 
 # ==========================================
-# RESULTS VIEW
+# 3. Sidebar
 # ==========================================
-if submitted:
-    input_data = {
-        'Hours_Studied': hours_studied, 'Attendance': attendance,
-        'Parental_Involvement': parental_involvement, 'Access_to_Resources': 'Medium',
-        'Extracurricular_Activities': extracurriculars, 'Sleep_Hours': sleep_hours,
-        'Previous_Scores': previous_scores, 'Motivation_Level': motivation_level,
-        'Internet_Access': internet_access, 'Tutoring_Sessions': tutoring_sessions,
-        'Family_Income': family_income, 'Teacher_Quality': teacher_quality,
-        'School_Type': school_type, 'Peer_Influence': peer_influence,
-        'Physical_Activity': physical_activity, 'Learning_Disabilities': learning_disabilities,
-        'Parental_Education_Level': parental_education, 'Distance_from_Home': distance_from_home,
-        'Gender': gender
-    }
-
-    try:
-        input_df       = pd.DataFrame([input_data])
-        raw_prediction = pipeline.predict(input_df)[0]
-        final_score    = min(max(raw_prediction, 0.0), 100.0)
-        model_ok       = True
-    except Exception as e:
-        final_score = 72.4   # Demo fallback
-        model_ok    = False
-
-    # ---- Determine grade tier ----
-    if final_score >= 80:
-        tier        = "DISTINCTION"
-        tier_color  = "var(--accent-green)"
-        bar_color   = "#48bb78"
-        badge_class = "badge-success"
-        badge_icon  = "●"
-        headline    = "Excellent trajectory."
-        summary     = "Your current habits are tracking toward a distinction-level result. Maintain consistency and protect your key inputs."
-    elif final_score >= 60:
-        tier        = "PASS"
-        tier_color  = "var(--accent-amber)"
-        bar_color   = "#ed8936"
-        badge_class = "badge-warning"
-        badge_icon  = "◐"
-        headline    = "On track, room to grow."
-        summary     = "You're projected to pass, but targeted improvements to 2–3 inputs could move you into the distinction bracket."
-    else:
-        tier        = "AT RISK"
-        tier_color  = "var(--accent-red)"
-        bar_color   = "#fc8181"
-        badge_class = "badge-danger"
-        badge_icon  = "▲"
-        headline    = "Intervention recommended."
-        summary     = "Current behavioral signals indicate your score may fall below the passing threshold. Prioritize the actions below immediately."
-
-    # ---- Results header ----
-    st.markdown(f"""
-    <div class="results-header">
-        <div class="results-eyebrow">Forecast Generated · {pd.Timestamp.now().strftime("%d %b %Y, %H:%M")}</div>
-        <div class="results-title">Academic Forecast Report</div>
+with st.sidebar:
+    # Brand Header
+    st.markdown("""
+    <div class="sidebar-brand">
+        <div class="brand-tag">● EduMetrics AI</div>
+        <div class="brand-name">Student<br>Intelligence</div>
+        <div class="brand-sub">v2.4.1 — Huber Regression Engine</div>
     </div>
     """, unsafe_allow_html=True)
 
-    # ---- Main two-column layout ----
-    col_gauge, col_insights = st.columns([1.1, 1], gap="large")
-
-    # === LEFT: Gauge + Metrics ===
-    with col_gauge:
-        st.markdown('<div class="score-panel">', unsafe_allow_html=True)
-        st.markdown(f'<div class="panel-label">Projected Score</div>', unsafe_allow_html=True)
-
-        # Plotly gauge — dark industrial style
-        fig = go.Figure(go.Indicator(
-            mode  = "gauge+number",
-            value = final_score,
-            domain= {'x': [0, 1], 'y': [0, 1]},
-            number= {
-                'font': {'size': 72, 'color': '#e8eaf0', 'family': 'Syne'},
-                'valueformat': ".1f",
-                'suffix': ''
-            },
-            gauge={
-                'axis': {
-                    'range': [0, 100],
-                    'tickwidth': 1,
-                    'tickcolor': '#2a2f3e',
-                    'tickfont': {'color': '#4a5068', 'family': 'DM Mono', 'size': 10},
-                    'nticks': 6,
-                },
-                'bar':      {'color': bar_color, 'thickness': 0.22},
-                'bgcolor':  'rgba(0,0,0,0)',
-                'borderwidth': 0,
-                'steps': [
-                    {'range': [0,  60],  'color': 'rgba(252,129,129,0.06)'},
-                    {'range': [60, 80],  'color': 'rgba(246,173,85,0.06)'},
-                    {'range': [80, 100], 'color': 'rgba(104,211,145,0.06)'},
-                ],
-                'threshold': {
-                    'line': {'color': '#e8eaf0', 'width': 2},
-                    'thickness': 0.7,
-                    'value': final_score
-                }
+    if model_error:
+        st.error(f"Model failed to load: {model_error}")
+
+    with st.form("student_input_form"):
+        st.markdown('<span class="sidebar-section-label">Study Habits</span>', unsafe_allow_html=True)
+
+        hours_studied    = st.slider("Weekly Study Hours", 0, 40, 10)
+        attendance       = st.slider("Class Attendance (%)", 0, 100, 80)
+        previous_scores  = st.slider("Previous Exam Average", 0, 100, 70)
+        tutoring_sessions= st.slider("Monthly Tutoring Sessions", 0, 10, 0)
+
+        st.markdown('<span class="sidebar-section-label">Lifestyle & Environment</span>', unsafe_allow_html=True)
+
+        sleep_hours      = st.slider("Nightly Sleep (hrs)", 4, 12, 7)
+        physical_activity= st.slider("Weekly Exercise (hrs)", 0, 20, 3)
+        extracurriculars = st.selectbox("Extracurricular Activities", ["Yes", "No"])
+        internet_access  = st.selectbox("Reliable Home Internet", ["Yes", "No"])
+        distance_from_home=st.selectbox("Distance to School", ["Near", "Moderate", "Far"])
+
+        st.markdown('<span class="sidebar-section-label">Personal Factors</span>', unsafe_allow_html=True)
+
+        motivation_level = st.select_slider("Motivation Level", ["Low", "Medium", "High"], value="Medium")
+        peer_influence   = st.select_slider("Peer Study Influence", ["Negative", "Neutral", "Positive"], value="Neutral")
+        learning_disabilities = st.selectbox("Documented Learning Disability", ["No", "Yes"])
+        gender           = st.selectbox("Gender", ["Female", "Male"])
+
+        with st.expander("Household & School Details"):
+            family_income      = st.select_slider("Family Income", ["Low", "Medium", "High"], value="Medium")
+            parental_involvement=st.select_slider("Parental Involvement", ["Low", "Medium", "High"], value="Medium")
+            parental_education = st.selectbox("Parents' Education", ["High School", "College", "Postgraduate"])
+            school_type        = st.selectbox("School Type", ["Public", "Private"])
+            teacher_quality    = st.select_slider("Teacher Quality", ["Low", "Medium", "High"], value="Medium")
+
+        submitted = st.form_submit_button("▶  Run Prediction Engine")
+        if submitted:
+            # Keep the forecast on screen when results-view widgets (what-if explorer) rerun the script
+            st.session_state['forecast_requested'] = True
+        st.markdown('<div class="submit-hint">Analysis powered by ML pipeline</div>', unsafe_allow_html=True)
+
+
+# ==========================================
+# 4. Main Canvas
+# ==========================================
+tab_forecast, tab_batch = st.tabs(["Individual Forecast", "Cohort Batch Scoring"])
+show_forecast = submitted or st.session_state.get('forecast_requested', False)
+
+with tab_forecast:
+    if not show_forecast:
+        for block in landing_html(model_label, stat_students, stat_r2, stat_mae):
+            st.markdown(block, unsafe_allow_html=True)
+
+
+    # ==========================================
+    # RESULTS VIEW
+    # ==========================================
+    if show_forecast:
+        with span('input_assembly'):
+            input_data = {
+                'Hours_Studied': hours_studied, 'Attendance': attendance,
+                'Parental_Involvement': parental_involvement, 'Access_to_Resources': 'Medium',
+                'Extracurricular_Activities': extracurriculars, 'Sleep_Hours': sleep_hours,
+                'Previous_Scores': previous_scores, 'Motivation_Level': motivation_level,
+                'Internet_Access': internet_access, 'Tutoring_Sessions': tutoring_sessions,
+                'Family_Income': family_income, 'Teacher_Quality': teacher_quality,
+                'School_Type': school_type, 'Peer_Influence': peer_influence,
+                'Physical_Activity': physical_activity, 'Learning_Disabilities': learning_disabilities,
+                'Parental_Education_Level': parental_education, 'Distance_from_Home': distance_from_home,
+                'Gender': gender
             }
-        ))
-        fig.update_layout(
-            height          = 300,
-            margin          = dict(l=24, r=24, t=24, b=0),
-            paper_bgcolor   = 'rgba(0,0,0,0)',
-            plot_bgcolor    = 'rgba(0,0,0,0)',
-            font_family     = 'DM Mono',
-        )
-        fig.add_annotation(
-            text  = f"<b>/{100}</b>",
-            x=0.5, y=0.30, xref="paper", yref="paper",
-            showarrow=False,
-            font=dict(size=18, color='#4a5068', family='DM Mono'),
-        )
-        st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
-        # Tier badge
+        try:
+            with span('forecast_predict'):
+                raw_prediction = model.predict_cached(input_data)
+            final_score    = min(max(raw_prediction, 0.0), 100.0)
+            model_ok       = True
+        except Exception as e:
+            final_score = 72.4   # Demo fallback
+            model_ok    = False
+
+        # Only explicit submits are audited; results-view reruns re-show the same prediction
+        audit_log = audit_log_or_warn() if submitted and model_ok else None
+        if audit_log is not None:
+            audit_log.log(predictor, model.model_hash, [input_data], [raw_prediction], session=audit_session)
+
+        # ---- Determine grade tier ----
+        if final_score >= DISTINCTION_THRESHOLD:
+            tier        = "DISTINCTION"
+            tier_color  = "var(--accent-green)"
+            bar_color   = "#48bb78"
+            badge_class = "badge-success"
+            badge_icon  = "●"
+            headline    = "Excellent trajectory."
+            summary     = "Your current habits are tracking toward a distinction-level result. Maintain consistency and protect your key inputs."
+        elif final_score >= PASS_THRESHOLD:
+            tier        = "PASS"
+            tier_color  = "var(--accent-amber)"
+            bar_color   = "#ed8936"
+            badge_class = "badge-warning"
+            badge_icon  = "◐"
+            headline    = "On track, room to grow."
+            summary     = "You're projected to pass, but targeted improvements to 2–3 inputs could move you into the distinction bracket."
+        else:
+            tier        = "AT RISK"
+            tier_color  = "var(--accent-red)"
+            bar_color   = "#fc8181"
+            badge_class = "badge-danger"
+            badge_icon  = "▲"
+            headline    = "Intervention recommended."
+            summary     = "Current behavioral signals indicate your score may fall below the passing threshold. Prioritize the actions below immediately."
+
+        # ---- Results header ----
         st.markdown(f"""
-        <div style="text-align:center; margin-top:-8px; margin-bottom:24px;">
-            <span class="alert-badge {badge_class}">{badge_icon}&nbsp; Grade Tier: {tier}</span>
+        <div class="results-header">
+            <div class="results-eyebrow">Forecast Generated · {pd.Timestamp.now().strftime("%d %b %Y, %H:%M")}</div>
+            <div class="results-title">Academic Forecast Report</div>
         </div>
         """, unsafe_allow_html=True)
 
-        # Key metrics row
-        study_efficiency = min(round((hours_studied / 40) * 100), 100)
-        sleep_quality    = "Good" if sleep_hours >= 7 else "Low"
-        engage_score     = round((attendance / 100) * 50 + (tutoring_sessions / 10) * 50)
+        # ---- Main two-column layout ----
+        col_gauge, col_insights = st.columns([1.1, 1], gap="large")
 
-        st.markdown(f"""
-        <div class="metrics-row">
-            <div class="metric-chip">
-                <div class="metric-chip-value">{hours_studied}h</div>
-                <div class="metric-chip-label">Study / Wk</div>
-            </div>
-            <div class="metric-chip">
-                <div class="metric-chip-value">{attendance}%</div>
-                <div class="metric-chip-label">Attendance</div>
-            </div>
-            <div class="metric-chip">
-                <div class="metric-chip-value">{sleep_hours}h</div>
-                <div class="metric-chip-label">Sleep / Night</div>
-            </div>
-            <div class="metric-chip">
-                <div class="metric-chip-value">{engage_score}</div>
-                <div class="metric-chip-label">Engage Score</div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        # === LEFT: Gauge + Metrics ===
+        with col_gauge:
+            st.markdown('<div class="score-panel">', unsafe_allow_html=True)
+            st.markdown(f'<div class="panel-label">Projected Score</div>', unsafe_allow_html=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+            # Plotly gauge — dark industrial style; the styled figure is built once per session
+            with span('chart_gauge'):
+                fig = fill_gauge(session_figure('gauge', gauge_figure), final_score, bar_color)
+                st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
-    # === RIGHT: Insights ===
-    with col_insights:
-        st.markdown('<div class="insights-panel">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-label">Diagnostics & Action Plan</div>', unsafe_allow_html=True)
+            # Tier badge
+            st.markdown(f"""
+            <div style="text-align:center; margin-top:-8px; margin-bottom:24px;">
+                <span class="alert-badge {badge_class}">{badge_icon}&nbsp; Grade Tier: {tier}</span>
+            </div>
+            """, unsafe_allow_html=True)
 
-        st.markdown(f"""
-        <span class="alert-badge {badge_class}">{badge_icon}&nbsp; {tier}</span>
-        <div class="score-headline">{headline}</div>
-        <div class="score-subline">{summary}</div>
-        """, unsafe_allow_html=True)
+            # Key metrics row
+            study_efficiency = min(round((hours_studied / 40) * 100), 100)
+            sleep_quality    = "Good" if sleep_hours >= 7 else "Low"
+            engage_score     = round((attendance / 100) * 50 + (tutoring_sessions / 10) * 50)
 
-        # Dynamic advice items
-        advice_items = []
-        if attendance < 85:
-            advice_items.append({
-                "icon": "📅",
-                "title": "Increase Class Attendance",
-                "body": f"At {attendance}%, attendance is below the 85% threshold. Each missed class compounds into lower retention. Target 90%+."
-            })
-        if hours_studied < 12:
-            advice_items.append({
-                "icon": "⏱️",
-                "title": "Add Weekly Study Hours",
-                "body": f"You're studying {hours_studied}h/week. Research shows 15–20h/week correlates with top-quartile outcomes. Aim to add 3–5h."
-            })
-        if sleep_hours < 7:
-            advice_items.append({
-                "icon": "🛌",
-                "title": "Optimize Sleep Schedule",
-                "body": f"At {sleep_hours}h/night, cognitive consolidation is impaired. Memory retention peaks above 7.5h. Adjust your routine."
-            })
-        if previous_scores < 65 and tutoring_sessions == 0:
-            advice_items.append({
-                "icon": "🤝",
-                "title": "Start Tutoring Sessions",
-                "body": "With a previous average below 65 and zero tutoring sessions, targeted support is the highest-leverage intervention available."
-            })
-        if motivation_level == "Low":
-            advice_items.append({
-                "icon": "🔋",
-                "title": "Address Motivation Gap",
-                "body": "Low motivation is a leading predictor of dropout behavior. Set weekly micro-goals and track progress visually."
-            })
-        if not advice_items:
-            advice_items.append({
-                "icon": "✅",
-                "title": "Strong Profile Detected",
-                "body": "Your inputs show a well-balanced academic profile. Consistency is your biggest risk — protect your current habits."
-            })
-
-        for item in advice_items:
             st.markdown(f"""
-            <div class="advice-item">
-                <span class="advice-icon">{item['icon']}</span>
-                <div class="advice-text">
-                    <strong>{item['title']}</strong>
-                    {item['body']}
+            <div class="metrics-row">
+                <div class="metric-chip">
+                    <div class="metric-chip-value">{hours_studied}h</div>
+                    <div class="metric-chip-label">Study / Wk</div>
+                </div>
+                <div class="metric-chip">
+                    <div class="metric-chip-value">{attendance}%</div>
+                    <div class="metric-chip-label">Attendance</div>
+                </div>
+                <div class="metric-chip">
+                    <div class="metric-chip-value">{sleep_hours}h</div>
+                    <div class="metric-chip-label">Sleep / Night</div>
+                </div>
+                <div class="metric-chip">
+                    <div class="metric-chip-value">{engage_score}</div>
+                    <div class="metric-chip-label">Engage Score</div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    # ---- Feature Impact Bar Chart ----
-    st.markdown("<br>", unsafe_allow_html=True)
-    st.markdown('<div class="score-panel">', unsafe_allow_html=True)
-    st.markdown('<div class="panel-label">Input Signal Overview</div>', unsafe_allow_html=True)
-
-    # Normalized input snapshot as a horizontal bar chart
-    signal_labels = ["Study Hours", "Attendance", "Prev. Score", "Sleep", "Exercise", "Tutoring"]
-    signal_raw    = [hours_studied, attendance, previous_scores, sleep_hours, physical_activity, tutoring_sessions]
-    signal_maxes  = [40, 100, 100, 12, 20, 10]
-    signal_norm   = [round((v / m) * 100) for v, m in zip(signal_raw, signal_maxes)]
-    signal_colors = ["#48bb78" if v >= 70 else "#ed8936" if v >= 40 else "#fc8181" for v in signal_norm]
-
-    fig2 = go.Figure()
-    for i, (label, val, pct, color) in enumerate(zip(signal_labels, signal_raw, signal_norm, signal_colors)):
-        fig2.add_trace(go.Bar(
-            name=label, y=[label], x=[pct], orientation='h',
-            marker=dict(color=color, line=dict(width=0)),
-            text=f"{pct}%", textposition='outside',
-            textfont=dict(family='DM Mono', size=11, color='#8a93a8'),
-            hovertemplate=f"<b>{label}</b>: {val}<extra></extra>",
-        ))
-
-    fig2.update_layout(
-        showlegend   = False,
-        paper_bgcolor= 'rgba(0,0,0,0)',
-        plot_bgcolor = 'rgba(0,0,0,0)',
-        height       = 260,
-        margin       = dict(l=10, r=60, t=10, b=10),
-        xaxis=dict(
-            range       = [0, 120],
-            showgrid    = False,
-            zeroline    = False,
-            showticklabels=False,
-        ),
-        yaxis=dict(
-            showgrid    = False,
-            tickfont    = dict(family='DM Mono', size=11, color='#8a93a8'),
-            ticklabelposition='outside',
-        ),
-        barmode='overlay',
-        bargap=0.35,
-    )
-    # Background track bars
-    for label in signal_labels:
-        fig2.add_trace(go.Bar(
-            y=[label], x=[100], orientation='h',
-            marker=dict(color='rgba(255,255,255,0.04)', line=dict(width=0)),
-            showlegend=False, hoverinfo='skip',
-        ))
-
-    st.plotly_chart(fig2, use_container_width=True, config={'displayModeBar': False})
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    if not model_ok:
-        st.caption("⚠️ Model file not found — displaying demo values. Deploy with `ultimate_student_huber_pipeline.pkl` in working directory.")
\ No newline at end of file
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # === RIGHT: Insights ===
+        with col_insights:
+            st.markdown('<div class="insights-panel">', unsafe_allow_html=True)
+            st.markdown('<div class="panel-label">Diagnostics & Action Plan</div>', unsafe_allow_html=True)
+
+            st.markdown(f"""
+            <span class="alert-badge {badge_class}">{badge_icon}&nbsp; {tier}</span>
+            <div class="score-headline">{headline}</div>
+            <div class="score-subline">{summary}</div>
+            """, unsafe_allow_html=True)
+
+            # Model-driven action plan: cheapest set of changes that reaches the next tier
+            advice_icons = {
+                'Hours_Studied': "⏱️", 'Attendance': "📅", 'Tutoring_Sessions': "🤝",
+                'Sleep_Hours': "🛌", 'Physical_Activity': "🏃",
+            }
+            next_tier = "PASS" if final_score < PASS_THRESHOLD else "DISTINCTION" if final_score < DISTINCTION_THRESHOLD else None
+            advice_items = []
+            if model_ok and next_tier is not None:
+                with span('advice'):
+                    plan = plan_for(predictor, input_data, TIER_TARGETS[next_tier])
+                if not plan['reachable']:
+                    advice_items.append({
+                        "icon": "🎯",
+                        "title": f"{next_tier} Out of Reach on Habits Alone",
+                        "body": f"Even maximizing every actionable input projects {plan['projected']:.1f} — short of {plan['target']}. The changes below still deliver the largest gain."
+                    })
+                for change in plan['changes']:
+                    advice_items.append({
+                        "icon": advice_icons[change['feature']],
+                        "title": f"{SWEEP_LABELS[change['feature']]}: {change['current']:.0f} → {change['new']:.0f}",
+                        "body": f"Add {change['delta']:.0f} {change['unit']} for ≈ +{change['gain']:.1f} points. Part of the lowest-effort route to {next_tier} ({plan['current']:.1f} → {plan['projected']:.1f})."
+                    })
+            elif next_tier is not None:
+                advice_items.append({
+                    "icon": "📡",
+                    "title": "Action Plan Unavailable",
+                    "body": "The model artifact could not be loaded, so no personalized intervention plan can be computed."
+                })
+            if not advice_items:
+                advice_items.append({
+                    "icon": "✅",
+                    "title": "Strong Profile Detected",
+                    "body": "Your inputs show a well-balanced academic profile. Consistency is your biggest risk — protect your current habits."
+                })
+
+            for item in advice_items:
+                st.markdown(f"""
+                <div class="advice-item">
+                    <span class="advice-icon">{item['icon']}</span>
+                    <div class="advice-text">
+                        <strong>{item['title']}</strong>
+                        {item['body']}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # ---- Score Drivers ----
+        if model_ok:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown('<div class="score-panel">', unsafe_allow_html=True)
+            st.markdown('<div class="panel-label">Score Drivers</div>', unsafe_allow_html=True)
+
+            # Exact linear attribution: points each input adds or removes versus the typical student
+            with span('attribution'):
+                attributor = get_attributor(model.version_dir, predictor)
+                drivers    = [(f, c) for f, c in attributor.explain(input_data, top=8) if abs(c) >= 0.05]
+            with span('chart_bars'):
+                fig2 = fill_drivers(session_figure('drivers', driver_figure),
+                                    [FEATURE_LABELS[f] for f, _ in drivers], [c for _, c in drivers])
+                st.plotly_chart(fig2, use_container_width=True, config={'displayModeBar': False})
+            st.caption(f"Top {len(drivers)} of 19 inputs by impact, in exam points relative to a typical student "
+                       f"(median / most common answer for every input), who is projected "
+                       f"{attributor.baseline_score:.1f}. All 19 contributions sum to "
+                       f"{raw_prediction - attributor.baseline_score:+.1f}.")
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # ---- Peer Benchmark ----
+        if model_ok:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown('<div class="score-panel">', unsafe_allow_html=True)
+            st.markdown('<div class="panel-label">Peer Benchmark</div>', unsafe_allow_html=True)
+
+            try:
+                with span('peers'):
+                    peer_index = get_peer_index(model.version_dir, predictor)
+                    standing   = peer_index.compare(final_score, input_data)
+                    peers      = peer_index.neighbors(input_data)
+            except OSError as e:
+                st.caption(f"Peer comparison unavailable: {e}")
+            else:
+                slice_labels = {'School_Type': "{} Schools", 'Family_Income': "{} Income",
+                                'Gender': "{} Students", 'Parental_Education_Level': "Parents: {}"}
+                chips = [("All Students", standing['overall'])] + [
+                    (slice_labels[f].format(standing[f]['level']), standing[f]) for f in SLICE_FEATURES]
+                chip_html = ''.join(f"""
+                <div class="metric-chip">
+                    <div class="metric-chip-value">P{group['percentile']:.0f}</div>
+                    <div class="metric-chip-label">{label} · n={group['n']:,}</div>
+                </div>""" for label, group in chips)
+                peer_scores = peers['Exam_Score']
+                st.markdown(f"""
+                <div class="score-subline">Percentile of your projected {final_score:.1f} among actual exam scores in the training data.</div>
+                <div class="metrics-row" style="grid-template-columns: repeat({len(chips)}, 1fr);">{chip_html}
+                </div>
+                <div class="score-subline" style="margin-top:16px;">
+                    The {len(peers)} students most like you scored a median of {peer_scores.median():.0f}
+                    (range {peer_scores.min():.0f}–{peer_scores.max():.0f}).
+                </div>
+                """, unsafe_allow_html=True)
+                with st.expander("Students like you"):
+                    st.dataframe(peers.drop(columns='distance'), hide_index=True, use_container_width=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        # ---- What-If Explorer ----
+        if model_ok:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown('<div class="score-panel">', unsafe_allow_html=True)
+            st.markdown('<div class="panel-label">What-If Explorer</div>', unsafe_allow_html=True)
+
+            col_x, col_y = st.columns(2)
+            x_feature = col_x.selectbox("Sweep Input", list(SWEEP_LABELS), format_func=SWEEP_LABELS.get,
+                                        key="whatif_x")
+            y_options = [None] + [f for f in SWEEP_LABELS if f != x_feature]
+            y_feature = col_y.selectbox("Second Input (optional)", y_options, key="whatif_y",
+                                        format_func=lambda f: "— none (line view) —" if f is None else SWEEP_LABELS[f])
+
+            import plotly.graph_objects as go
+            with span('chart_whatif'):
+                x_values, y_values, grid = sweep(predictor, input_data, x_feature, y_feature=y_feature)
+                axis_style = dict(showgrid=False, zeroline=False,
+                                  tickfont=dict(family='DM Mono', size=10, color='#8a93a8'))
+
+                fig3 = go.Figure()
+                if y_feature is None:
+                    fig3.add_trace(go.Scatter(
+                        x=x_values, y=grid, mode='lines', line=dict(color='#63b3ed', width=2),
+                        hovertemplate=f"{SWEEP_LABELS[x_feature]}: %{{x}}<br>Score: %{{y:.1f}}<extra></extra>",
+                    ))
+                    fig3.add_trace(go.Scatter(
+                        x=[input_data[x_feature]], y=[final_score], mode='markers',
+                        marker=dict(color='#e8eaf0', size=10), hoverinfo='skip',
+                    ))
+                    fig3.update_yaxes(range=[0, 100], title=dict(text="Projected Score", font=dict(size=11)))
+                else:
+                    fig3.add_trace(go.Heatmap(
+                        x=x_values, y=y_values, z=grid, zmin=0, zmax=100,
+                        colorscale=[[0, '#fc8181'], [PASS_THRESHOLD / 100, '#ed8936'],
+                                    [DISTINCTION_THRESHOLD / 100, '#48bb78'], [1, '#68d391']],
+                        colorbar=dict(tickfont=dict(family='DM Mono', size=10, color='#8a93a8')),
+                        hovertemplate=(f"{SWEEP_LABELS[x_feature]}: %{{x}}<br>{SWEEP_LABELS[y_feature]}: %{{y}}"
+                                       "<br>Score: %{z:.1f}<extra></extra>"),
+                    ))
+                    fig3.add_trace(go.Scatter(
+                        x=[input_data[x_feature]], y=[input_data[y_feature]], mode='markers',
+                        marker=dict(color='#e8eaf0', size=10, symbol='x'), hoverinfo='skip',
+                    ))
+                    fig3.update_yaxes(title=dict(text=SWEEP_LABELS[y_feature], font=dict(size=11)))
+
+                fig3.update_layout(
+                    showlegend    = False,
+                    paper_bgcolor = 'rgba(0,0,0,0)',
+                    plot_bgcolor  = 'rgba(0,0,0,0)',
+                    height        = 320,
+                    margin        = dict(l=10, r=10, t=10, b=10),
+                    font_family   = 'DM Mono',
+                    font_color    = '#8a93a8',
+                    xaxis         = dict(axis_style, title=dict(text=SWEEP_LABELS[x_feature], font=dict(size=11))),
+                    yaxis         = axis_style,
+                )
+                st.plotly_chart(fig3, use_container_width=True, config={'displayModeBar': False})
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        if not model_ok:
+            st.caption(f"⚠️ Model unavailable ({model_error or 'prediction failed'}) — displaying demo values.")
+
+
+# ==========================================
+# 5. Cohort Batch Scoring
+# ==========================================
+def score_upload(roster_file, upload_key):
+    """Validate and score one upload: the report, scored CSV bytes and raw scores the tab renders from."""
+    scored = {'key': upload_key, 'error': None, 'validation': None}
+    try:
+        with span('validate_roster'):
+            validation = validate_frame(pd.read_csv(roster_file))
+    except ValueError as e:
+        scored['error'] = str(e)
+        return scored
+
+    roster_df    = validation.valid_frame
+    progress_bar = st.progress(0.0, text="Scoring roster…")
+    csv_buffer   = io.StringIO()
+    with span('batch_scoring'):
+        tier_counts, raw_scores = write_scored_csv(
+            predictor, roster_df, csv_buffer,
+            progress=lambda done, total: progress_bar.progress(done / max(total, 1),
+                                                               text=f"Scored {done:,} / {total:,} students"),
+        )
+    progress_bar.empty()
+
+    # write_scored_csv bypasses the model handle, so each upload reaches the drift sketch and the
+    # audit log here, once per model
+    with span('drift_update'):
+        model.drift.update_frame(predictor, roster_df, raw_scores)
+    audit_log = audit_log_or_warn()
+    if audit_log is not None:
+        audit_log.log(predictor, model.model_hash, roster_df, raw_scores, session=audit_session, source='batch')
+
+    scored.update(validation=validation, tier_counts=tier_counts, raw_scores=raw_scores,
+                  scored_csv=csv_buffer.getvalue().encode("utf-8"),
+                  report_csv=validation.errors.to_csv(index=False).encode("utf-8") if len(validation.errors) else None)
+    return scored
+
+
+with tab_batch:
+    st.markdown("""
+    <div class="results-header">
+        <div class="results-eyebrow">Batch Mode · Roster Upload</div>
+        <div class="results-title">Cohort Scoring</div>
+    </div>
+    """, unsafe_allow_html=True)
+    st.caption(f"Upload a CSV shaped like `StudentPerformanceFactors.csv` — the {len(FEATURE_COLUMNS)} input "
+               "columns are required, any extra columns (IDs, Exam_Score) are passed through.")
+
+    roster_file = st.file_uploader("Student Roster (CSV)", type=["csv"])
+
+    if roster_file is not None:
+        if not model_loaded:
+            st.error(f"Batch scoring needs a loaded model: {model_error}")
+        else:
+            # The tab reruns on every interaction (downloads, toggles, what-if widgets), so the roster is
+            # validated and scored once per upload and model; reruns render from session state
+            upload_key = (roster_file.file_id, model.model_hash)
+            scored     = st.session_state.get('scored_roster')
+            if scored is None or scored['key'] != upload_key:
+                scored = score_upload(roster_file, upload_key)
+                st.session_state['scored_roster'] = scored
+
+            validation = scored['validation']
+            if scored['error'] is not None:
+                st.error(scored['error'])
+
+            if validation is not None:
+                problems = validation.errors
+                if len(problems):
+                    n_errors = int((problems['severity'] == ERROR).sum())
+                    message  = f"{len(problems) - n_errors:,} blank or mis-cased values were imputed or fixed."
+                    if validation.n_invalid:
+                        message = (f"{validation.n_invalid:,} of {len(validation.frame):,} students have unusable "
+                                   f"inputs ({n_errors:,} problems) and are left out of the scored file. " + message)
+                    (st.warning if validation.n_invalid else st.info)(message)
+                    with st.expander("Validation report"):
+                        st.dataframe(problems.head(1000).astype({'value': str}), hide_index=True)
+                        st.download_button("⬇  Download Validation Report",
+                                           data=scored['report_csv'],
+                                           file_name="edumetrics_validation_report.csv", mime="text/csv")
+                roster_df   = validation.valid_frame
+                tier_counts = scored['tier_counts']
+                raw_scores  = scored['raw_scores']
+
+                chips = "".join(f"""
+                    <div class="metric-chip">
+                        <div class="metric-chip-value">{tier_counts[tier]:,}</div>
+                        <div class="metric-chip-label">{tier}</div>
+                    </div>""" for tier in TIER_LABELS[::-1])
+                st.markdown(f"""
+                <div class="metrics-row">
+                    <div class="metric-chip">
+                        <div class="metric-chip-value">{len(roster_df):,}</div>
+                        <div class="metric-chip-label">Students Scored</div>
+                    </div>{chips}
+                </div>
+                """, unsafe_allow_html=True)
+
+                st.download_button(
+                    "⬇  Download Scored Roster",
+                    data=scored['scored_csv'],
+                    file_name="edumetrics_scored_roster.csv",
+                    mime="text/csv",
+                )
+
+                # Rosters that carry actual results get a sliced residual audit
+                if TARGET_COLUMN in roster_df.columns:
+                    with span('fairness_audit'):
+                        audit_report = get_fairness_report(roster_file.file_id, model.model_hash, roster_df, raw_scores)
+                    flagged = audit_report[audit_report['flagged']]
+                    with st.expander(f"Fairness audit · {len(flagged)} of {len(audit_report):,} slices flagged",
+                                     expanded=bool(len(flagged))):
+                        st.caption(f"Mean residual (actual − predicted) per group and pair of groups. Flagged: "
+                                   f"|bias| > {BIAS_THRESHOLD} points, 95% bootstrap CI excludes 0, "
+                                   f"n ≥ {MIN_SLICE_ROWS}. Positive means the model under-predicts the group.")
+                        shown = flagged if len(flagged) else audit_report[audit_report['count'] >= MIN_SLICE_ROWS].head(10)
+                        st.dataframe(shown[['slice', 'count', 'mean_residual', 'bias_low', 'bias_high', 'mae']].round(3),
+                                     hide_index=True)
+                        st.download_button("⬇  Download Full Audit",
+                                           data=audit_report.to_csv(index=False).encode("utf-8"),
+                                           file_name="edumetrics_fairness_audit.csv", mime="text/csv")
+
+
+# ==========================================
+# 6. Performance Panel (sidebar, opt-in)
+# ==========================================
+with st.sidebar:
+    if st.toggle("Performance panel", key="perf_panel",
+                 help="Rolling timings of the instrumented code paths in this server process"):
+        spans = TELEMETRY.snapshot()
+        if spans:
+            st.dataframe(pd.DataFrame.from_dict(spans, orient='index').round(3))
+        if model_loaded:
+            queue, cache = model.scheduler.metrics(), model.cache.stats()
+            st.caption(f"Model {model.version} · batches {queue['batches']:,} "
+                       f"(mean {queue['mean_batch_size']:.1f} rows, wait p99 {queue['wait_ms_p99']:.2f} ms) · "
+                       f"cache hit rate {cache['hit_rate']:.0%} of {cache['hits'] + cache['misses']:,}")
+            with span('drift_report'):
+                drift_report = model.drift_report()
+            st.caption(f"Input drift · {len(model.drift):,} scored rows vs the training snapshot "
+                       f"(PSI > 0.25 or KS past its 5% critical value is major)")
+            st.dataframe(drift_report[['feature', 'psi', 'ks', 'status']].round(3), hide_index=True)
+        audit_log = audit_log_or_warn()
+        if audit_log is not None:
+            audit = audit_log.stats()
+            st.caption(f"Audit log · {audit['records']:,} records in {audit['batches']:,} writes, "
+                       f"{audit['fsyncs']:,} fsyncs, {audit['queued']:,} queued, {audit['errors']:,} errors, "
+                       f"{audit['dropped']:,} dropped")
+            if audit['backlog'] or not audit['writer_alive']:
+                st.warning(f"Audit log is not writing ({audit['backlog']:,} rows waiting): {audit['last_error']}")
+        st.download_button("⬇  Prometheus metrics", data=TELEMETRY.prometheus_text(),
+                           file_name="edumetrics_metrics.prom", mime="text/plain")
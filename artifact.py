@@ -0,0 +1,185 @@
+"""
+EduMetrics AI — Model Artifacts
+Slim, versioned JSON form of the folded Huber model (see kernel.py). Loading it
+needs only NumPy — no joblib, no sklearn unpickling — which keeps replica cold
+starts short. The slim file records the SHA-256 of the pickle it was exported
+from, so a stale export is never served after the pickle is replaced.
+
+    python artifact.py export        # pickle → slim JSON, parity-checked on the CSV
+"""
+import json
+import os
+
+from cache import file_sha256
+from kernel import CompiledPredictor, compile_pipeline
+from scoring import MODEL_PATH
+
+SLIM_MODEL_PATH = 'ultimate_student_huber_pipeline.json'
+SLIM_FORMAT     = 'edumetrics-slim'
+SLIM_VERSION    = 1
+
+MODELS_DIR       = 'models'
+MANIFEST_NAME    = 'manifest.json'
+MANIFEST_FORMAT  = 'edumetrics-model'
+MANIFEST_VERSION = 1
+VERSION_MODEL    = 'model.pkl'
+VERSION_SLIM     = 'model.json'
+
+
+def save_slim(compiled, path=SLIM_MODEL_PATH, source_sha256=None):
+    """Write a CompiledPredictor as a slim JSON artifact."""
+    doc = {
+        'format':               SLIM_FORMAT,
+        'format_version':       SLIM_VERSION,
+        'source_sha256':        source_sha256,
+        'numeric_features':     compiled.numeric_features,
+        'numeric_fill':         compiled.numeric_fill.tolist(),
+        'categorical_features': compiled.categorical_features,
+        'categorical_levels':   compiled.categorical_levels,
+        'categorical_fill':     compiled.categorical_fill.tolist(),
+        'column_source':        compiled.column_source.tolist(),
+        'column_tables':        [table.tolist() for table in compiled.column_tables],
+        'weights':              compiled.weights.tolist(),
+        'bias':                 compiled.bias,
+    }
+    with open(path, 'w') as fh:
+        json.dump(doc, fh, indent=1)
+
+
+def read_slim(path=SLIM_MODEL_PATH):
+    """Parse and version-check a slim artifact; returns the raw document."""
+    with open(path) as fh:
+        doc = json.load(fh)
+    if doc.get('format') != SLIM_FORMAT:
+        raise ValueError(f"{path} is not an EduMetrics slim artifact")
+    if doc.get('format_version') != SLIM_VERSION:
+        raise ValueError(f"{path} has slim format v{doc.get('format_version')}, "
+                         f"this build reads v{SLIM_VERSION}")
+    return doc
+
+
+def load_slim(path=SLIM_MODEL_PATH):
+    """Load a slim artifact as a CompiledPredictor without importing sklearn."""
+    doc = read_slim(path)
+    return CompiledPredictor(
+        doc['numeric_features'], doc['numeric_fill'], doc['categorical_features'],
+        doc['categorical_levels'], doc['categorical_fill'], doc['column_source'],
+        doc['column_tables'], doc['weights'], doc['bias'],
+    )
+
+
+def model_fingerprint(model_path=MODEL_PATH, slim_path=SLIM_MODEL_PATH):
+    """Hash identifying the served model: the pickle's, or the slim file's if shipped alone."""
+    return file_sha256(model_path if os.path.exists(model_path) else slim_path)
+
+
+def load_predictor(model_path=MODEL_PATH, slim_path=SLIM_MODEL_PATH):
+    """Fastest available predictor for `model_path`.
+
+    Uses the slim export when it exists and was produced from this exact
+    pickle; otherwise unpickles the pipeline and compiles it.
+    """
+    if os.path.exists(slim_path):
+        doc = read_slim(slim_path)
+        if not os.path.exists(model_path) or doc['source_sha256'] == file_sha256(model_path):
+            return load_slim(slim_path)
+
+    import joblib
+    return compile_pipeline(joblib.load(model_path))
+
+
+def export_slim(model_path=MODEL_PATH, slim_path=SLIM_MODEL_PATH, check_csv='StudentPerformanceFactors.csv'):
+    """Compile the pickle, verify parity on `check_csv` and write the slim artifact."""
+    import joblib
+    import pandas as pd
+    from scoring import FEATURE_COLUMNS
+
+    pipeline = joblib.load(model_path)
+    check_df = pd.read_csv(check_csv)[FEATURE_COLUMNS] if check_csv else None
+    compiled = compile_pipeline(pipeline, check_df=check_df)
+    save_slim(compiled, slim_path, source_sha256=file_sha256(model_path))
+
+    reloaded = load_slim(slim_path)
+    if check_df is not None and reloaded.max_abs_error(pipeline, check_df) > 1e-9:
+        raise ValueError(f"{slim_path} does not reproduce {model_path} after reload")
+    return slim_path
+
+
+# ==========================================
+# Versioned Model Directories
+# ==========================================
+def version_paths(version_dir):
+    """(pickle path, slim path) inside a model version directory."""
+    return os.path.join(version_dir, VERSION_MODEL), os.path.join(version_dir, VERSION_SLIM)
+
+
+def list_versions(models_dir=MODELS_DIR):
+    """Version directories under `models_dir` that carry a manifest, oldest first."""
+    if not os.path.isdir(models_dir):
+        return []
+    return sorted(os.path.join(models_dir, name) for name in os.listdir(models_dir)
+                  if os.path.isfile(os.path.join(models_dir, name, MANIFEST_NAME)))
+
+
+def latest_version(models_dir=MODELS_DIR):
+    versions = list_versions(models_dir)
+    return versions[-1] if versions else None
+
+
+def write_manifest(version_dir, manifest):
+    """Publish a version: its manifest appears atomically (write temp, fsync, rename), never half-written."""
+    path = os.path.join(version_dir, MANIFEST_NAME)
+    tmp  = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(manifest, fh, indent=1)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+def read_manifest(version_dir):
+    """Parse and version-check a model manifest."""
+    path = os.path.join(version_dir, MANIFEST_NAME)
+    with open(path) as fh:
+        manifest = json.load(fh)
+    if manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError(f"{path} is not an EduMetrics model manifest")
+    if manifest.get('format_version') != MANIFEST_VERSION:
+        raise ValueError(f"{path} has manifest format v{manifest.get('format_version')}, "
+                         f"this build reads v{MANIFEST_VERSION}")
+    return manifest
+
+
+def check_compatible(version_dir, manifest):
+    """Raise ValueError if this environment cannot load the version.
+
+    The slim export needs nothing but a matching slim format; falling back to
+    the pickle requires the scikit-learn minor version it was trained with.
+    """
+    model_path, slim_path = version_paths(version_dir)
+    if os.path.exists(slim_path):
+        read_slim(slim_path)
+        return
+    if not os.path.exists(model_path):
+        raise ValueError(f"{version_dir} contains neither {VERSION_SLIM} nor {VERSION_MODEL}")
+
+    import sklearn
+    trained, installed = manifest['sklearn_version'], sklearn.__version__
+    if trained.split('.')[:2] != installed.split('.')[:2]:
+        raise ValueError(f"{version_dir} was trained with scikit-learn {trained} but {installed} is "
+                         f"installed; retrain with `python training.py fit` or export {VERSION_SLIM}")
+
+
+def load_version(version_dir):
+    """(predictor, manifest) for a model version, compatibility-checked before loading."""
+    manifest = read_manifest(version_dir)
+    check_compatible(version_dir, manifest)
+    return load_predictor(*version_paths(version_dir)), manifest
+
+
+if __name__ == '__main__':
+    import sys
+
+    if sys.argv[1:] != ['export']:
+        sys.exit("usage: python artifact.py export")
+    print(f"Wrote {export_slim()} ({os.path.getsize(SLIM_MODEL_PATH):,} bytes)")
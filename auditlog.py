@@ -0,0 +1,498 @@
+"""
+EduMetrics AI — Prediction Audit Log
+Append-only record of every prediction served: who was scored (the 19 inputs,
+as encoded for the model, imputation applied), by which model (artifact hash) and with what result
+(raw score, clamped score, tier), with a timestamp and the originating session.
+
+    audit/predictions.edulog
+        header   magic, format version, header length, then JSON: record
+                 dtype, input order and levels, tier labels
+        records  fixed-width little-endian structs (RECORD_DTYPE, 83 bytes)
+
+- Writing: AuditLog.log only timestamps its arguments and puts them on a
+  bounded queue, so a page render never waits on disk. A daemon writer thread
+  drains the queue in batches. Entries from the same model are encoded
+  together with one vectorized encode, so a whole roster or a burst of single
+  predictions costs a single call. The scoring service logs through
+  log_encoded with the arrays it already scored from. Each batch is appended
+  with one os.write, and fsynced at most once per `fsync_interval` and again
+  on close, so a crash can lose at most the last interval.
+- Several processes (the dashboard and server.py, say) may share one file.
+  Every append holds an exclusive flock, drops a torn record a crashed writer
+  left, and starts its timestamps at the file's last one. The file therefore
+  stays sorted by time across writers, restarts and wall-clock steps back.
+  Where fcntl is unavailable (Windows), keep to one writer per file.
+- I/O failures (disk full, EIO) never kill the writer. A failed append is
+  truncated back to whole records, its rows wait in a bounded backlog, and
+  the file is reopened and retried every RETRY_S. Rows that overflow the
+  queue or the backlog are counted in stats()['dropped'], not silently lost.
+- Reading: AuditLogReader memory-maps the records. A time-range query is a
+  binary search that touches ~log2(n) records (np.searchsorted would copy the
+  strided timestamp column). Tier, model and source filters are one
+  vectorized mask over that range.
+
+    python auditlog.py                                   # last 20 predictions
+    python auditlog.py --since 2026-10-01 --tier "AT RISK" --out at_risk.csv
+"""
+import atexit
+import bisect
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:   # Windows: no advisory locks, one writer per file
+    fcntl = None
+
+from scoring import (CATEGORY_LEVELS, DISTINCTION_THRESHOLD, FEATURE_COLUMNS, NUMERIC_FEATURES,
+                     PASS_THRESHOLD, TIER_LABELS, clamp_scores)
+
+AUDIT_DIR        = 'audit'
+DEFAULT_LOG_PATH = os.path.join(AUDIT_DIR, 'predictions.edulog')
+LOG_MAGIC        = b'EDUAUDIT'
+LOG_VERSION      = 1
+HEADER_ALIGN     = 64
+FSYNC_INTERVAL_S = 1.0
+WRITE_BATCH      = 4096    # queue items drained per write
+MAX_QUEUED       = 65_536  # log() calls waiting for the writer before new ones are dropped
+MAX_BACKLOG_ROWS = 200_000 # encoded rows held while the disk is failing (~17 MB)
+RETRY_S          = 5.0     # pause between attempts to recover from an I/O error
+CLOSE_TIMEOUT_S  = 10.0
+HASH_CHARS       = 16      # leading hex digits of the model artifact hash kept per record
+
+CATEGORICAL_FEATURES = list(CATEGORY_LEVELS)
+SOURCES = ['app', 'batch', 'api']
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp_ns', '<i8'),
+    ('numeric',      '<f4', (len(NUMERIC_FEATURES),)),
+    ('codes',        'i1',  (len(CATEGORICAL_FEATURES),)),
+    ('raw_score',    '<f8'),
+    ('score',        '<f4'),
+    ('tier',         'u1'),
+    ('model_hash',   f'S{HASH_CHARS}'),
+    ('session',      '<u8'),
+    ('source',       'u1'),
+])
+
+_PREFIX = struct.Struct('<8sII')   # magic, format version, total header length
+
+
+# ==========================================
+# 1. Header
+# ==========================================
+def _header_bytes():
+    schema = json.dumps({
+        'record_dtype': RECORD_DTYPE.descr,
+        'numeric':      NUMERIC_FEATURES,
+        'categorical':  {name: CATEGORY_LEVELS[name] for name in CATEGORICAL_FEATURES},
+        'tiers':        TIER_LABELS.tolist(),
+        'sources':      SOURCES,
+    }).encode()
+    length = -(-(_PREFIX.size + len(schema)) // HEADER_ALIGN) * HEADER_ALIGN
+    return (_PREFIX.pack(LOG_MAGIC, LOG_VERSION, length) + schema).ljust(length, b' ')
+
+
+def read_header(path):
+    """(header length, schema dict) of a log file; ValueError if it is not a v1 audit log."""
+    with open(path, 'rb') as fh:
+        prefix = fh.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is too short to be an audit log")
+        magic, version, length = _PREFIX.unpack(prefix)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{path} is not a v{LOG_VERSION} EduMetrics audit log")
+        schema = json.loads(fh.read(length - _PREFIX.size))
+    if np.dtype([tuple(field) for field in schema['record_dtype']]) != RECORD_DTYPE:
+        raise ValueError(f"{path} was written with a different record layout")
+    return length, schema
+
+
+def _check_predictor(predictor):
+    # Codes are stored as the predictor emits them, so its order must match the header's
+    if (list(predictor.numeric_features) != NUMERIC_FEATURES
+            or list(predictor.categorical_features) != CATEGORICAL_FEATURES
+            or [list(levels) for levels in predictor.categorical_levels] != [CATEGORY_LEVELS[f] for f in CATEGORICAL_FEATURES]):
+        raise ValueError("Predictor input encoding does not match the audit log schema")
+
+
+# ==========================================
+# 2. Writer
+# ==========================================
+class AuditLog:
+    """Append-only prediction log fed through a background writer thread."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH, fsync_interval=FSYNC_INTERVAL_S, max_batch=WRITE_BATCH):
+        self.path           = path
+        self.fsync_interval = fsync_interval
+        self.max_batch      = max_batch
+        self.records        = 0
+        self.batches        = 0
+        self.fsyncs         = 0
+        self.errors         = 0
+        self.dropped        = 0
+        self.last_error     = None
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._fd = None
+        self._open()
+        self._header_length, _ = read_header(path)
+        self._backlog  = []   # encoded blocks not yet on disk
+        self._retry_at = 0.0
+        self._queue    = queue.Queue(MAX_QUEUED)
+        self._thread   = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- Client API (never blocks on I/O) ----
+    def log(self, predictor, model_hash, inputs, raw_scores=None, session=0, source='app'):
+        """Queue predictions for writing.
+
+        `inputs` is a list of input dicts or a DataFrame with the 19 columns.
+        When `raw_scores` is None, the writer thread recomputes them with the
+        same predictor. `session` is an integer id of the requesting session.
+        """
+        self._put((time.time_ns(), predictor, model_hash, inputs, raw_scores, session, SOURCES.index(source)),
+                  len(inputs))
+
+    def log_encoded(self, predictor, model_hash, numeric, codes, raw_scores, session=0, source='api'):
+        """Queue predictions whose inputs are already encoded by `predictor` (the serving path)."""
+        self._put((time.time_ns(), predictor, model_hash, (numeric, codes), raw_scores, session,
+                   SOURCES.index(source)), len(numeric))
+
+    def _put(self, item, rows):
+        if not self._thread.is_alive():
+            self.dropped += rows
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += rows
+
+    def flush(self, timeout=None):
+        """Block until everything logged so far is written and fsynced; False if that did not happen in time."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=CLOSE_TIMEOUT_S)
+            except queue.Full:
+                pass
+            self._thread.join(CLOSE_TIMEOUT_S)
+            if self._thread.is_alive():
+                return   # still retrying a failing disk; the daemon thread owns the fd until exit
+        self._close_fd()
+
+    def stats(self):
+        return {'records': self.records, 'batches': self.batches, 'fsyncs': self.fsyncs,
+                'errors': self.errors, 'dropped': self.dropped, 'queued': self._queue.qsize(),
+                'backlog': sum(len(block) for block in self._backlog),
+                'writer_alive': self._thread.is_alive(), 'last_error': self.last_error}
+
+    # ---- File access ----
+    def _open(self):
+        """Open the file for appending, writing the header if it is new."""
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        with self._locked():
+            if os.fstat(self._fd).st_size == 0:
+                os.write(self._fd, _header_bytes())
+                os.fsync(self._fd)
+
+    def _close_fd(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _append(self, block):
+        """Append whole records after the file's last timestamp; on error the file is left as it was."""
+        itemsize = RECORD_DTYPE.itemsize
+        with self._locked():
+            size = os.fstat(self._fd).st_size
+            end  = size - (size - self._header_length) % itemsize
+            if end != size:
+                os.ftruncate(self._fd, end)   # torn record from a writer that crashed mid-append
+            last = 0
+            if end > self._header_length:
+                os.lseek(self._fd, end - itemsize, os.SEEK_SET)
+                last = int(np.frombuffer(os.read(self._fd, itemsize), dtype=RECORD_DTYPE)['timestamp_ns'][0])
+            # Concurrent sessions enqueue a few µs out of order, and other writers or a clock
+            # step back can be behind the file; forcing non-decreasing keeps it sorted by time
+            block['timestamp_ns'] = np.maximum.accumulate(np.maximum(block['timestamp_ns'], last))
+            data = memoryview(block.tobytes())
+            try:
+                while data:
+                    data = data[os.write(self._fd, data):]
+            except OSError:
+                try:
+                    os.ftruncate(self._fd, end)
+                except OSError:
+                    pass
+                raise
+
+    # ---- Writer thread ----
+    def _encode(self, items):
+        """One record block for entries that share a predictor and model hash."""
+        _, predictor, model_hash = items[0][:3]
+        _check_predictor(predictor)
+        inputs = [item[3] for item in items]
+        if isinstance(inputs[0], tuple):
+            numeric = np.concatenate([numeric for numeric, _ in inputs])
+            codes   = np.concatenate([codes for _, codes in inputs])
+            sizes   = [len(numeric) for numeric, _ in inputs]
+        elif isinstance(inputs[0], pd.DataFrame):
+            numeric, codes = predictor.encode(inputs[0][FEATURE_COLUMNS])
+            sizes = [len(numeric)]
+        else:
+            numeric, codes = predictor.encode_records([record for records in inputs for record in records])
+            sizes = [len(records) for records in inputs]
+        if any(item[4] is None for item in items):
+            raw = predictor.predict_encoded(numeric, codes)
+        else:
+            raw = np.concatenate([np.asarray(item[4], dtype=float) for item in items])
+        scores = clamp_scores(raw)
+
+        block = np.zeros(len(raw), dtype=RECORD_DTYPE)
+        block['timestamp_ns'] = np.repeat([item[0] for item in items], sizes)
+        block['numeric']      = numeric
+        block['codes']        = codes
+        block['raw_score']    = raw
+        block['score']        = scores
+        block['tier']         = (scores >= PASS_THRESHOLD).astype(np.uint8) + (scores >= DISTINCTION_THRESHOLD)   # TIER_LABELS index
+        block['model_hash']   = model_hash[:HASH_CHARS].encode()
+        block['session']      = np.repeat([item[5] for item in items], sizes)
+        block['source']       = np.repeat([item[6] for item in items], sizes)
+        return block
+
+    def _encode_each(self, items, blocks):
+        for item in items:
+            try:
+                blocks.append(self._encode([item]))
+            except Exception as e:
+                # A bad entry must not stop the trail for everything else
+                self.errors    += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+
+    def _encode_items(self, items):
+        # Entries of one kind scored by the same model are encoded together, since a single
+        # prediction is one entry and per-entry numpy overhead would dominate the writer's time
+        groups = {}
+        for item in items:
+            if isinstance(item[3], pd.DataFrame):
+                key = ('frame', len(groups))
+            else:
+                key = (type(item[3]), id(item[1]), item[2])
+            groups.setdefault(key, []).append(item)
+        for group in groups.values():
+            try:
+                self._backlog.append(self._encode(group))
+            except Exception:
+                self._encode_each(group, self._backlog)   # isolates the bad entry
+        # While the disk is failing, the oldest rows go first so memory stays bounded
+        while sum(len(block) for block in self._backlog) > MAX_BACKLOG_ROWS:
+            self.dropped += len(self._backlog.pop(0))
+
+    def _write_backlog(self):
+        if self._fd is None:
+            self._open()
+        block = np.concatenate(self._backlog) if len(self._backlog) > 1 else self._backlog[0]
+        if len(self._backlog) > 1:
+            block = block[np.argsort(block['timestamp_ns'], kind='stable')]
+        self._append(block)
+        self._backlog = []
+        self.records += len(block)
+        self.batches += 1
+
+    def _sync(self):
+        if self._fd is None:
+            self._open()   # data written before a failure sits in the page cache; any fd can flush it
+        os.fsync(self._fd)
+        self.fsyncs += 1
+
+    def _failed(self, error):
+        self.errors    += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._retry_at  = time.monotonic() + RETRY_S
+        self._close_fd()   # reopened on the next attempt, which also recovers from a closed or stale fd
+
+    def _drain(self):
+        """(entries, flush waiters, close requested) from the queue, waiting up to one fsync interval."""
+        items, waiters = [], []
+        try:
+            item = self._queue.get(timeout=self.fsync_interval)
+        except queue.Empty:
+            return items, waiters, False
+        while True:
+            if item is None:
+                return items, waiters, True
+            (waiters if isinstance(item, threading.Event) else items).append(item)
+            if len(items) >= self.max_batch:
+                return items, waiters, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items, waiters, False
+
+    def _run(self):
+        dirty, last_sync, waiters = False, time.monotonic(), []
+        while True:
+            items, new_waiters, stop = self._drain()
+            waiters += new_waiters
+            retry = stop or time.monotonic() >= self._retry_at
+            try:
+                if items:
+                    self._encode_items(items)
+                if self._backlog and retry:
+                    self._write_backlog()
+                    dirty = True
+                if dirty and retry and (stop or waiters or time.monotonic() - last_sync >= self.fsync_interval):
+                    self._sync()
+                    dirty, last_sync = False, time.monotonic()
+            except Exception as e:
+                self._failed(e)
+            # Flush waiters are released only once their entries are really on disk
+            if not (dirty or self._backlog):
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+            if stop:
+                self.dropped += sum(len(block) for block in self._backlog)
+                self._backlog = []
+                return
+
+
+# ==========================================
+# 3. Reader
+# ==========================================
+def _to_ns(moment):
+    """Epoch nanoseconds of a datetime / Timestamp / ISO string / int ns (naive times are UTC)."""
+    if moment is None or isinstance(moment, (int, np.integer)):
+        return moment
+    stamp = pd.Timestamp(moment)
+    return (stamp.tz_convert('UTC') if stamp.tzinfo else stamp).value
+
+
+class AuditLogReader:
+    """Memory-mapped view of an audit log with time-range and tier queries."""
+
+    def __init__(self, path=DEFAULT_LOG_PATH):
+        self.path = path
+        self.header_length, self.schema = read_header(path)
+        self.refresh()
+
+    def refresh(self):
+        """Re-map the file to pick up records appended since the last call."""
+        n = (os.path.getsize(self.path) - self.header_length) // RECORD_DTYPE.itemsize
+        self.records = (np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=self.header_length, shape=(n,))
+                        if n else np.empty(0, dtype=RECORD_DTYPE))
+        return self
+
+    def __len__(self):
+        return len(self.records)
+
+    def time_slice(self, start=None, end=None):
+        """slice of records with start <= timestamp < end, by binary search."""
+        stamps = self.records['timestamp_ns']
+        lo = 0 if start is None else bisect.bisect_left(stamps, _to_ns(start))
+        hi = len(stamps) if end is None else bisect.bisect_left(stamps, _to_ns(end), lo)
+        return slice(lo, hi)
+
+    def query(self, start=None, end=None, tier=None, model_hash=None, source=None):
+        """Records in [start, end) matching the optional tier / model hash prefix / source."""
+        window = self.records[self.time_slice(start, end)]
+        mask = None
+        if tier is not None:
+            mask = window['tier'] == self.schema['tiers'].index(tier)
+        if model_hash is not None:
+            prefix = model_hash[:HASH_CHARS].encode()
+            hit = np.char.startswith(window['model_hash'], prefix) if len(prefix) < HASH_CHARS \
+                else window['model_hash'] == prefix
+            mask = hit if mask is None else mask & hit
+        if source is not None:
+            hit = window['source'] == self.schema['sources'].index(source)
+            mask = hit if mask is None else mask & hit
+        return window if mask is None else window[mask]
+
+    def tier_counts(self, start=None, end=None):
+        counts = np.bincount(self.records['tier'][self.time_slice(start, end)], minlength=len(self.schema['tiers']))
+        return dict(zip(self.schema['tiers'], counts.tolist()))
+
+    def to_frame(self, records):
+        """Decode records into a DataFrame with readable inputs, tier, source and UTC time."""
+        records = np.asarray(records)
+        frame = pd.DataFrame({'time': pd.to_datetime(records['timestamp_ns'], unit='ns', utc=True)})
+        for j, name in enumerate(self.schema['numeric']):
+            frame[name] = records['numeric'][:, j].astype(float)
+        for j, (name, levels) in enumerate(self.schema['categorical'].items()):
+            codes = records['codes'][:, j].astype(np.intp)
+            frame[name] = pd.Categorical.from_codes(np.where(codes < len(levels), codes, -1), categories=levels)
+        frame['raw_score']  = records['raw_score']
+        frame['score']      = records['score'].astype(float)
+        frame['tier']       = np.array(self.schema['tiers'], dtype=object)[records['tier']]
+        frame['model_hash'] = records['model_hash'].astype(str)
+        frame['session']    = records['session']
+        frame['source']     = np.array(self.schema['sources'], dtype=object)[records['source']]
+        return frame
+
+
+# ==========================================
+# 4. CLI
+# ==========================================
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the prediction audit log")
+    parser.add_argument('path', nargs='?', default=DEFAULT_LOG_PATH)
+    parser.add_argument('--since', default=None, help="inclusive start time (ISO, naive = UTC)")
+    parser.add_argument('--until', default=None, help="exclusive end time")
+    parser.add_argument('--tier', default=None, choices=TIER_LABELS.tolist())
+    parser.add_argument('--model', default=None, help="model hash prefix")
+    parser.add_argument('--source', default=None, choices=SOURCES)
+    parser.add_argument('--tail', type=int, default=20, help="rows to print")
+    parser.add_argument('--out', default=None, help="write all matching records as CSV")
+    args = parser.parse_args(argv)
+
+    reader = AuditLogReader(args.path)
+    t0 = time.perf_counter()
+    found = reader.query(args.since, args.until, args.tier, args.model, args.source)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(found):,} of {len(reader):,} records match ({elapsed * 1000:.1f} ms)")
+    if args.out:
+        reader.to_frame(found).to_csv(args.out, index=False)
+    if len(found) and args.tail:
+        print(reader.to_frame(found[-args.tail:])[['time', 'tier', 'score', 'model_hash', 'source', 'session']]
+              .to_string(index=False))
+    return found
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Load-time and memory benchmark: pd.read_csv vs the memory-mapped column store.
+
+Builds a roster of `--rows` rows by repeating StudentPerformanceFactors.csv,
+writes it both as CSV and as a columnar store in a temp directory, then loads
+each in a fresh subprocess and reports wall time and resident-set growth
+(read from /proc/self/statm, so Linux only) while the loaded data is alive.
+
+    python -m benchmarks.columnar_load --rows 2000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from columnar import convert_csv
+
+PROBES = {
+    'pd.read_csv (full frame)': """
+df = pd.read_csv(CSV)
+touched = len(df)
+""",
+    'ColumnStore.open + scan all columns': """
+from columnar import ColumnStore
+store = ColumnStore.open(STORE)
+touched = sum(int(store.column(name).sum() >= 0) for name in store.columns) and len(store)
+""",
+    'ColumnStore.to_frame (decoded)': """
+from columnar import ColumnStore
+df = ColumnStore.open(STORE).to_frame()
+touched = len(df)
+""",
+}
+
+TEMPLATE = """
+import json, os, time
+import numpy as np, pandas as pd
+CSV, STORE = {csv!r}, {store!r}
+def rss():
+    with open('/proc/self/statm') as fh:
+        return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+base_rss = rss()
+t0 = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{'seconds': elapsed, 'rss_mb': (rss() - base_rss) / 2**20, 'rows': touched}}))
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="read_csv vs columnar store load benchmark")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    source = pd.read_csv('StudentPerformanceFactors.csv')
+    reps   = -(-args.rows // len(source))
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path   = os.path.join(tmp, 'roster.csv')
+        store_path = os.path.join(tmp, 'roster.edustore')
+        pd.concat([source] * reps, ignore_index=True).head(args.rows).to_csv(csv_path, index=False)
+        t0 = time.perf_counter()
+        convert_csv(csv_path, store_path)
+        print(f"roster: {args.rows:,} rows | CSV {os.path.getsize(csv_path) / 1e6:.1f} MB | "
+              f"store {sum(e.stat().st_size for e in os.scandir(store_path)) / 1e6:.1f} MB "
+              f"(converted in {time.perf_counter() - t0:.1f} s)")
+
+        print(f"{'loader':38s} {'time':>9s} {'RSS Δ':>12s}")
+        for name, body in PROBES.items():
+            out = subprocess.run([sys.executable, '-c', TEMPLATE.format(csv=csv_path, store=store_path, body=body)],
+                                 capture_output=True, text=True, check=True)
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{name:38s} {result['seconds'] * 1000:7.0f} ms {result['rss_mb']:9.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
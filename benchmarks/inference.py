@@ -0,0 +1,188 @@
+"""
+Inference benchmark suite for the scoring paths.
+
+Measures, against the shipped pipeline and its compiled kernel:
+  - single-row latency the way the original app.py scored a form
+    (pd.DataFrame([dict]) → pipeline.predict), next to the compiled paths
+  - batch throughput at 1 / 100 / 10k / 1M rows, with the ColumnTransformer
+    on its own timed separately and tracemalloc peak memory per batch size
+  - concurrent single-row scoring through the shared InferenceScheduler
+
+Results are written as JSON. With --compare, every timing is checked against
+a baseline file and the run exits non-zero if any got slower than the
+tolerance allows, so a scoring-path regression fails CI.
+
+    python -m benchmarks.inference --out bench.json
+    python -m benchmarks.inference --compare bench.json --tolerance 0.25
+    python -m benchmarks.inference --sizes 1 100 10000 --compare bench.json   # quick CI gate
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+from artifact import latest_version, version_paths
+from kernel import compile_pipeline
+from scheduler import InferenceScheduler
+from scoring import FEATURE_COLUMNS
+
+BATCH_SIZES   = [1, 100, 10_000, 1_000_000]
+MIN_SECONDS   = 0.3    # keep repeating a measurement until this much time has been spent
+MIN_REPEATS   = 3
+MAX_REPEATS   = 2000
+CONCURRENCY   = 16
+CONCURRENT_REQUESTS = 4000
+
+
+def _timed(fn):
+    """Median seconds per call of fn(), repeated adaptively."""
+    samples, spent = [], 0.0
+    while len(samples) < MIN_REPEATS or (spent < MIN_SECONDS and len(samples) < MAX_REPEATS):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        spent += samples[-1]
+    return {'median_s': statistics.median(samples), 'p99_s': float(np.percentile(samples, 99)),
+            'repeats': len(samples)}
+
+
+def _peak_bytes(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def roster(n_rows, source):
+    reps = -(-n_rows // len(source))
+    return pd.concat([source] * reps, ignore_index=True).head(n_rows)
+
+
+# ==========================================
+# Benchmarks
+# ==========================================
+def bench_single_row(pipeline, compiled, record):
+    return {
+        'single_row.dataframe_predict': _timed(lambda: pipeline.predict(pd.DataFrame([record]))),
+        'single_row.compiled_records':  _timed(lambda: compiled.predict_records([record])),
+        'single_row.compiled_one':      _timed(lambda: compiled.predict_one(record)),
+    }
+
+
+def bench_batches(pipeline, compiled, source, sizes):
+    preprocessor = pipeline.named_steps['preprocessor']
+    results = {}
+    for n in sizes:
+        X = roster(n, source)
+        for name, fn in (('pipeline_predict', lambda: pipeline.predict(X)),
+                         ('preprocess_only',  lambda: preprocessor.transform(X)),
+                         ('compiled_predict', lambda: compiled.predict(X))):
+            result = _timed(fn)
+            result['rows_per_s'] = n / result['median_s']
+            result['peak_bytes'] = _peak_bytes(fn)
+            results[f"batch_{n}.{name}"] = result
+    return results
+
+
+def bench_concurrent(compiled, record, threads=CONCURRENCY, requests=CONCURRENT_REQUESTS):
+    scheduler = InferenceScheduler(compiled.predict_records)
+    per_thread = requests // threads
+
+    def client():
+        for _ in range(per_thread):
+            scheduler.predict_one(record)
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    metrics = scheduler.metrics()
+    scheduler.close()
+    return {f"concurrent_{threads}.scheduler_predict_one": {
+        'median_s':        elapsed / (per_thread * threads),
+        'requests_per_s':  per_thread * threads / elapsed,
+        'mean_batch_size': metrics['mean_batch_size'],
+        'wait_ms_p99':     metrics['wait_ms_p99'],
+    }}
+
+
+# ==========================================
+# Baseline Comparison
+# ==========================================
+def compare(current, baseline, tolerance):
+    """Rows of (name, baseline_s, current_s, ratio, regressed) for timings present in both runs."""
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        ratio = result['median_s'] / base['median_s']
+        rows.append((name, base['median_s'], result['median_s'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EduMetrics inference benchmarks")
+    parser.add_argument('--model', default=None, help="pipeline pickle (default: the newest published version's)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BATCH_SIZES)
+    parser.add_argument('--out', default=None, help="write results JSON here")
+    parser.add_argument('--compare', default=None, help="baseline results JSON to check against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    model_path = args.model or version_paths(latest_version())[0]
+    source   = pd.read_csv('StudentPerformanceFactors.csv')[FEATURE_COLUMNS]
+    pipeline = joblib.load(model_path)
+    compiled = compile_pipeline(pipeline, check_df=source)
+    record   = source.iloc[0].to_dict()
+
+    results = {}
+    results.update(bench_single_row(pipeline, compiled, record))
+    results.update(bench_batches(pipeline, compiled, source, args.sizes))
+    results.update(bench_concurrent(compiled, record))
+
+    report = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                 'sklearn': sklearn.__version__, 'machine': platform.machine(), 'model': model_path,
+                 'created_utc': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())},
+        'results': results,
+    }
+
+    print(f"{'benchmark':44s} {'median':>11s} {'rows/s':>14s} {'peak mem':>10s}")
+    for name, r in results.items():
+        rate = r.get('rows_per_s', r.get('requests_per_s'))
+        peak = f"{r['peak_bytes'] / 2**20:8.1f}MB" if 'peak_bytes' in r else ''
+        print(f"{name:44s} {r['median_s'] * 1e3:9.3f}ms {f'{rate:,.0f}' if rate else '':>14s} {peak:>10s}")
+
+    if args.out:
+        with open(args.out, 'w') as fh:
+            json.dump(report, fh, indent=1)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+        rows = compare(report, baseline, args.tolerance)
+        print(f"\nvs {args.compare} (tolerance +{args.tolerance:.0%})")
+        for name, base, cur, ratio, regressed in rows:
+            print(f"{'REGRESSED' if regressed else 'ok':9s} {name:44s} {base * 1e3:9.3f} → {cur * 1e3:9.3f} ms "
+                  f"({ratio:.2f}x)")
+        if any(row[-1] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
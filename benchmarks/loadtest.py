@@ -0,0 +1,88 @@
+"""
+Local load test for the headless scoring service (server.py).
+
+Opens `--concurrency` keep-alive connections and fires requests built from
+rows of StudentPerformanceFactors.csv, then reports p50/p99 latency and
+throughput. Start the server first:
+
+    python server.py --port 8000
+    python -m benchmarks.loadtest --port 8000 --concurrency 64 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURE_COLUMNS
+
+
+async def _client(host, port, bodies, path, n_requests, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            body = bodies[i % len(bodies)]
+            t0 = time.perf_counter()
+            writer.write(
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in head.decode('latin-1').split('\r\n'):
+                if line.lower().startswith('content-length:'):
+                    length = int(line.split(':', 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            if not head.startswith(b'HTTP/1.1 200'):
+                errors.append(head.split(b'\r\n', 1)[0].decode())
+    finally:
+        writer.close()
+
+
+async def run(host, port, concurrency, n_requests, batch_size):
+    records = pd.read_csv('StudentPerformanceFactors.csv')[FEATURE_COLUMNS]
+    records = records.astype(object).where(records.notna(), None).to_dict('records')
+    if batch_size > 1:
+        path   = '/predict/batch'
+        bodies = [json.dumps({'students': records[i:i + batch_size]}).encode()
+                  for i in range(0, len(records) - batch_size + 1, batch_size)]
+    else:
+        path   = '/predict'
+        bodies = [json.dumps(r).encode() for r in records]
+
+    latencies, errors = [], []
+    per_client = max(n_requests // concurrency, 1)
+    t0 = time.perf_counter()
+    await asyncio.gather(*[
+        _client(host, port, bodies[c::concurrency] or bodies, path, per_client, latencies, errors)
+        for c in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - t0
+
+    lat_ms = np.array(latencies) * 1000
+    print(f"endpoint      {path}  (batch size {batch_size}, concurrency {concurrency})")
+    print(f"requests      {len(lat_ms):,}  errors {len(errors):,}")
+    print(f"throughput    {len(lat_ms) / elapsed:,.0f} req/s   {len(lat_ms) * batch_size / elapsed:,.0f} rows/s")
+    print(f"latency p50   {np.percentile(lat_ms, 50):.2f} ms")
+    print(f"latency p99   {np.percentile(lat_ms, 99):.2f} ms")
+    if errors:
+        print(f"first error   {errors[0]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the EduMetrics scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=10_000)
+    parser.add_argument('--batch-size', type=int, default=1, help=">1 exercises /predict/batch")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args.host, args.port, args.concurrency, args.requests, args.batch_size))
+
+
+if __name__ == '__main__':
+    main()
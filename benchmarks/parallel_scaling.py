@@ -0,0 +1,95 @@
+"""
+Scaling benchmark for parallel.score_store_parallel.
+
+Generates a synthetic roster (10M rows by default) into a columnar store by
+sampling every column independently from its empirical distribution in
+StudentPerformanceFactors.csv, missing values included, then scores it with
+1, 2, 4 and N (= CPU count) workers and reports throughput and speed-up.
+
+    python -m benchmarks.parallel_scaling --rows 10000000
+    python -m benchmarks.parallel_scaling --store /data/synthetic.edustore   # reuse a store
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifact import latest_version, load_version
+from columnar import ColumnStore
+from parallel import DEFAULT_SHARD_ROWS, score_store_parallel
+from scoring import CATEGORY_LEVELS, FEATURE_COLUMNS, TARGET_COLUMN
+
+GENERATE_CHUNK = 1_000_000
+
+
+def synthetic_chunks(source, n_rows, seed=0):
+    """Yield DataFrame chunks sampled column-wise from `source`'s empirical distributions."""
+    rng = np.random.default_rng(seed)
+    distributions = {}
+    for name in FEATURE_COLUMNS + [TARGET_COLUMN]:
+        freqs = source[name].value_counts(normalize=True, dropna=False)
+        distributions[name] = (freqs.index.to_numpy(), freqs.to_numpy())
+
+    for start in range(0, n_rows, GENERATE_CHUNK):
+        size  = min(GENERATE_CHUNK, n_rows - start)
+        chunk = {}
+        for name, (values, probs) in distributions.items():
+            picks = rng.choice(len(values), size=size, p=probs)
+            if name in CATEGORY_LEVELS:
+                codes = np.array([CATEGORY_LEVELS[name].index(v) if isinstance(v, str) else -1 for v in values])
+                chunk[name] = pd.Categorical.from_codes(codes[picks], categories=CATEGORY_LEVELS[name])
+            else:
+                chunk[name] = values[picks]
+        yield pd.DataFrame(chunk)
+
+
+def build_store(path, n_rows, seed=0):
+    source = pd.read_csv('StudentPerformanceFactors.csv')
+    store  = None
+    for chunk in synthetic_chunks(source, n_rows, seed):
+        store = ColumnStore.create(path, chunk) if store is None else store.append(chunk)
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process-pool scoring scaling benchmark")
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--store', default=None, help="existing store to score (skips generation)")
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS)
+    args = parser.parse_args(argv)
+
+    cpus    = os.cpu_count() or 1
+    counts  = sorted({1, 2, 4, cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = args.store
+        if store_path is None:
+            store_path = os.path.join(tmp, 'synthetic.edustore')
+            t0 = time.perf_counter()
+            build_store(store_path, args.rows)
+            print(f"generated {args.rows:,} synthetic rows in {time.perf_counter() - t0:.1f} s")
+        n_rows = len(ColumnStore.open(store_path))
+
+        # Single-process reference, also used to check that shards merge back in order
+        predictor, _ = load_version(latest_version())   # what score_store_parallel loads by default
+        t0 = time.perf_counter()
+        reference = predictor.predict_encoded(*ColumnStore.open(store_path).encoded(predictor))
+        serial = time.perf_counter() - t0
+        print(f"{n_rows:,} rows | {cpus} CPUs | in-process: {serial:.2f} s ({n_rows / serial:,.0f} rows/s)")
+
+        print(f"{'workers':>7s} {'time':>9s} {'rows/s':>13s} {'speed-up':>9s}")
+        baseline = None
+        for workers in counts:
+            t0  = time.perf_counter()
+            raw = score_store_parallel(store_path, workers, args.shard_rows)
+            elapsed = time.perf_counter() - t0
+            if not np.array_equal(raw, reference):
+                raise SystemExit(f"{workers} workers: merged scores differ from the in-process run")
+            baseline = baseline or elapsed
+            print(f"{workers:7d} {elapsed:7.2f} s {n_rows / elapsed:13,.0f} {baseline / elapsed:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
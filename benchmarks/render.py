@@ -0,0 +1,160 @@
+"""
+Render-cost benchmark for the dashboard: bytes sent to the browser per rerun
+and server-side render time.
+
+Component level, per submit:
+  - the input chart rebuilt as twelve go.Bar traces (the pre-template code,
+    kept below as the reference) vs filling the cached one-trace driver chart
+  - the gauge built from scratch vs filling the cached gauge in place
+  - the inline stylesheet as written vs minified
+
+Whole app, through streamlit's AppTest: the summed element payload of the
+landing run and of a submitted forecast rerun, plus median rerun wall time
+and the per-span medians from the telemetry histograms. With --before, the
+same is measured for app.py as of that git revision so the two can be
+compared side by side.
+
+    python -m benchmarks.render
+    python -m benchmarks.render --before HEAD~1 --reruns 20
+"""
+import argparse
+import ast
+import logging
+import os
+import statistics
+import subprocess
+import time
+import warnings
+
+from render import driver_figure, fill_drivers, fill_gauge, gauge_figure, minify_css
+from telemetry import TELEMETRY
+
+SIGNAL_LABELS = ["Study Hours", "Attendance", "Prev. Score", "Sleep", "Exercise", "Tutoring"]
+SIGNAL_RAW    = [10, 80, 70, 7, 3, 0]
+SIGNAL_PCT    = [25, 80, 70, 58, 15, 0]
+SIGNAL_COLORS = ["#fc8181", "#48bb78", "#48bb78", "#ed8936", "#fc8181", "#fc8181"]
+DRIVERS       = [-3.2, 2.4, 1.9, -1.1, 0.8, 0.6, -0.4, 0.2]
+APP_SPANS     = ('render_css', 'chart_gauge', 'attribution', 'chart_bars', 'chart_whatif')
+
+
+def _median_seconds(fn, repeats=200):
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def legacy_signal_figure(labels, pct, colors, raw):
+    """The feature-impact chart as app.py built it before render.py: 6 data + 6 track traces."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for label, val, p, color in zip(labels, raw, pct, colors):
+        fig.add_trace(go.Bar(
+            name=label, y=[label], x=[p], orientation='h',
+            marker=dict(color=color, line=dict(width=0)),
+            text=f"{p}%", textposition='outside',
+            textfont=dict(family='DM Mono', size=11, color='#8a93a8'),
+            hovertemplate=f"<b>{label}</b>: {val}<extra></extra>",
+        ))
+    fig.update_layout(
+        showlegend=False, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=260,
+        margin=dict(l=10, r=60, t=10, b=10),
+        xaxis=dict(range=[0, 120], showgrid=False, zeroline=False, showticklabels=False),
+        yaxis=dict(showgrid=False, tickfont=dict(family='DM Mono', size=11, color='#8a93a8'),
+                   ticklabelposition='outside'),
+        barmode='overlay', bargap=0.35,
+    )
+    for label in labels:
+        fig.add_trace(go.Bar(y=[label], x=[100], orientation='h', showlegend=False, hoverinfo='skip',
+                             marker=dict(color='rgba(255,255,255,0.04)', line=dict(width=0))))
+    return fig
+
+
+def app_css(source):
+    """The APP_CSS literal from app.py's source, without running the app."""
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], 'id', None) == 'APP_CSS':
+            return node.value.value
+    raise ValueError("APP_CSS not found in app.py")
+
+
+# ==========================================
+# Benchmarks
+# ==========================================
+def bench_components():
+    gauge   = gauge_figure()
+    drivers = driver_figure()
+    cases = {
+        'signals.rebuild_12_traces': lambda: legacy_signal_figure(SIGNAL_LABELS, SIGNAL_PCT, SIGNAL_COLORS, SIGNAL_RAW),
+        'drivers.fill_template':     lambda: fill_drivers(drivers, SIGNAL_LABELS + ["Motivation", "Teacher Quality"],
+                                                          DRIVERS),
+        'gauge.rebuild':             lambda: fill_gauge(gauge_figure(), 72.4, '#ed8936'),
+        'gauge.fill_template':       lambda: fill_gauge(gauge, 72.4, '#ed8936'),
+    }
+    rows = []
+    for name, fn in cases.items():
+        seconds = _median_seconds(fn, repeats=50 if 'rebuild' in name else 500)
+        rows.append((name, seconds, len(fn().to_json())))
+    return rows
+
+
+def _payload_bytes(node):
+    """Serialized size of every element and block proto under an AppTest tree node."""
+    proto = getattr(node, 'proto', None)
+    total = proto.ByteSize() if proto is not None else 0
+    return total + sum(_payload_bytes(child) for child in getattr(node, 'children', {}).values())
+
+
+def bench_app(at, reruns):
+    """Payload of the landing run and a submitted rerun, then median time of further reruns."""
+    TELEMETRY.reset()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    landing = _payload_bytes(at._tree)
+    at.button[0].click().run()
+    forecast = _payload_bytes(at._tree)
+    TELEMETRY.reset()
+    rerun_s = _median_seconds(at.run, repeats=reruns)
+    spans = TELEMETRY.snapshot()
+    return {'landing_bytes': landing, 'forecast_bytes': forecast, 'rerun_s': rerun_s,
+            'spans_ms': {name: spans[name]['p50_ms'] for name in APP_SPANS if name in spans}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EduMetrics dashboard render benchmark")
+    parser.add_argument('--before', default=None, help="git revision of app.py to compare against")
+    parser.add_argument('--reruns', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    # Keep the app's own deprecation notices out of the report
+    warnings.filterwarnings('ignore')
+    from streamlit.testing.v1 import AppTest
+    logging.getLogger('streamlit.deprecation_util').disabled = True
+
+    print(f"{'component (per submit)':30s} {'median':>10s} {'json bytes':>11s}")
+    for name, seconds, size in bench_components():
+        print(f"{name:30s} {seconds * 1e3:8.3f}ms {size:11,d}")
+
+    with open('app.py', encoding='utf-8') as fh:
+        source = fh.read()
+    css = app_css(source)
+    print(f"\n{'stylesheet':30s} {len(css.encode()):,d} bytes raw → {len(minify_css(css).encode()):,d} minified")
+
+    apps = {'current': AppTest.from_file(os.path.abspath('app.py'), default_timeout=120)}
+    if args.before:
+        old = subprocess.run(['git', 'show', f"{args.before}:app.py"], capture_output=True, text=True, check=True)
+        apps = {args.before: AppTest.from_string(old.stdout, default_timeout=120), **apps}
+
+    print(f"\n{'app.py':12s} {'landing':>10s} {'forecast':>10s} {'rerun':>10s}  span p50 (ms)")
+    for label, at in apps.items():
+        r = bench_app(at, args.reruns)
+        spans = ' '.join(f"{k}={v:.2f}" for k, v in r['spans_ms'].items())
+        print(f"{label:12s} {r['landing_bytes']:9,d}B {r['forecast_bytes']:9,d}B {r['rerun_s'] * 1e3:8.1f}ms  {spans}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Cold-start benchmark: fresh interpreter → import → model ready to score.
+
+Compares unpickling the full sklearn pipeline (the original app.py path)
+against the slim JSON artifact. Each variant runs in its own subprocess so
+module caches never carry over between samples.
+
+    python -m benchmarks.startup --repeats 7
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+VARIANTS = {
+    'pickle (joblib + sklearn)': """
+import joblib, pandas
+from scoring import MODEL_PATH
+model = joblib.load(MODEL_PATH)
+""",
+    'slim JSON artifact': """
+import pandas
+from artifact import load_slim
+model = load_slim()
+""",
+}
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+{body}
+ready = time.perf_counter() - t0
+print(json.dumps({{'ready_s': ready, 'sklearn_loaded': 'sklearn' in sys.modules}}))
+"""
+
+
+def run_variant(body):
+    t0  = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', PROBE.format(body=body)],
+                         capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t0
+    return wall, json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold import + model load benchmark")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'variant':28s} {'process wall':>14s} {'import+load':>13s}  sklearn imported")
+    for name, body in VARIANTS.items():
+        run_variant(body)  # warm the OS file cache
+        samples = [run_variant(body) for _ in range(args.repeats)]
+        wall    = statistics.median(s[0] for s in samples)
+        ready   = statistics.median(s[1]['ready_s'] for s in samples)
+        print(f"{name:28s} {wall * 1000:11.0f} ms {ready * 1000:10.0f} ms  {samples[0][1]['sklearn_loaded']}")
+
+
+if __name__ == '__main__':
+    main()
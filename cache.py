@@ -0,0 +1,144 @@
+"""
+EduMetrics AI — Prediction Cache
+Bounded, thread-safe LRU cache of raw predictions keyed on the canonicalized
+19-feature input. One instance is shared across Streamlit sessions and is
+flushed automatically whenever the model artifact's hash changes.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from scoring import FEATURE_COLUMNS, NUMERIC_FEATURES
+
+DEFAULT_CACHE_SIZE = 8192
+
+_NUMERIC = frozenset(NUMERIC_FEATURES)
+_hash_memo = {}
+
+
+def file_sha256(path):
+    """SHA-256 of a file, memoized on (mtime, size) so reruns don't re-read it."""
+    st  = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _hash_memo:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as fh:
+            for block in iter(lambda: fh.read(1 << 20), b''):
+                digest.update(block)
+        _hash_memo.clear()
+        _hash_memo[key] = digest.hexdigest()
+    return _hash_memo[key]
+
+
+def canonical_key(input_data):
+    """Hashable key for an input dict: fixed column order, numerics as float,
+    missing values as None.
+
+    Only differences the model itself ignores are folded together. Categorical
+    strings are kept verbatim: the kernel treats ' High ' as an unknown level,
+    so it must not share a slot with 'High'.
+    """
+    key = []
+    for col in FEATURE_COLUMNS:
+        value = input_data.get(col)
+        if value is None or value != value:
+            key.append(None)
+        elif col in _NUMERIC:
+            key.append(float(value))
+        else:
+            key.append(str(value))
+    return tuple(key)
+
+
+class PredictionCache:
+    """LRU map from canonical input key to raw prediction, with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize       = maxsize
+        self.model_hash    = None
+        self.hits          = 0
+        self.misses        = 0
+        self.evictions     = 0
+        self.invalidations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bind(self, model_hash):
+        """Attach the cache to a model version; a different hash flushes all entries."""
+        with self._lock:
+            if model_hash != self.model_hash:
+                if self.model_hash is not None:
+                    self.invalidations += 1
+                self._data.clear()
+                self.model_hash = model_hash
+
+    def get_or_compute(self, input_data, compute):
+        """Return the cached prediction for `input_data`, calling compute(input_data) on a miss."""
+        key = canonical_key(input_data)
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            model_hash = self.model_hash
+
+        value = compute(input_data)
+
+        with self._lock:
+            # Drop results computed against a model that was swapped out meanwhile
+            if model_hash == self.model_hash:
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size':          len(self._data),
+                'maxsize':       self.maxsize,
+                'hits':          self.hits,
+                'misses':        self.misses,
+                'evictions':     self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate':      self.hits / lookups if lookups else 0.0,
+                'model_hash':    self.model_hash,
+            }
+
+
+# ==========================================
+# Consistency Check
+# ==========================================
+if __name__ == '__main__':
+    import sys
+
+    from artifact import latest_version, load_version
+
+    predictor, _ = load_version(latest_version())
+    clean  = {col: value for col, value in zip(FEATURE_COLUMNS, [
+        19, 64, 'Low', 'Medium', 'No', 8, 59, 'Low', 'Yes', 2, 'Medium', 'Medium', 'Public', 'Positive',
+        4, 'No', 'College', 'Moderate', 'Female'])}
+    padded = dict(clean, Motivation_Level=' Low ')
+
+    # Warm the cache with the padded value first: the clean lookup must still be scored, not served from it
+    cache = PredictionCache()
+    cache.bind('check')
+    warm  = cache.get_or_compute(padded, predictor.predict_one)
+    got   = cache.get_or_compute(clean, predictor.predict_one)
+    want  = predictor.predict_one(clean)
+    print(f"padded {warm:.3f} | clean via cache {got:.3f} | clean uncached {want:.3f} | {cache.stats()}")
+    if got != want:
+        sys.exit("FAIL: a padded categorical shared a cache slot with the clean value")
+    print("OK")
@@ -0,0 +1,229 @@
+"""
+EduMetrics AI — Columnar Student Store
+Typed, memory-mapped binary layout for StudentPerformanceFactors-shaped data.
+
+    students.edustore/
+        manifest.json          row count + per-column dtype / dictionary
+        Hours_Studied.bin      raw little-endian values, one file per column
+        ...
+
+Categoricals are dictionary-encoded into int8 codes that follow the ordinal
+orders defined in the notebook (and the sorted one-hot levels for nominals),
+so codes feed the compiled kernel directly. Numerics are stored as compact
+int8/int16. Missing values use the sentinel -1. Column reads are zero-copy
+np.memmap views, and new term data is appended to the end of each column
+file without rewriting what is already there.
+
+    python columnar.py convert StudentPerformanceFactors.csv students.edustore
+    python columnar.py append  new_term.csv students.edustore
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from scoring import CATEGORY_LEVELS, FEATURE_COLUMNS, TARGET_COLUMN
+
+STORE_FORMAT  = 'edumetrics-columnar'
+STORE_VERSION = 1
+MISSING       = -1
+
+NUMERIC_DTYPES = {
+    'Hours_Studied':     'int8',
+    'Attendance':        'int16',
+    'Sleep_Hours':       'int8',
+    'Previous_Scores':   'int16',
+    'Tutoring_Sessions': 'int8',
+    'Physical_Activity': 'int8',
+    TARGET_COLUMN:       'int16',
+}
+
+
+def _schema(columns):
+    schema = {}
+    for name in columns:
+        if name in CATEGORY_LEVELS:
+            schema[name] = {'kind': 'categorical', 'dtype': 'int8', 'levels': CATEGORY_LEVELS[name]}
+        elif name in NUMERIC_DTYPES:
+            schema[name] = {'kind': 'numeric', 'dtype': NUMERIC_DTYPES[name]}
+        else:
+            raise ValueError(f"Column '{name}' is not part of the student schema")
+    return schema
+
+
+def _encode_column(values, spec, name):
+    """Encode one DataFrame column to its on-disk dtype, validating as we go."""
+    values  = pd.Series(values)
+    missing = values.isna().to_numpy()
+    if spec['kind'] == 'categorical':
+        codes = pd.Categorical(values, categories=spec['levels']).codes.astype(np.int8)
+        unknown = (codes == MISSING) & ~missing
+        if unknown.any():
+            bad = sorted(set(values[unknown].astype(str)))[:5]
+            raise ValueError(f"Column '{name}' has levels outside {spec['levels']}: {bad}")
+        return codes
+
+    numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    info    = np.iinfo(spec['dtype'])
+    bad     = ~missing & (np.isnan(numeric) | (numeric != np.round(numeric))
+                          | (numeric < 0) | (numeric > info.max))
+    if bad.any():
+        raise ValueError(f"Column '{name}' has {int(bad.sum())} values that are not integers in 0..{info.max}")
+    return np.where(missing, MISSING, numeric).astype(spec['dtype'])
+
+
+class ColumnStore:
+    """Append-only, memory-mapped column store rooted at a directory."""
+
+    def __init__(self, path, manifest):
+        self.path     = path
+        self.manifest = manifest
+        self._maps    = {}
+
+    # ---- Lifecycle ----
+    @classmethod
+    def create(cls, path, df, columns=None):
+        """Write `df` as a new store at `path` (which must not exist yet)."""
+        columns = list(columns or [c for c in FEATURE_COLUMNS + [TARGET_COLUMN] if c in df.columns])
+        os.makedirs(path)
+        store = cls(path, {'format': STORE_FORMAT, 'format_version': STORE_VERSION,
+                           'n_rows': 0, 'columns': _schema(columns)})
+        for name in columns:
+            open(store._column_path(name), 'wb').close()
+        store._write_manifest()
+        store.append(df)
+        return store
+
+    @classmethod
+    def open(cls, path):
+        with open(os.path.join(path, 'manifest.json')) as fh:
+            manifest = json.load(fh)
+        if manifest.get('format') != STORE_FORMAT or manifest.get('format_version') != STORE_VERSION:
+            raise ValueError(f"{path} is not a v{STORE_VERSION} EduMetrics columnar store")
+        return cls(path, manifest)
+
+    def append(self, df):
+        """Append rows to every column file, then publish the new row count.
+
+        Column files are truncated back to the committed row count first, so a
+        crash between writing data and updating the manifest leaves no garbage.
+        """
+        missing = [name for name in self.columns if name not in df.columns]
+        if missing:
+            raise ValueError(f"Cannot append: missing columns {', '.join(missing)}")
+        encoded = {name: _encode_column(df[name], spec, name) for name, spec in self.schema.items()}
+
+        n_rows = len(self)
+        for name, values in encoded.items():
+            with open(self._column_path(name), 'r+b') as fh:
+                fh.truncate(n_rows * values.itemsize)
+                fh.seek(0, os.SEEK_END)
+                fh.write(values.astype(values.dtype.newbyteorder('<'), copy=False).tobytes())
+                fh.flush()
+                os.fsync(fh.fileno())
+
+        self.manifest['n_rows'] = n_rows + len(df)
+        self._write_manifest()
+        self._maps.clear()
+        return self
+
+    # ---- Metadata ----
+    @property
+    def schema(self):
+        return self.manifest['columns']
+
+    @property
+    def columns(self):
+        return list(self.schema)
+
+    def __len__(self):
+        return self.manifest['n_rows']
+
+    def levels(self, name):
+        return self.schema[name]['levels']
+
+    # ---- Zero-copy reads ----
+    def column(self, name):
+        """Read-only memory-mapped view of a column's stored values (codes for categoricals)."""
+        if name not in self._maps:
+            dtype = np.dtype(self.schema[name]['dtype']).newbyteorder('<')
+            if len(self) == 0:
+                self._maps[name] = np.empty(0, dtype=dtype)
+            else:
+                self._maps[name] = np.memmap(self._column_path(name), dtype=dtype, mode='r', shape=(len(self),))
+        return self._maps[name]
+
+    def to_frame(self, columns=None, start=0, stop=None):
+        """Decode rows [start, stop) into a DataFrame shaped like the source CSV."""
+        out = {}
+        for name in columns or self.columns:
+            values = self.column(name)[start:stop]
+            spec   = self.schema[name]
+            if spec['kind'] == 'categorical':
+                out[name] = pd.Categorical.from_codes(values, categories=spec['levels'])
+            elif (values == MISSING).any():
+                out[name] = np.where(values == MISSING, np.nan, values)
+            else:
+                out[name] = values
+        return pd.DataFrame(out)
+
+    def encoded(self, predictor, start=0, stop=None):
+        """(numeric, codes) arrays for rows [start, stop), ready for `predictor.predict_encoded`.
+
+        Skips string handling entirely: stored codes already follow the
+        pipeline's category orders. Missing values get the predictor's fills.
+        """
+        for name, levels in zip(predictor.categorical_features, predictor.categorical_levels):
+            if self.levels(name) != list(levels):
+                raise ValueError(f"Store levels for '{name}' do not match the model's encoder")
+
+        numeric = np.column_stack([self.column(name)[start:stop] for name in predictor.numeric_features]
+                                  ).astype(float)
+        missing = numeric == MISSING
+        if missing.any():
+            numeric = np.where(missing, predictor.numeric_fill, numeric)
+
+        codes   = np.column_stack([self.column(name)[start:stop] for name in predictor.categorical_features])
+        missing = codes == MISSING
+        if missing.any():
+            codes = np.where(missing, predictor.categorical_fill, codes).astype(np.int8)
+        return numeric, codes
+
+    # ---- Internals ----
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _write_manifest(self):
+        tmp = os.path.join(self.path, 'manifest.json.tmp')
+        with open(tmp, 'w') as fh:
+            json.dump(self.manifest, fh, indent=1)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, os.path.join(self.path, 'manifest.json'))
+
+
+def convert_csv(csv_path, store_path, chunksize=500_000):
+    """Build a store from a CSV, streaming it in chunks."""
+    store = None
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if store is None:
+            store = ColumnStore.create(store_path, chunk)
+        else:
+            store.append(chunk)
+    return store
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 4 or sys.argv[1] not in ('convert', 'append'):
+        sys.exit("usage: python columnar.py convert|append <csv> <store>")
+    command, csv_path, store_path = sys.argv[1:]
+    if command == 'convert':
+        store = convert_csv(csv_path, store_path)
+    else:
+        store = ColumnStore.open(store_path)
+        for chunk in pd.read_csv(csv_path, chunksize=500_000):
+            store.append(chunk)
+    print(f"{store_path}: {len(store):,} rows × {len(store.columns)} columns")
@@ -0,0 +1,87 @@
+"""
+EduMetrics AI — Contribution Index
+Because the Huber model is linear after preprocessing, every categorical level
+adds a constant to the score and every numeric input adds slope × value. This
+module precomputes those constants from a CompiledPredictor so a prediction is
+a few dict lookups plus a six-term dot product, and the same tables explain
+where each point of the score came from.
+"""
+import numpy as np
+
+
+class ContributionIndex:
+    """Per-level additive contributions and per-unit numeric slopes.
+
+    score(row) == base + Σ slopes[f] · row[f] + Σ levels[f][row[f]]
+    """
+
+    def __init__(self, base, slopes, numeric_fill, level_contributions, unknown_contributions, fill_levels):
+        self.base                  = float(base)
+        self.slopes                = dict(slopes)
+        self.numeric_fill          = dict(numeric_fill)
+        self.level_contributions   = {f: dict(levels) for f, levels in level_contributions.items()}
+        self.unknown_contributions = dict(unknown_contributions)
+        self.fill_levels           = dict(fill_levels)
+
+        self.numeric_features     = list(self.slopes)
+        self.categorical_features = list(self.level_contributions)
+        # Array form of each table: one slot per level code, last slot = unknown level
+        self._tables = [np.array(list(self.level_contributions[f].values()) + [self.unknown_contributions[f]])
+                        for f in self.categorical_features]
+        self._slope_vector = np.array([self.slopes[f] for f in self.numeric_features])
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """Fold a CompiledPredictor's column tables and weights per input feature."""
+        n_numeric = len(compiled.numeric_features)
+        slopes    = dict(zip(compiled.numeric_features, compiled.weights[:n_numeric].tolist()))
+        fills     = dict(zip(compiled.numeric_features, compiled.numeric_fill.tolist()))
+
+        level_contributions, unknown_contributions, fill_levels = {}, {}, {}
+        for f, (feature, levels) in enumerate(zip(compiled.categorical_features, compiled.categorical_levels)):
+            table = np.zeros(len(levels) + 1)
+            for source, column_table, weight in zip(compiled.column_source, compiled.column_tables,
+                                                    compiled.weights[n_numeric:]):
+                if source == f:
+                    table += weight * column_table
+            level_contributions[feature]   = dict(zip(levels, table[:-1].tolist()))
+            unknown_contributions[feature] = float(table[-1])
+            fill_levels[feature]           = levels[compiled.categorical_fill[f]]
+
+        return cls(compiled.bias, slopes, fills, level_contributions, unknown_contributions, fill_levels)
+
+    # ---- Single row ----
+    def contributions(self, row):
+        """Per-feature additive contributions for one input dict (excluding `base`)."""
+        out = {}
+        for feature, slope in self.slopes.items():
+            value = row.get(feature)
+            if value is None or value != value:
+                value = self.numeric_fill[feature]
+            out[feature] = slope * value
+        for feature, levels in self.level_contributions.items():
+            level = row.get(feature)
+            if level is None or level != level:
+                level = self.fill_levels[feature]
+            out[feature] = levels.get(level, self.unknown_contributions[feature])
+        return out
+
+    def score(self, row):
+        """Raw (unclamped) prediction for one input dict — no DataFrame needed."""
+        return self.base + sum(self.contributions(row).values())
+
+    # ---- Batch ----
+    def contribution_matrix(self, numeric, codes):
+        """(n, 19) contributions for arrays from `CompiledPredictor.encode`."""
+        out = np.empty((numeric.shape[0], len(self.numeric_features) + len(self._tables)))
+        out[:, :numeric.shape[1]] = numeric * self._slope_vector
+        for j, table in enumerate(self._tables):
+            out[:, numeric.shape[1] + j] = table[codes[:, j]]
+        return out
+
+    def score_encoded(self, numeric, codes):
+        """Vectorized scores: base + numeric·slopes + Σ table lookups."""
+        total = numeric @ self._slope_vector + self.base
+        for j, table in enumerate(self._tables):
+            total += table[codes[:, j]]
+        return total
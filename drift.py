@@ -0,0 +1,318 @@
+"""
+EduMetrics AI — Drift Monitor
+Constant-memory summaries of what the model is actually served, compared
+against the training snapshot (StudentPerformanceFactors.csv):
+- each numeric input and the prediction get a fixed-bin histogram with one
+  bin per integer step of its range (scoring.NUMERIC_RANGES, 0–100 for the
+  score) plus underflow/overflow bins. The inputs are integers, so quantiles
+  and KS distances read off it are exact within the range.
+- each categorical gets a count table over its levels plus one unknown slot.
+
+All bins of all features live in one int64 vector, so:
+- updating a batch of encoded rows costs one np.bincount (a scatter-add
+  for a few rows), about 30 µs for a single student. It runs inside
+  ModelHandle._score_records on the arrays the model already encoded, which
+  covers both the dashboard and the scoring service.
+- merging sketches from replicas or worker processes is a vector addition,
+  and the result is exactly the sketch of the combined traffic.
+
+Sketches serialize to JSON (to_dict / from_dict). `compare` reports PSI for
+every feature and KS for the numerics and the prediction. The reference is
+built once per model version and cached as drift_reference.json.
+
+    python drift.py reference                      # (re)build the newest version's reference
+    python drift.py report replica_a.json replica_b.json
+"""
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURE_COLUMNS, NUMERIC_RANGES
+
+DRIFT_FORMAT    = 'edumetrics-drift'
+DRIFT_VERSION   = 1
+REFERENCE_NAME  = 'drift_reference.json'
+SCORE_RANGE     = (0, 100)
+PREDICTION      = 'prediction'
+UNKNOWN_LABEL   = '(unknown)'
+PSI_GROUPS      = 10      # numeric PSI uses ~deciles of the reference
+PSI_FLOOR       = 1e-4    # smallest share used inside the PSI log
+PSI_MODERATE    = 0.10
+PSI_MAJOR       = 0.25
+MIN_ROWS        = 200     # below this PSI is dominated by sampling noise
+KS_ALPHA_COEF   = 1.358   # two-sample KS critical value factor at α = 0.05
+
+
+# ==========================================
+# 1. Layout
+# ==========================================
+def sketch_layout(predictor):
+    """[(name, kind, lo, size), ...] blocks of the shared count vector, in the predictor's encoding order.
+
+    Numeric blocks hold underflow, one bin per integer lo…hi, then overflow;
+    categorical blocks hold one slot per level, then unknown.
+    """
+    layout = []
+    for name in predictor.numeric_features:
+        lo, hi = NUMERIC_RANGES[name]
+        layout.append((name, 'numeric', lo, hi - lo + 3))
+    for name, levels in zip(predictor.categorical_features, predictor.categorical_levels):
+        layout.append((name, 'categorical', 0, len(levels) + 1))
+    lo, hi = SCORE_RANGE
+    layout.append((PREDICTION, 'numeric', lo, hi - lo + 3))
+    return layout
+
+
+# ==========================================
+# 2. Sketch
+# ==========================================
+class DriftSketch:
+    """Mergeable histograms and count tables of served inputs and predictions."""
+
+    def __init__(self, layout, levels, counts=None):
+        self.layout  = [tuple(block) for block in layout]
+        self.levels  = {name: list(lv) for name, lv in levels.items()}
+        sizes        = np.array([size for _, _, _, size in self.layout])
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.blocks  = {name: (int(offset), int(size)) for (name, _, _, size), offset in zip(self.layout, self.offsets)}
+        self.counts  = np.zeros(int(sizes.sum()), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+        if self.counts.shape != (int(sizes.sum()),):
+            raise ValueError(f"Sketch has {self.counts.size} counts; its layout needs {int(sizes.sum())}")
+
+        numeric = [(i, lo, size) for i, (_, kind, lo, size) in enumerate(self.layout) if kind == 'numeric']
+        categorical = [(i, size) for i, (_, kind, _, size) in enumerate(self.layout) if kind == 'categorical']
+        # Inputs come first in the layout and the prediction block last
+        self._num_offset = self.offsets[[i for i, _, _ in numeric[:-1]]]
+        self._num_lo     = np.array([lo for _, lo, _ in numeric[:-1]], dtype=float)
+        self._num_top    = np.array([size - 1 for _, _, size in numeric[:-1]])
+        self._cat_offset = self.offsets[[i for i, _ in categorical]]
+        self._cat_top    = np.array([size - 1 for _, size in categorical])
+        self._score      = (int(self.offsets[-1]), float(self.layout[-1][2]), self.layout[-1][3] - 1)
+        self._lock       = threading.Lock()
+
+    @classmethod
+    def for_predictor(cls, predictor):
+        return cls(sketch_layout(predictor), dict(zip(predictor.categorical_features, predictor.categorical_levels)))
+
+    @classmethod
+    def like(cls, other):
+        """Empty sketch with the same layout as `other`."""
+        return cls(other.layout, other.levels)
+
+    # ---- Updates ----
+    @staticmethod
+    def _bins(values, lo, top):
+        # Bin 0 is underflow and `top` overflow; integer v lands in bin v - lo + 1. Clamping
+        # before the cast makes truncation act as floor (plain ufuncs: np.clip costs more per call)
+        x = np.maximum(values + (1.5 - lo), 0.0)
+        return np.minimum(x, top, out=x).astype(np.intp)
+
+    def update_encoded(self, numeric, codes, predictions):
+        """Count one batch from `CompiledPredictor.encode` arrays plus its raw predictions."""
+        predictions = np.asarray(predictions, dtype=float).ravel()
+        score_offset, score_lo, score_top = self._score
+        flat = np.concatenate([
+            (self._num_offset + self._bins(numeric, self._num_lo, self._num_top)).ravel(),
+            (self._cat_offset + np.where(codes < 0, self._cat_top, codes)).ravel(),
+            score_offset + self._bins(predictions, score_lo, score_top),
+        ])
+        if flat.size < self.counts.size:
+            # A handful of rows (the dashboard's single submits): scatter-add beats a full-length bincount
+            with self._lock:
+                np.add.at(self.counts, flat, 1)
+            return self
+        batch = np.bincount(flat, minlength=self.counts.size)
+        with self._lock:
+            self.counts += batch
+        return self
+
+    def update_frame(self, predictor, df, predictions=None, chunk_size=50_000):
+        """Count every row of a DataFrame, scoring it with `predictor` unless its raw `predictions` are given."""
+        for start in range(0, len(df), chunk_size):
+            numeric, codes = predictor.encode(df.iloc[start:start + chunk_size][FEATURE_COLUMNS])
+            raw = (predictor.predict_encoded(numeric, codes) if predictions is None
+                   else predictions[start:start + chunk_size])
+            self.update_encoded(numeric, codes, raw)
+        return self
+
+    def merge(self, other):
+        """Add another sketch's counts into this one (same layout required)."""
+        if other.layout != self.layout or other.levels != self.levels:
+            raise ValueError("Cannot merge drift sketches with different layouts")
+        with self._lock:
+            self.counts += other.counts
+        return self
+
+    def reset(self):
+        with self._lock:
+            self.counts[:] = 0
+
+    # ---- Reads ----
+    def __len__(self):
+        """Rows counted (every row adds exactly one prediction)."""
+        offset, size = self.blocks[PREDICTION]
+        return int(self.counts[offset:offset + size].sum())
+
+    def histogram(self, name):
+        offset, size = self.blocks[name]
+        return self.counts[offset:offset + size].copy()
+
+    def bin_labels(self, name):
+        block = self.layout[[b[0] for b in self.layout].index(name)]
+        _, kind, lo, size = block
+        if kind == 'categorical':
+            return self.levels[name] + [UNKNOWN_LABEL]
+        return [f"<{lo}"] + [str(lo + i) for i in range(size - 2)] + [f">{lo + size - 3}"]
+
+    def table(self, name):
+        """Counts of one feature as a Series indexed by bin label."""
+        return pd.Series(self.histogram(name), index=self.bin_labels(name), name=name)
+
+    # ---- Persistence ----
+    def to_dict(self):
+        with self._lock:
+            counts = self.counts.tolist()
+        return {'format': DRIFT_FORMAT, 'format_version': DRIFT_VERSION,
+                'layout': [list(block) for block in self.layout], 'levels': self.levels, 'counts': counts}
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('format') != DRIFT_FORMAT or data.get('format_version') != DRIFT_VERSION:
+            raise ValueError(f"Not a v{DRIFT_VERSION} drift sketch "
+                             f"(format={data.get('format')!r}, version={data.get('format_version')!r})")
+        return cls(data['layout'], data['levels'], data['counts'])
+
+    def save(self, path):
+        # Atomic, since readers may load it at any time; the temp name is per process because
+        # the dashboard and the scoring service can both build a version's reference lazily
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as fh:
+            json.dump(self.to_dict(), fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as fh:
+            return cls.from_dict(json.load(fh))
+
+
+def merge_sketches(sketches):
+    """Sum of several sketches as a new one (e.g. the /drift/sketch dumps of every replica)."""
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError("No drift sketches to merge")
+    merged = DriftSketch.like(sketches[0])
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
+
+
+# ==========================================
+# 3. Comparison
+# ==========================================
+def _psi(reference, current):
+    ref = np.maximum(reference / max(reference.sum(), 1), PSI_FLOOR)
+    cur = np.maximum(current / max(current.sum(), 1), PSI_FLOOR)
+    return float(np.sum((cur - ref) * np.log(cur / ref)))
+
+
+def _quantile_groups(reference, groups=PSI_GROUPS):
+    """Group ids per bin so each group holds ~1/groups of the reference mass (bins never split)."""
+    cdf = np.cumsum(reference) / max(reference.sum(), 1)
+    return np.minimum((cdf * groups - 1e-9).astype(int).clip(0), groups - 1)
+
+
+def compare(reference, current):
+    """Per-feature drift of `current` against `reference`, most drifted first.
+
+    Columns: feature, kind, n, psi, ks, ks_critical, status. PSI is taken
+    over reference deciles for numerics and over levels for categoricals.
+    status is 'major' when PSI > 0.25 (or KS beyond its α = 0.05 critical
+    value), 'moderate' when PSI > 0.10, else 'stable'; every feature reads
+    'insufficient' until `current` has MIN_ROWS rows.
+    """
+    if reference.layout != current.layout:
+        raise ValueError("Reference and current drift sketches have different layouts")
+    n_ref, n_cur = len(reference), len(current)
+    rows = []
+    for name, kind, _, _ in current.layout:
+        ref, cur = reference.histogram(name), current.histogram(name)
+        if kind == 'numeric':
+            groups = _quantile_groups(ref)
+            psi = _psi(np.bincount(groups, ref), np.bincount(groups, cur, minlength=groups.max() + 1))
+            ks  = float(np.abs(np.cumsum(cur) / max(cur.sum(), 1) - np.cumsum(ref) / max(ref.sum(), 1)).max())
+            critical = KS_ALPHA_COEF * np.sqrt((n_ref + n_cur) / (n_ref * n_cur)) if n_ref and n_cur else np.nan
+        else:
+            psi, ks, critical = _psi(ref, cur), np.nan, np.nan
+        rows.append({'feature': name, 'kind': kind, 'n': int(cur.sum()), 'psi': psi, 'ks': ks, 'ks_critical': critical})
+
+    report = pd.DataFrame(rows)
+    major  = (report['psi'] > PSI_MAJOR) | (report['ks'] > report['ks_critical'])
+    report['status'] = np.where(major, 'major', np.where(report['psi'] > PSI_MODERATE, 'moderate', 'stable'))
+    if n_cur < MIN_ROWS:
+        report['status'] = 'insufficient'
+    return report.sort_values('psi', ascending=False, ignore_index=True)
+
+
+# ==========================================
+# 4. Reference
+# ==========================================
+def build_reference(predictor, csv_path='StudentPerformanceFactors.csv'):
+    """Sketch of the training snapshot: its inputs and the model's own predictions on them."""
+    from training import load_training_data
+
+    X, _ = load_training_data(csv_path)
+    return DriftSketch.for_predictor(predictor).update_frame(predictor, X)
+
+
+def load_reference(version_dir, predictor, csv_path='StudentPerformanceFactors.csv'):
+    """The version's cached reference sketch, built and written on first use."""
+    path = os.path.join(version_dir, REFERENCE_NAME)
+    if os.path.exists(path):
+        reference = DriftSketch.load(path)
+        if reference.layout == sketch_layout(predictor):
+            return reference
+    reference = build_reference(predictor, csv_path)
+    reference.save(path)
+    return reference
+
+
+# ==========================================
+# 5. CLI
+# ==========================================
+def main(argv=None):
+    import argparse
+
+    from artifact import latest_version, load_version
+
+    parser = argparse.ArgumentParser(description="Build drift references and compare served-traffic sketches")
+    parser.add_argument('--version', default=None, help="model version directory (default: newest)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    ref = commands.add_parser('reference', help="rebuild drift_reference.json from the training CSV")
+    ref.add_argument('--csv', default='StudentPerformanceFactors.csv')
+    rep = commands.add_parser('report', help="merge sketch JSON files (e.g. GET /drift/sketch dumps) and compare")
+    rep.add_argument('sketches', nargs='+')
+    args = parser.parse_args(argv)
+
+    version_dir = args.version or latest_version()
+    predictor, manifest = load_version(version_dir)
+    if args.command == 'reference':
+        reference = build_reference(predictor, args.csv)
+        reference.save(os.path.join(version_dir, REFERENCE_NAME))
+        print(f"Wrote {REFERENCE_NAME} for {manifest['version']} ({len(reference):,} rows)")
+        return reference
+
+    current = merge_sketches(DriftSketch.load(path) for path in args.sketches)
+    report  = compare(load_reference(version_dir, predictor), current)
+    print(f"{len(current):,} served rows from {len(args.sketches)} sketch(es) vs {manifest['version']} reference")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    return report
+
+
+if __name__ == '__main__':
+    main()
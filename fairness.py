@@ -0,0 +1,229 @@
+"""
+EduMetrics AI — Fairness Audit
+Sliced residual audit for any scored cohort with known exam scores, over every
+categorical input and every pairwise crossing of two of them (13 + 78 slice
+definitions). It generalizes the notebook's Family_Income / School_Type /
+Gender check.
+
+- SliceIndex encodes the categoricals as integer codes once per cohort.
+  Every row gets one global slice id per definition, and residual vectors
+  (one per model, say) are audited against it without re-encoding.
+- Count, mean residual and MAE for all slices come from one np.bincount per
+  definition over those ids.
+- Bootstrap CIs use the Poisson bootstrap. Each row draws an independent
+  Poisson(1) weight per replicate, so resampling is batched and chunkable:
+  every replicate's per-slice sums are one (replicates × rows) @ (rows ×
+  slices) sparse product.
+
+Residuals are actual − predicted, as in the notebook, so a positive mean
+means the model under-predicts that slice. A slice is flagged when
+|mean residual| exceeds the threshold, its CI excludes zero, and it has
+enough rows. With ~600 populated slices, a few flags at the 95% level
+are expected by chance alone, so read them as leads to check rather than verdicts.
+
+    python fairness.py                         # held-out split of StudentPerformanceFactors.csv
+    python fairness.py scored_roster.csv --threshold 0.5 --boot 500 --out audit.csv
+"""
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from scoring import CATEGORY_LEVELS, FEATURE_COLUMNS, TARGET_COLUMN
+
+AUDIT_FEATURES  = list(CATEGORY_LEVELS)
+BIAS_THRESHOLD  = 0.5     # exam points of mean residual
+MIN_SLICE_ROWS  = 30
+N_BOOTSTRAP     = 200
+CI_LEVEL        = 0.95
+CHUNK_ROWS      = 50_000
+MISSING_LABEL   = '(missing)'
+
+
+# ==========================================
+# 1. Slice Encoding
+# ==========================================
+class SliceIndex:
+    """Global slice ids for every row under every single-column and pairwise slice definition."""
+
+    def __init__(self, df, features=AUDIT_FEATURES, crossings=True):
+        self.features = list(features)
+        # Missing and unknown levels share one extra code per feature
+        self.levels = [list(CATEGORY_LEVELS[f]) + [MISSING_LABEL] for f in self.features]
+        codes = np.empty((len(self.features), len(df)), dtype=np.int32)
+        for j, (feature, levels) in enumerate(zip(self.features, self.levels)):
+            # factorize hashes each distinct value once; the few uniques are then mapped to level codes
+            found, uniques = pd.factorize(df[feature])
+            lookup = pd.Index(levels[:-1]).get_indexer(uniques)
+            lookup = np.append(np.where(lookup < 0, len(levels) - 1, lookup), len(levels) - 1)
+            codes[j] = lookup[found]   # found == -1 (missing) picks the appended slot
+
+        definitions = [(j,) for j in range(len(self.features))]
+        if crossings:
+            definitions += list(combinations(range(len(self.features)), 2))
+        self.definitions = definitions
+
+        # ids[d] = offset of definition d + mixed-radix code of each row's levels in it
+        self.ids    = np.empty((len(definitions), len(df)), dtype=np.int32)
+        self.labels = []
+        offset = 0
+        for d, columns in enumerate(definitions):
+            sizes = [len(self.levels[j]) for j in columns]
+            local = self.ids[d]
+            np.add(codes[columns[0]], offset, out=local)
+            for j, size in zip(columns[1:], sizes[1:]):
+                local += (size - 1) * (local - offset) + codes[j]
+            for combo in np.ndindex(*sizes):
+                self.labels.append(tuple((self.features[j], self.levels[j][k]) for j, k in zip(columns, combo)))
+            offset += int(np.prod(sizes))
+        self.n_slices = offset
+
+    def __len__(self):
+        return self.ids.shape[1]
+
+    def _chunks(self, chunk_rows=CHUNK_ROWS):
+        for start in range(0, len(self), chunk_rows):
+            yield start, min(start + chunk_rows, len(self))
+
+    # ---- Point estimates ----
+    def aggregate(self, residuals):
+        """(count, sum of residuals, sum of |residuals|) per slice, via bincount."""
+        residuals = np.asarray(residuals, dtype=float)
+        magnitude = np.abs(residuals)
+        count     = np.zeros(self.n_slices)
+        total     = np.zeros(self.n_slices)
+        total_abs = np.zeros(self.n_slices)
+        # Definitions cover disjoint id ranges, so per-definition bincounts simply add up
+        for ids in self.ids:
+            count     += np.bincount(ids, minlength=self.n_slices)
+            total     += np.bincount(ids, weights=residuals, minlength=self.n_slices)
+            total_abs += np.bincount(ids, weights=magnitude, minlength=self.n_slices)
+        return count, total, total_abs
+
+    # ---- Bootstrap ----
+    def _membership(self, start, stop):
+        """Sparse (rows × slices) 0/1 matrix of slice membership for a row range."""
+        from scipy import sparse
+
+        ids  = self.ids[:, start:stop]
+        rows = np.tile(np.arange(stop - start), ids.shape[0])
+        return sparse.csr_matrix((np.ones(ids.size), (rows, ids.ravel())), shape=(stop - start, self.n_slices))
+
+    def bootstrap(self, residuals, n_boot=N_BOOTSTRAP, seed=0):
+        """Per-replicate (count, sum, |sum|) arrays, each (n_boot, n_slices), from Poisson(1) row weights."""
+        residuals = np.asarray(residuals, dtype=float)
+        rng       = np.random.default_rng(seed)
+        count     = np.zeros((n_boot, self.n_slices))
+        total     = np.zeros((n_boot, self.n_slices))
+        total_abs = np.zeros((n_boot, self.n_slices))
+        for start, stop in self._chunks(max(1, CHUNK_ROWS * 10 // max(n_boot, 1))):
+            member  = self._membership(start, stop)
+            weights = rng.poisson(1.0, size=(n_boot, stop - start)).astype(float)
+            r       = residuals[start:stop]
+            # sparse.T @ dense.T keeps the product sparse-major; transpose back to (n_boot, n_slices)
+            count     += (member.T @ weights.T).T
+            total     += (member.T @ (weights * r).T).T
+            total_abs += (member.T @ (weights * np.abs(r)).T).T
+        return count, total, total_abs
+
+
+# ==========================================
+# 2. Audit
+# ==========================================
+def audit(index, residuals, n_boot=N_BOOTSTRAP, threshold=BIAS_THRESHOLD, min_rows=MIN_SLICE_ROWS,
+          ci_level=CI_LEVEL, seed=0):
+    """Per-slice count, bias, MAE and bootstrap CIs, largest |bias| first.
+
+    Columns: slice, features, count, mean_residual, mae, bias_low, bias_high,
+    mae_low, mae_high, flagged. Empty slices are omitted.
+    """
+    count, total, total_abs = index.aggregate(residuals)
+    present = count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        bias = total / count
+        mae  = total_abs / count
+
+        tail = (1 - ci_level) / 2 * 100
+        if n_boot:
+            b_count, b_total, b_abs = index.bootstrap(residuals, n_boot, seed)
+            b_bias = np.where(b_count > 0, b_total / b_count, np.nan)
+            b_mae  = np.where(b_count > 0, b_abs / b_count, np.nan)
+            bias_low, bias_high = np.nanpercentile(b_bias[:, present], [tail, 100 - tail], axis=0)
+            mae_low, mae_high   = np.nanpercentile(b_mae[:, present], [tail, 100 - tail], axis=0)
+        else:
+            bias_low = bias_high = mae_low = mae_high = np.full(int(present.sum()), np.nan)
+
+    labels = [index.labels[i] for i in np.flatnonzero(present)]
+    report = pd.DataFrame({
+        'slice':         [' & '.join(f"{f}={level}" for f, level in label) for label in labels],
+        'features':      [len(label) for label in labels],
+        'count':         count[present].astype(np.int64),
+        'mean_residual': bias[present],
+        'mae':           mae[present],
+        'bias_low':      bias_low,
+        'bias_high':     bias_high,
+        'mae_low':       mae_low,
+        'mae_high':      mae_high,
+    })
+    excludes_zero = (report['bias_low'] > 0) | (report['bias_high'] < 0) if n_boot else True
+    report['flagged'] = ((report['mean_residual'].abs() > threshold) & excludes_zero
+                         & (report['count'] >= min_rows))
+    return report.sort_values('mean_residual', key=np.abs, ascending=False, ignore_index=True)
+
+
+def audit_frame(df, predicted, actual_column=TARGET_COLUMN, crossings=True, **kwargs):
+    """Audit a cohort DataFrame (with actual scores) against raw model predictions."""
+    residuals = df[actual_column].to_numpy(dtype=float) - np.asarray(predicted, dtype=float)
+    keep = ~np.isnan(residuals)
+    frame = df[keep] if not keep.all() else df
+    return audit(SliceIndex(frame, crossings=crossings), residuals[keep], **kwargs)
+
+
+# ==========================================
+# 3. CLI
+# ==========================================
+def main(argv=None):
+    import argparse
+    import time
+
+    from artifact import latest_version, load_version
+    from training import DATA_PATH, load_training_data, train_test_split_data
+
+    parser = argparse.ArgumentParser(description="Sliced fairness audit of model residuals")
+    parser.add_argument('csv', nargs='?', default=DATA_PATH,
+                        help="cohort with the 19 inputs and Exam_Score (default: the held-out training split)")
+    parser.add_argument('--version', default=None, help="model version directory (default: newest)")
+    parser.add_argument('--threshold', type=float, default=BIAS_THRESHOLD)
+    parser.add_argument('--min-rows', type=int, default=MIN_SLICE_ROWS)
+    parser.add_argument('--boot', type=int, default=N_BOOTSTRAP)
+    parser.add_argument('--no-crossings', action='store_true')
+    parser.add_argument('--out', default=None, help="write the full slice table as CSV")
+    args = parser.parse_args(argv)
+
+    predictor, manifest = load_version(args.version or latest_version())
+    if args.csv == DATA_PATH:
+        X, y = load_training_data(DATA_PATH)
+        _, X_test, _, y_test = train_test_split_data(X, y)
+        cohort = X_test.assign(**{TARGET_COLUMN: y_test})
+    else:
+        cohort = pd.read_csv(args.csv)
+
+    t0 = time.perf_counter()
+    report = audit_frame(cohort, predictor.predict(cohort[FEATURE_COLUMNS]), crossings=not args.no_crossings,
+                         n_boot=args.boot, threshold=args.threshold, min_rows=args.min_rows)
+    elapsed = time.perf_counter() - t0
+
+    flagged = report[report['flagged']]
+    print(f"Model {manifest['version']} on {len(cohort):,} students: {len(report):,} slices audited, "
+          f"{len(flagged)} flagged (|bias| > {args.threshold} points, {CI_LEVEL:.0%} CI excludes 0, "
+          f"n ≥ {args.min_rows}) in {elapsed:.2f} s")
+    shown = flagged if len(flagged) else report[report['count'] >= args.min_rows].head(10)
+    print(shown[['slice', 'count', 'mean_residual', 'bias_low', 'bias_high', 'mae']].to_string(
+        index=False, float_format=lambda v: f"{v:+.3f}"))
+    if args.out:
+        report.to_csv(args.out, index=False)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+"""
+EduMetrics AI — Compiled Inference Kernel
+Folds the fitted Huber pipeline (imputers, scaler, ordinal/one-hot encoders and
+the regressor) into lookup tables plus one weight vector, so scoring is a
+handful of array lookups and a single dot product instead of a trip through
+Pipeline → ColumnTransformer → HuberRegressor.
+"""
+import numpy as np
+import pandas as pd
+
+
+# ==========================================
+# 1. Compiled Predictor
+# ==========================================
+class CompiledPredictor:
+    """Pure-NumPy equivalent of the fitted scoring pipeline.
+
+    The design matrix has one column per transformed pipeline feature. Numeric
+    columns are the raw (median-imputed) inputs; the scaler is folded into
+    `weights` and `bias`. Every categorical column is read from a lookup table
+    indexed by level code, where the last slot holds the value an unknown level
+    encodes to (-1 for ordinals, 0 for one-hot indicators).
+    """
+
+    def __init__(self, numeric_features, numeric_fill, categorical_features, categorical_levels,
+                 categorical_fill, column_source, column_tables, weights, bias):
+        self.numeric_features     = list(numeric_features)
+        self.numeric_fill         = np.asarray(numeric_fill, dtype=float)
+        self.categorical_features = list(categorical_features)
+        self.categorical_levels   = [list(levels) for levels in categorical_levels]
+        self.categorical_fill     = np.asarray(categorical_fill, dtype=np.int8)
+        self.column_source        = np.asarray(column_source, dtype=np.intp)
+        self.column_tables        = [np.asarray(t, dtype=float) for t in column_tables]
+        self.weights              = np.asarray(weights, dtype=float)
+        self.bias                 = float(bias)
+
+        n_numeric = len(self.numeric_features)
+        self._level_codes = [{level: code for code, level in enumerate(levels)}
+                             for levels in self.categorical_levels]
+        # Scalar fast path for predict_one: plain Python floats, no array dispatch
+        self._numeric_items = list(zip(self.numeric_features,
+                                       self.weights[:n_numeric].tolist(),
+                                       self.numeric_fill.tolist()))
+        self._categorical_items = list(zip(self.categorical_features, self._level_codes,
+                                           self.categorical_fill.tolist()))
+        self._column_items = list(zip(self.column_source.tolist(),
+                                      [t.tolist() for t in self.column_tables],
+                                      self.weights[n_numeric:].tolist()))
+
+    @property
+    def feature_names(self):
+        return self.numeric_features + self.categorical_features
+
+    # ---- Encoding ----
+    def encode(self, X):
+        """Turn a DataFrame (or column mapping) into (numeric, codes) arrays.
+
+        numeric is float64 (n, 6) with missing values median-imputed; codes is
+        int8 (n, 13) with missing levels mode-imputed and unknown levels -1.
+        A numeric value that is present but does not parse raises ValueError,
+        as the sklearn pipeline does, rather than being imputed.
+        """
+        numeric = np.column_stack([
+            self._numeric_column(name, pd.Series(X[name])) for name in self.numeric_features
+        ]) if self.numeric_features else np.empty((len(X), 0))
+        missing = np.isnan(numeric)
+        if missing.any():
+            numeric = np.where(missing, self.numeric_fill, numeric)
+
+        codes = np.empty((numeric.shape[0], len(self.categorical_features)), dtype=np.int8)
+        for j, (name, levels) in enumerate(zip(self.categorical_features, self.categorical_levels)):
+            column      = pd.Series(X[name])
+            codes[:, j] = pd.Categorical(column, categories=levels).codes
+            codes[column.isna().to_numpy(), j] = self.categorical_fill[j]
+        return numeric, codes
+
+    @staticmethod
+    def _numeric_column(name, column):
+        values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=float)
+        nan = np.isnan(values)
+        if nan.any():
+            # Only NaNs that were not missing to begin with are parse failures
+            bad = nan & column.notna().to_numpy()
+            if bad.any():
+                raise ValueError(f"{name} has non-numeric values, e.g. {column[bad].iloc[0]!r}")
+        return values
+
+    def design_matrix(self, numeric, codes):
+        """Materialize the transformed feature matrix the regressor sees."""
+        n_numeric = numeric.shape[1]
+        design = np.empty((numeric.shape[0], len(self.weights)), dtype=float)
+        design[:, :n_numeric] = numeric
+        for j, (source, table) in enumerate(zip(self.column_source, self.column_tables)):
+            design[:, n_numeric + j] = table[codes[:, source]]
+        return design
+
+    # ---- Scoring ----
+    def predict_encoded(self, numeric, codes):
+        """Score pre-encoded arrays (see `encode`)."""
+        return self.design_matrix(numeric, codes) @ self.weights + self.bias
+
+    def predict(self, X):
+        """Drop-in replacement for `pipeline.predict` on a DataFrame."""
+        return self.predict_encoded(*self.encode(X))
+
+    def encode_records(self, records):
+        """`encode` for a list of input dicts, skipping DataFrame construction."""
+        numeric = np.array([[record.get(name) for name in self.numeric_features] for record in records],
+                           dtype=float).reshape(len(records), len(self.numeric_features))
+        missing = np.isnan(numeric)
+        if missing.any():
+            numeric = np.where(missing, self.numeric_fill, numeric)
+
+        codes = np.empty((len(records), len(self.categorical_features)), dtype=np.int8)
+        for j, (name, level_codes, fill) in enumerate(self._categorical_items):
+            levels = [record.get(name) for record in records]
+            codes[:, j] = [fill if level is None or level != level else level_codes.get(level, -1)
+                           for level in levels]
+        return numeric, codes
+
+    def predict_records(self, records):
+        """Score a list of input dicts (the shape scheduler/server requests arrive in)."""
+        return self.predict_encoded(*self.encode_records(records))
+
+    def predict_one(self, row):
+        """Score a single input dict without building any arrays."""
+        total = self.bias
+        for name, weight, fill in self._numeric_items:
+            value = row.get(name)
+            if value is None or value != value:
+                value = fill
+            total += weight * value
+
+        codes = []
+        for name, level_codes, fill in self._categorical_items:
+            level = row.get(name)
+            codes.append(fill if level is None or level != level else level_codes.get(level, -1))
+        for source, table, weight in self._column_items:
+            total += weight * table[codes[source]]
+        return total
+
+    def max_abs_error(self, pipeline, X):
+        """Largest absolute gap between this kernel and `pipeline.predict` on X."""
+        return float(np.max(np.abs(self.predict(X) - pipeline.predict(X)), initial=0.0))
+
+
+# ==========================================
+# 2. Compilation from a fitted sklearn Pipeline
+# ==========================================
+def _split_steps(transformer):
+    """Return (imputer, encoder_or_scaler) from a two-step sub-pipeline."""
+    steps = [step for _, step in transformer.steps]
+    if len(steps) != 2 or not hasattr(steps[0], 'statistics_'):
+        raise ValueError(f"Unsupported sub-pipeline layout: {transformer!r}")
+    return steps
+
+
+def compile_pipeline(pipeline, check_df=None, atol=1e-9):
+    """Fold a fitted preprocessor + linear regressor into a CompiledPredictor.
+
+    If `check_df` is given, the compiled kernel is checked against
+    `pipeline.predict(check_df)` and a ValueError is raised when any
+    prediction differs by more than `atol`.
+    """
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    preprocessor = pipeline.steps[0][1]
+    regressor    = pipeline.steps[-1][1]
+    coef         = np.asarray(regressor.coef_, dtype=float)
+
+    numeric_features, numeric_fill, numeric_weights = [], [], []
+    categorical_features, categorical_levels, categorical_fill = [], [], []
+    column_source, column_tables, column_weights = [], [], []
+    bias = float(regressor.intercept_)
+    col  = 0
+
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == 'drop' or len(columns) == 0:
+            continue
+        if transformer == 'passthrough':
+            raise ValueError(f"Passthrough columns are not supported: {columns}")
+        imputer, step = _split_steps(transformer)
+        statistics    = imputer.statistics_
+
+        if isinstance(step, StandardScaler):
+            mean  = step.mean_ if step.with_mean else np.zeros(len(columns))
+            scale = step.scale_ if step.with_std else np.ones(len(columns))
+            w     = coef[col:col + len(columns)] / scale
+            numeric_features.extend(columns)
+            numeric_fill.extend(np.asarray(statistics, dtype=float))
+            numeric_weights.extend(w)
+            bias -= float(np.dot(w, mean))
+            col  += len(columns)
+
+        elif isinstance(step, OrdinalEncoder):
+            unknown = step.unknown_value if step.handle_unknown == 'use_encoded_value' else np.nan
+            for feature, levels, fill in zip(columns, step.categories_, statistics):
+                levels = list(levels)
+                column_source.append(len(categorical_features))
+                column_tables.append(list(range(len(levels))) + [unknown])
+                column_weights.append(coef[col])
+                categorical_features.append(feature)
+                categorical_levels.append(levels)
+                categorical_fill.append(levels.index(fill))
+                col += 1
+
+        elif isinstance(step, OneHotEncoder):
+            drop_idx = step.drop_idx_ if step.drop_idx_ is not None else [None] * len(columns)
+            for feature, levels, fill, dropped in zip(columns, step.categories_, statistics, drop_idx):
+                levels = list(levels)
+                source = len(categorical_features)
+                for k in range(len(levels)):
+                    if dropped is not None and k == dropped:
+                        continue
+                    column_source.append(source)
+                    column_tables.append([float(k == i) for i in range(len(levels))] + [0.0])
+                    column_weights.append(coef[col])
+                    col += 1
+                categorical_features.append(feature)
+                categorical_levels.append(levels)
+                categorical_fill.append(levels.index(fill))
+        else:
+            raise ValueError(f"Unsupported transformer step in '{name}': {step!r}")
+
+    if col != len(coef):
+        raise ValueError(f"Folded {col} columns but the regressor has {len(coef)} coefficients")
+
+    compiled = CompiledPredictor(
+        numeric_features, numeric_fill, categorical_features, categorical_levels, categorical_fill,
+        column_source, column_tables, np.concatenate([numeric_weights, column_weights]), bias,
+    )
+    if check_df is not None:
+        err = compiled.max_abs_error(pipeline, check_df)
+        if err > atol:
+            raise ValueError(f"Compiled kernel deviates from pipeline.predict by {err:.3e} (> {atol:.0e})")
+    return compiled
+
+
+# ==========================================
+# 3. Parity & Speed Check
+# ==========================================
+if __name__ == '__main__':
+    import time
+    import joblib
+
+    from scoring import MODEL_PATH, FEATURE_COLUMNS
+
+    pipeline = joblib.load(MODEL_PATH)
+    df       = pd.read_csv('StudentPerformanceFactors.csv')[FEATURE_COLUMNS]
+    compiled = compile_pipeline(pipeline, check_df=df)
+    print(f"Parity vs pipeline.predict: max |err| = {compiled.max_abs_error(pipeline, df):.2e}")
+
+    row = df.iloc[0].to_dict()
+    n_calls = 20_000
+    t0 = time.perf_counter()
+    for _ in range(n_calls):
+        compiled.predict_one(row)
+    print(f"predict_one:      {(time.perf_counter() - t0) / n_calls * 1e6:8.2f} µs/row")
+
+    big = pd.concat([df] * 150, ignore_index=True)
+    numeric, codes = compiled.encode(big)
+    t0 = time.perf_counter()
+    compiled.predict_encoded(numeric, codes)
+    elapsed = time.perf_counter() - t0
+    print(f"predict_encoded:  {len(big) / elapsed / 1e6:8.2f} M rows/s ({len(big):,} rows)")
+    t0 = time.perf_counter()
+    compiled.predict(big)
+    elapsed = time.perf_counter() - t0
+    print(f"predict (frame):  {len(big) / elapsed / 1e6:8.2f} M rows/s incl. string encoding")
@@ -0,0 +1,434 @@
+"""
+EduMetrics AI — Online Updates
+Folds a new term of (features, Exam_Score) rows into the newest model version
+without refitting on the full history. Three pieces of state carry over from
+version to version and are stored next to the model:
+
+- RunningStats: sufficient statistics for the pipeline's fitted
+  preprocessing.
+  - Welford count / mean / M2 per numeric input, merged batch-wise, for the
+    StandardScaler.
+  - Integer histograms per numeric input, for exact imputer medians.
+  - Level counts per categorical input, for the imputer modes.
+- A reservoir: a uniform sample of at most RESERVOIR_SIZE past rows.
+- The previous HuberRegressor.
+
+An update refreshes the imputers and scaler from the merged statistics. It
+then re-expresses the old coefficients in the new scaler's units, so the
+starting model predicts exactly as before. From there it warm-starts the
+Huber fit on the new rows plus the reservoir. All of this costs
+O(batch + reservoir), independent of how many terms came before.
+
+A fifth of the batch is held out to evaluate the parent and the updated
+model. The new version is published under models/ like `training.py fit`,
+with a coefficient drift report.
+
+    python online.py new_term.csv                       # update the newest version
+    python online.py new_term.csv --parent models/<version> --reservoir 5000
+"""
+import copy
+import json
+import os
+import platform
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifact import (MANIFEST_FORMAT, MANIFEST_VERSION, MODELS_DIR, check_compatible, latest_version,
+                      read_manifest, save_slim, version_paths, write_manifest)
+from scoring import FEATURE_COLUMNS, NOMINAL_FEATURES, NUMERIC_FEATURES, ORDINAL_FEATURES, TARGET_COLUMN, validate_columns
+from training import RANDOM_STATE, load_training_data, regression_metrics, train_test_split_data
+
+STATE_NAME     = 'online_state.json'
+RESERVOIR_NAME = 'reservoir.csv'
+DRIFT_NAME     = 'coef_drift.json'
+STATE_FORMAT   = 'edumetrics-online'
+STATE_VERSION  = 1
+RESERVOIR_SIZE = 5000
+MIN_BATCH_ROWS = 10
+
+CATEGORICAL_FEATURES = ORDINAL_FEATURES + NOMINAL_FEATURES
+
+
+# ==========================================
+# 1. Running Statistics
+# ==========================================
+class RunningStats:
+    """Mergeable statistics that reproduce the fitted imputers and scaler of the pipeline."""
+
+    def __init__(self, count=None, mean=None, m2=None, hists=None, level_counts=None):
+        k = len(NUMERIC_FEATURES)
+        self.count        = np.zeros(k, dtype=np.int64) if count is None else np.asarray(count, dtype=np.int64)
+        self.mean         = np.zeros(k) if mean is None else np.asarray(mean, dtype=float)
+        self.m2           = np.zeros(k) if m2 is None else np.asarray(m2, dtype=float)
+        self.hists        = [np.zeros(0, dtype=np.int64) for _ in range(k)] if hists is None else \
+                            [np.asarray(h, dtype=np.int64) for h in hists]
+        self.level_counts = {f: {} for f in CATEGORICAL_FEATURES} if level_counts is None else \
+                            {f: dict(level_counts[f]) for f in CATEGORICAL_FEATURES}
+
+    def update(self, X):
+        """Merge a batch of input rows (DataFrame with the 19 feature columns)."""
+        for feature in CATEGORICAL_FEATURES:
+            counts = self.level_counts[feature]
+            for level, n in X[feature].value_counts(dropna=True).items():
+                counts[level] = counts.get(level, 0) + int(n)
+
+        numeric = np.column_stack([pd.to_numeric(X[f], errors='coerce').to_numpy(dtype=float)
+                                   for f in NUMERIC_FEATURES])
+        observed = ~np.isnan(numeric)
+        for j in range(numeric.shape[1]):
+            values = numeric[observed[:, j], j]
+            if (values < 0).any() or not np.array_equal(values, np.round(values)):
+                raise ValueError(f"{NUMERIC_FEATURES[j]} must hold non-negative whole numbers")
+            counts = np.bincount(values.astype(np.int64), minlength=len(self.hists[j]))
+            counts[:len(self.hists[j])] += self.hists[j]
+            self.hists[j] = counts
+
+        # The scaler is fitted after imputation, so missing values enter it as the current median
+        imputed = np.where(observed, numeric, self.medians())
+        n_b     = imputed.shape[0]
+        mean_b  = imputed.mean(axis=0)
+        m2_b    = ((imputed - mean_b) ** 2).sum(axis=0)
+        n       = self.count + n_b
+        delta   = mean_b - self.mean
+        self.mean  = self.mean + delta * n_b / n
+        self.m2    = self.m2 + m2_b + delta ** 2 * self.count * n_b / n
+        self.count = n
+        return self
+
+    def medians(self):
+        """Exact medians from the histograms (the mean of the two middle values for an even count)."""
+        out = np.empty(len(self.hists))
+        for j, hist in enumerate(self.hists):
+            cumulative = np.cumsum(hist)
+            total = cumulative[-1] if len(cumulative) else 0
+            if not total:
+                raise ValueError(f"No observed values for {NUMERIC_FEATURES[j]}")
+            lo = np.searchsorted(cumulative, (total - 1) // 2, side='right')
+            hi = np.searchsorted(cumulative, total // 2, side='right')
+            out[j] = (lo + hi) / 2
+        return out
+
+    def modes(self):
+        """Most frequent level per categorical input; ties go to the smallest level, as SimpleImputer does."""
+        out = {}
+        for feature, counts in self.level_counts.items():
+            top = max(counts.values())
+            out[feature] = min(level for level, n in counts.items() if n == top)
+        return out
+
+    def variance(self):
+        return self.m2 / self.count
+
+    def to_dict(self):
+        return {'count': self.count.tolist(), 'mean': self.mean.tolist(), 'm2': self.m2.tolist(),
+                'hists': [h.tolist() for h in self.hists], 'level_counts': self.level_counts}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['count'], d['mean'], d['m2'], d['hists'], d['level_counts'])
+
+
+def reservoir_update(reservoir, batch, seen, size, rng):
+    """Algorithm R over a whole batch: a uniform sample of `size` rows from all `seen + len(batch)`."""
+    n_fill    = max(0, min(size - len(reservoir), len(batch)))
+    reservoir = pd.concat([reservoir, batch.iloc[:n_fill]], ignore_index=True)
+    rest      = batch.iloc[n_fill:]
+    if rest.empty:
+        return reservoir
+
+    arrival = seen + n_fill + np.arange(len(rest))   # 0-based global index of each remaining row
+    slots   = rng.integers(0, arrival + 1)
+    accepted = np.flatnonzero(slots < size)[::-1]
+    # When two rows land in the same slot the later one wins, as in the sequential algorithm
+    slot, first = np.unique(slots[accepted], return_index=True)
+    positions = np.arange(len(reservoir))
+    positions[slot] = len(reservoir) + accepted[first]
+    return pd.concat([reservoir, rest], ignore_index=True).iloc[positions].reset_index(drop=True)
+
+
+# ==========================================
+# 2. Persisted State
+# ==========================================
+def write_state(version_dir, stats, reservoir, seen, seed):
+    reservoir.to_csv(os.path.join(version_dir, RESERVOIR_NAME), index=False)
+    doc = {'format': STATE_FORMAT, 'format_version': STATE_VERSION, 'seen': int(seen), 'seed': int(seed),
+           'reservoir_rows': len(reservoir), 'stats': stats.to_dict()}
+    with open(os.path.join(version_dir, STATE_NAME), 'w') as fh:
+        json.dump(doc, fh)
+
+
+def read_state(version_dir):
+    """(stats, reservoir, seen, seed) stored with a version, or None if it has no online state."""
+    path = os.path.join(version_dir, STATE_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        doc = json.load(fh)
+    if doc.get('format') != STATE_FORMAT or doc.get('format_version') != STATE_VERSION:
+        raise ValueError(f"{path} is not a v{STATE_VERSION} online state file")
+    reservoir = pd.read_csv(os.path.join(version_dir, RESERVOIR_NAME))
+    return RunningStats.from_dict(doc['stats']), reservoir, doc['seen'], doc['seed']
+
+
+def bootstrap_state(version_dir, manifest, pipeline, reservoir_size=RESERVOIR_SIZE):
+    """Rebuild the online state of a version fitted by `training.py fit` from its training split.
+
+    This is the one pass over the full history; every later update carries the
+    state forward instead.
+    """
+    from cache import file_sha256
+
+    data = manifest['data']
+    if not os.path.exists(data['path']) or file_sha256(data['path']) != data['sha256']:
+        raise ValueError(f"{version_dir} has no online state and its training data {data['path']} "
+                         f"is missing or has changed")
+    X, y = load_training_data(data['path'])
+    X_train, _, y_train, _ = train_test_split_data(X, y)
+
+    stats  = RunningStats().update(X_train)
+    scaler = pipeline.named_steps['preprocessor'].named_transformers_['num'].named_steps['scaler']
+    if not np.allclose(stats.mean, scaler.mean_) or not np.allclose(stats.variance(), scaler.var_):
+        raise ValueError(f"{version_dir} was not fitted on the training split of {data['path']}")
+
+    train     = X_train.assign(**{TARGET_COLUMN: y_train}).reset_index(drop=True)
+    rng       = np.random.default_rng(RANDOM_STATE)
+    reservoir = train.iloc[np.sort(rng.choice(len(train), min(reservoir_size, len(train)), replace=False))]
+    return stats, reservoir.reset_index(drop=True), len(train), RANDOM_STATE
+
+
+# ==========================================
+# 3. Model Update
+# ==========================================
+def _base_data(manifest):
+    """{'path', 'sha256'} of the CSV the version's lineage was first fitted on."""
+    online = manifest.get('online')
+    if online and 'base_data' in online:
+        return online['base_data']
+    return {'path': manifest['data']['path'], 'sha256': manifest['data']['sha256']}
+
+
+def _base_test_split(base):
+    """(X_test, y_test) of the original training split, or None if that CSV is missing or has changed."""
+    from cache import file_sha256
+
+    if not os.path.exists(base['path']) or file_sha256(base['path']) != base['sha256']:
+        return None
+    X, y = load_training_data(base['path'])
+    _, X_test, _, y_test = train_test_split_data(X, y)
+    return X_test, y_test
+
+
+def _new_version_dir(models_dir, version=None):
+    """Create the version directory; a timestamp name already taken this second gets a -2, -3... suffix."""
+    if version is not None:
+        version_dir = os.path.join(models_dir, version)
+        os.makedirs(version_dir)
+        return version, version_dir
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+    for n in range(1, 1000):
+        version     = stamp if n == 1 else f"{stamp}-{n}"
+        version_dir = os.path.join(models_dir, version)
+        try:
+            os.makedirs(version_dir)
+            return version, version_dir
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free version name for {stamp} under {models_dir}/")
+
+
+def _fitted_steps(pipeline):
+    preprocessor = pipeline.named_steps['preprocessor']
+    num = preprocessor.named_transformers_['num']
+    return (num.named_steps['imputer'], num.named_steps['scaler'],
+            [preprocessor.named_transformers_[name].named_steps['imputer'] for name in ('ord', 'nom')],
+            pipeline.named_steps['regressor'])
+
+
+def apply_stats(pipeline, stats):
+    """Copy of `pipeline` with imputers and scaler refreshed from `stats`.
+
+    The regressor is re-expressed in the new scaler units, so predictions
+    only change through the imputed fill values.
+    """
+    pipeline = copy.deepcopy(pipeline)
+    num_imputer, scaler, cat_imputers, regressor = _fitted_steps(pipeline)
+
+    k         = len(NUMERIC_FEATURES)
+    raw_slope = regressor.coef_[:k] / scaler.scale_
+    new_var   = stats.variance()
+    new_scale = np.where(new_var > 0, np.sqrt(new_var), 1.0)
+    regressor.intercept_ = float(regressor.intercept_ - raw_slope @ scaler.mean_ + raw_slope @ stats.mean)
+    regressor.coef_[:k]  = raw_slope * new_scale
+
+    num_imputer.statistics_ = stats.medians()
+    scaler.mean_, scaler.var_, scaler.scale_ = stats.mean.copy(), new_var, new_scale
+    scaler.n_samples_seen_ = stats.count.copy()
+    modes = stats.modes()
+    for imputer, features in zip(cat_imputers, (ORDINAL_FEATURES, NOMINAL_FEATURES)):
+        imputer.statistics_ = np.array([modes[f] for f in features], dtype=object)
+    return pipeline
+
+
+def raw_coefficients(pipeline):
+    """{transformed column: slope per raw input unit} plus the raw-unit intercept."""
+    preprocessor = pipeline.named_steps['preprocessor']
+    _, scaler, _, regressor = _fitted_steps(pipeline)
+    k     = len(NUMERIC_FEATURES)
+    coef  = regressor.coef_.copy()
+    coef[:k] = coef[:k] / scaler.scale_
+    names = [name.split('__', 1)[1] for name in preprocessor.get_feature_names_out()]
+    return dict(zip(names, coef.tolist())), float(regressor.intercept_ - coef[:k] @ scaler.mean_)
+
+
+def coefficient_drift(parent, updated, X_check):
+    """How far the model moved: per-column slope changes in raw units and prediction shifts on X_check."""
+    old, old_intercept = raw_coefficients(parent)
+    new, new_intercept = raw_coefficients(updated)
+    rows = sorted(({'column': name, 'old': old[name], 'new': new[name], 'delta': new[name] - old[name]}
+                   for name in old), key=lambda r: -abs(r['delta']))
+    delta = np.array([r['delta'] for r in rows])
+    shift = updated.predict(X_check) - parent.predict(X_check)
+    return {
+        'summary': {
+            'l2':                   float(np.sqrt(np.sum(delta ** 2))),
+            'max_abs':              float(np.max(np.abs(delta))),
+            'max_abs_column':       rows[0]['column'],
+            'intercept_delta':      new_intercept - old_intercept,
+            'prediction_shift_mean': float(np.mean(shift)),
+            'prediction_shift_max':  float(np.max(np.abs(shift))),
+        },
+        'columns': rows,
+    }
+
+
+def update_version(batch_csv, parent_dir=None, models_dir=MODELS_DIR, version=None, reservoir_size=RESERVOIR_SIZE):
+    """Fold `batch_csv` into `parent_dir` (default: newest version); returns (version_dir, manifest, drift)."""
+    import joblib
+    import sklearn
+
+    from cache import file_sha256
+    from kernel import compile_pipeline
+    from training import _file_entry
+
+    parent_dir = parent_dir or latest_version(models_dir)
+    if parent_dir is None:
+        raise FileNotFoundError(f"No model version under {models_dir}/ — run `python training.py fit` first")
+    parent_manifest = read_manifest(parent_dir)
+    check_compatible(parent_dir, parent_manifest)
+    parent = joblib.load(version_paths(parent_dir)[0])
+
+    state = read_state(parent_dir) or bootstrap_state(parent_dir, parent_manifest, parent, reservoir_size)
+    stats, reservoir, seen, seed = state
+
+    batch = validate_columns(pd.read_csv(batch_csv))
+    if TARGET_COLUMN not in batch.columns:
+        raise ValueError(f"{batch_csv} has no {TARGET_COLUMN} column to learn from")
+    batch = batch[batch[TARGET_COLUMN].notna() & (batch[TARGET_COLUMN] <= 100)]
+    if len(batch) < MIN_BATCH_ROWS:
+        raise ValueError(f"{batch_csv} has {len(batch)} usable rows; at least {MIN_BATCH_ROWS} are needed")
+    X, y = batch[FEATURE_COLUMNS], batch[TARGET_COLUMN]
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y)
+
+    t0 = time.perf_counter()
+    stats.update(X_train)
+    updated = apply_stats(parent, stats)
+    # Every new row plus a uniform sample of the older ones, drawn before this batch joins the reservoir
+    fit_rows = pd.concat([X_train.assign(**{TARGET_COLUMN: y_train}), reservoir], ignore_index=True)
+    regressor = updated.named_steps['regressor']
+    regressor.warm_start = True
+    regressor.fit(updated.named_steps['preprocessor'].transform(fit_rows[FEATURE_COLUMNS]), fit_rows[TARGET_COLUMN])
+    regressor.warm_start = False
+    rng       = np.random.default_rng([seed, seen])
+    reservoir = reservoir_update(reservoir, X_train.assign(**{TARGET_COLUMN: y_train}), seen, reservoir_size, rng)
+    seen     += len(X_train)
+    update_seconds = time.perf_counter() - t0
+
+    version, version_dir = _new_version_dir(models_dir, version)
+    model_path, slim_path = version_paths(version_dir)
+    joblib.dump(updated, model_path)
+    save_slim(compile_pipeline(updated, check_df=X), slim_path, source_sha256=file_sha256(model_path))
+    write_state(version_dir, stats, reservoir, seen, seed)
+
+    drift = coefficient_drift(parent, updated, X_test)
+    # The headline 'test' metrics stay on the lineage's original test split, so they compare across
+    # versions; the new batch's own holdout (a fifth of it, noisy for small terms) is reported apart
+    base      = _base_data(parent_manifest)
+    base_test = _base_test_split(base)
+    with open(os.path.join(version_dir, DRIFT_NAME), 'w') as fh:
+        json.dump(drift, fh, indent=1)
+
+    manifest = {
+        'format':          MANIFEST_FORMAT,
+        'format_version':  MANIFEST_VERSION,
+        'version':         version,
+        'created_utc':     time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'model':           'HuberRegressor',
+        'params':          parent_manifest['params'],
+        'data': {
+            'path':         os.path.basename(batch_csv),
+            'sha256':       file_sha256(batch_csv),
+            'rows':         parent_manifest['data']['rows'] + len(batch),
+            'train_rows':   len(X_train),
+            'test_rows':    len(X_test),
+            'random_state': RANDOM_STATE,
+        },
+        'python_version':  platform.python_version(),
+        'sklearn_version': sklearn.__version__,
+        'numpy_version':   np.__version__,
+        'online': {
+            'parent':          os.path.basename(parent_dir),
+            'base_data':       base,
+            'batch_holdout':   {'rows':   len(X_test),
+                                'parent': regression_metrics(y_test, parent.predict(X_test)),
+                                'model':  regression_metrics(y_test, updated.predict(X_test))},
+            'seen_rows':       seen,
+            'fit_rows':        len(fit_rows),
+            'reservoir_rows':  len(reservoir),
+            'coef_drift':      drift['summary'],
+        },
+        'fit_seconds':     update_seconds,
+        'artifacts':       {os.path.basename(path): _file_entry(path) for path in (model_path, slim_path)},
+    }
+    if base_test is not None:
+        manifest['test'] = regression_metrics(base_test[1], updated.predict(base_test[0]))
+    write_manifest(version_dir, manifest)
+    return version_dir, manifest, drift
+
+
+# ==========================================
+# 4. CLI
+# ==========================================
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fold a new term of results into the newest model version")
+    parser.add_argument('batch', help="CSV of new rows: the 19 inputs plus Exam_Score")
+    parser.add_argument('--parent', default=None, help="version directory to update (default: newest)")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--reservoir', type=int, default=RESERVOIR_SIZE, help="rows of history kept for refits")
+    args = parser.parse_args(argv)
+
+    version_dir, manifest, drift = update_version(args.batch, args.parent, args.models_dir,
+                                                  reservoir_size=args.reservoir)
+    online = manifest['online']
+    print(f"Published {version_dir} from {online['parent']} in {manifest['fit_seconds']:.2f} s "
+          f"({online['fit_rows']:,} fit rows, {online['seen_rows']:,} seen)")
+    holdout = online['batch_holdout']
+    print(f"MAE on the new batch's {holdout['rows']:,}-row holdout: "
+          f"{holdout['parent']['mae']:.3f} → {holdout['model']['mae']:.3f}")
+    if 'test' in manifest:
+        print(f"Original test split: MAE {manifest['test']['mae']:.3f}, R² {manifest['test']['r2']:.3f}")
+    else:
+        print(f"Original test split not evaluated: {online['base_data']['path']} is missing or has changed")
+    summary = drift['summary']
+    print(f"Coefficient drift: L2 {summary['l2']:.4f}, max |Δ| {summary['max_abs']:.4f} "
+          f"({summary['max_abs_column']}), mean prediction shift {summary['prediction_shift_mean']:+.3f}")
+    for row in drift['columns'][:5]:
+        print(f"  {row['column']:40s} {row['old']:+.4f} → {row['new']:+.4f}")
+    return manifest
+
+
+if __name__ == '__main__':
+    main()
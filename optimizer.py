@@ -0,0 +1,204 @@
+"""
+EduMetrics AI — Intervention Optimizer
+Finds the cheapest set of changes to actionable inputs that lifts a student's
+projected score to a target tier. The model is linear in each numeric input,
+so every extra unit of an action adds a fixed number of points. Actions are
+bought in order of points-per-effort (the exact optimum of the continuous
+problem); the last partial step is settled by scoring a small batch of integer
+finishing candidates per student and keeping the cheapest. Whole rosters are
+solved at once as array operations. With exact=True every integer combination
+of all but one action is scored in one vectorized batch per student (the last
+action is solved in closed form), which is what the dashboard uses.
+"""
+import numpy as np
+import pandas as pd
+
+from scoring import PASS_THRESHOLD, DISTINCTION_THRESHOLD
+
+# Effort cost per unit of change and the ceiling each input may be raised to.
+# Ceilings stay inside the ranges observed in StudentPerformanceFactors.csv so
+# recommendations never rely on extrapolation.
+ACTIONS = {
+    'Hours_Studied':     {'cost': 1.0, 'max': 40,  'unit': 'h/week'},
+    'Attendance':        {'cost': 0.4, 'max': 100, 'unit': '%'},
+    'Tutoring_Sessions': {'cost': 2.0, 'max': 8,   'unit': 'sessions/month'},
+    'Sleep_Hours':       {'cost': 0.5, 'max': 10,  'unit': 'h/night'},
+    'Physical_Activity': {'cost': 0.5, 'max': 6,   'unit': 'h/week'},
+}
+
+TIER_TARGETS = {'PASS': PASS_THRESHOLD, 'DISTINCTION': DISTINCTION_THRESHOLD}
+
+# How many units below the continuous optimum a partially-bought action is
+# allowed to back off when searching integer finishing combinations
+FINISH_BACKOFF = 3
+
+# Per-student candidate cap for exact search; larger grids keep the closed-form plan
+MAX_EXACT_CANDIDATES = 2_000_000
+
+
+def _finish(remaining, headroom, slope, cost, later):
+    """Cheapest integer completion of `remaining` points using actions `later`.
+
+    Candidates per row: one action alone (rounded up), or one action at
+    floor(gap) − r units (r = 0..FINISH_BACKOFF) topped up by a second action.
+    Returns (units (m, k) to add, feasible (m,)).
+    """
+    m, k    = headroom.shape
+    best    = np.full(m, np.inf)
+    best_u  = np.zeros((m, k))
+    rows    = np.arange(m)
+
+    for a in later:
+        units_a = np.ceil(remaining / slope[a])
+        c = np.where(units_a <= headroom[:, a], units_a * cost[a], np.inf)
+        better = c < best
+        best[better] = c[better]
+        best_u[better] = 0
+        best_u[better, a] = units_a[better]
+
+        for r in range(FINISH_BACKOFF + 1):
+            part = np.clip(np.floor(remaining / slope[a]) - r, 0, headroom[:, a])
+            rest = np.clip(remaining - part * slope[a], 0, None)
+            for b in later:
+                if b == a:
+                    continue
+                units_b = np.ceil(rest / slope[b])
+                c = np.where(units_b <= headroom[:, b], part * cost[a] + units_b * cost[b], np.inf)
+                better = c < best
+                best[better] = c[better]
+                best_u[better] = 0
+                best_u[rows[better], a] = part[better]
+                best_u[rows[better], b] = units_b[better]
+    return best_u, np.isfinite(best)
+
+
+def _exact(remaining, headroom, slope, cost):
+    """Exact integer optimum for one student, or None if the grid is too large.
+
+    Enumerates every combination of all actions except the one with the most
+    headroom, which is then set in closed form to close the remaining gap.
+    """
+    free   = int(np.argmax(headroom))
+    others = [a for a in range(len(slope)) if a != free]
+    if np.prod(headroom[others] + 1) > MAX_EXACT_CANDIDATES:
+        return None
+
+    grid   = np.stack(np.meshgrid(*[np.arange(headroom[a] + 1) for a in others], indexing='ij'),
+                      axis=-1).reshape(-1, len(others))
+    need   = np.clip(remaining - grid @ slope[others], 0, None)
+    u_free = np.ceil(need / slope[free])
+    total  = np.where(u_free <= headroom[free], grid @ cost[others] + u_free * cost[free], np.inf)
+    best   = int(np.argmin(total))
+    if not np.isfinite(total[best]):
+        return None
+
+    units = np.zeros(len(slope))
+    units[others] = grid[best]
+    units[free]   = u_free[best]
+    return units
+
+
+def optimize_encoded(predictor, numeric, raw_scores, target, actions=ACTIONS, exact=False):
+    """Cheapest integer increases to `actions` that lift raw_scores to `target`.
+
+    numeric is the (n, 6) array from `predictor.encode*`. Returns a dict of
+    arrays: deltas (n, k) in `features` order, cost, projected and reachable.
+    Rows already at or above target get all-zero deltas. The closed-form plan
+    costs at most one unit of the dearest action more than the optimum;
+    `exact=True` refines each reachable row by exhaustive batched search.
+    """
+    n_numeric = len(predictor.numeric_features)
+    slopes_by_feature = dict(zip(predictor.numeric_features, predictor.weights[:n_numeric]))
+    features = [f for f in actions if slopes_by_feature[f] > 0]
+
+    columns  = [predictor.numeric_features.index(f) for f in features]
+    slope    = np.array([slopes_by_feature[f] for f in features])
+    cost     = np.array([actions[f]['cost'] for f in features], dtype=float)
+    upper    = np.array([actions[f]['max'] for f in features], dtype=float)
+    headroom = np.floor(np.clip(upper - numeric[:, columns], 0, None))
+
+    raw_scores = np.asarray(raw_scores, dtype=float)
+    remaining  = np.clip(target - raw_scores, 0, None)
+    deltas     = np.zeros_like(headroom)
+    active     = remaining > 0
+    order      = np.argsort(-(slope / cost), kind='stable')
+
+    for pos, k in enumerate(order):
+        if not active.any():
+            break
+        full_gain = headroom[:, k] * slope[k]
+
+        # Rows this action cannot satisfy alone: buy all of it and move on
+        take_all = active & (full_gain < remaining)
+        deltas[take_all, k]  = headroom[take_all, k]
+        remaining[take_all] -= full_gain[take_all]
+
+        # Rows it can satisfy: settle the gap with the cheapest integer finishing combination
+        rows = np.flatnonzero(active & ~take_all)
+        if rows.size:
+            units, _ = _finish(remaining[rows], headroom[rows], slope, cost, order[pos:])
+            deltas[rows]   += units
+            remaining[rows] = 0.0
+            active[rows]    = False
+
+    if exact:
+        gap = np.clip(target - raw_scores, 0, None)
+        for i in np.flatnonzero((gap > 0) & (raw_scores + deltas @ slope >= target)):
+            units = _exact(gap[i], headroom[i], slope, cost)
+            if units is not None:
+                deltas[i] = units
+
+    projected = raw_scores + deltas @ slope
+    return {
+        'features':  features,
+        'deltas':    deltas,
+        'cost':      deltas @ cost,
+        'projected': projected,
+        'reachable': projected >= target,
+    }
+
+
+def plan_for(predictor, input_data, target, actions=ACTIONS):
+    """Optimal plan for one student as a list of change dicts plus totals."""
+    numeric, codes = predictor.encode_records([input_data])
+    raw    = predictor.predict_encoded(numeric, codes)
+    result = optimize_encoded(predictor, numeric, raw, target, actions, exact=True)
+
+    changes = []
+    for k, feature in enumerate(result['features']):
+        delta = result['deltas'][0, k]
+        if delta > 0:
+            current = numeric[0, predictor.numeric_features.index(feature)]
+            changes.append({
+                'feature': feature,
+                'current': current,
+                'new':     current + delta,
+                'delta':   delta,
+                'gain':    delta * predictor.weights[predictor.numeric_features.index(feature)],
+                'cost':    delta * actions[feature]['cost'],
+                'unit':    actions[feature]['unit'],
+            })
+    changes.sort(key=lambda c: -c['gain'])
+    return {
+        'changes':   changes,
+        'cost':      float(result['cost'][0]),
+        'current':   float(raw[0]),
+        'projected': float(result['projected'][0]),
+        'reachable': bool(result['reachable'][0]),
+        'target':    target,
+    }
+
+
+def optimize_roster(predictor, df, target, actions=ACTIONS):
+    """Plans for a whole roster; returns one row per student with per-action changes."""
+    numeric, codes = predictor.encode(df)
+    raw    = predictor.predict_encoded(numeric, codes)
+    result = optimize_encoded(predictor, numeric, raw, target, actions)
+
+    out = pd.DataFrame(result['deltas'], index=df.index,
+                       columns=[f"Change_{f}" for f in result['features']])
+    out['Effort_Cost']      = result['cost']
+    out['Current_Score']    = raw
+    out['Projected_Score']  = result['projected']
+    out['Target_Reachable'] = result['reachable']
+    return out
@@ -0,0 +1,91 @@
+"""
+EduMetrics AI — Parallel Batch Scoring
+Multi-core scoring of a columnar store (see columnar.py). The store is split
+into row shards that a process pool scores independently. Each worker loads
+the model version (the newest published one, as served, unless given) and
+memory-maps the store once, in its initializer, so a task is
+just a (start, stop) pair: no pipeline or roster data is pickled per task, and
+all workers read the same page-cache copy of the columns. Shard results are
+written into one preallocated array in original row order.
+
+    python parallel.py students.edustore scores.npy --workers 8
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from artifact import latest_version, load_version
+from columnar import ColumnStore
+
+DEFAULT_SHARD_ROWS = 250_000
+
+# Per-worker state, populated by _init_worker
+_PREDICTOR = None
+_STORE     = None
+
+
+def _init_worker(store_path, version_dir):
+    global _PREDICTOR, _STORE
+    _PREDICTOR, _ = load_version(version_dir)
+    _STORE     = ColumnStore.open(store_path)
+
+
+def _score_shard(start, stop):
+    numeric, codes = _STORE.encoded(_PREDICTOR, start, stop)
+    return start, _PREDICTOR.predict_encoded(numeric, codes)
+
+
+def shard_bounds(n_rows, shard_rows=DEFAULT_SHARD_ROWS):
+    """(start, stop) pairs covering [0, n_rows) in order."""
+    return [(start, min(start + shard_rows, n_rows)) for start in range(0, n_rows, shard_rows)]
+
+
+def score_store_parallel(store_path, workers=None, shard_rows=DEFAULT_SHARD_ROWS,
+                         version_dir=None, progress=None):
+    """Raw scores for every row of the store at `store_path`, computed by `workers` processes.
+
+    `version_dir` defaults to the newest published model version; it is
+    resolved once here, so every worker scores with the same one.
+    `progress`, if given, is called as progress(rows_done, rows_total) as
+    shards complete (in completion order, not row order).
+    """
+    version_dir = version_dir or latest_version()
+    n_rows = len(ColumnStore.open(store_path))
+    raw    = np.empty(n_rows, dtype=float)
+    done   = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(store_path, version_dir)) as pool:
+        futures = [pool.submit(_score_shard, start, stop) for start, stop in shard_bounds(n_rows, shard_rows)]
+        for future in as_completed(futures):
+            start, shard = future.result()
+            raw[start:start + len(shard)] = shard
+            done += len(shard)
+            if progress is not None:
+                progress(done, n_rows)
+    return raw
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from scoring import TIER_LABELS, assign_tiers, clamp_scores
+
+    parser = argparse.ArgumentParser(description="Score a columnar store on all cores")
+    parser.add_argument('store', help=".edustore directory")
+    parser.add_argument('output', help=".npy file for the raw scores (row order of the store)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument('--version', default=None, help="model version directory (default: newest)")
+    args = parser.parse_args()
+
+    t0  = time.perf_counter()
+    raw = score_store_parallel(args.store, args.workers, args.shard_rows, args.version)
+    elapsed = time.perf_counter() - t0
+    np.save(args.output, raw)
+
+    tiers, counts = np.unique(assign_tiers(clamp_scores(raw)), return_counts=True)
+    summary = dict.fromkeys(TIER_LABELS, 0) | dict(zip(tiers, counts.tolist()))
+    print(f"{args.output}: {len(raw):,} rows in {elapsed:.2f} s ({len(raw) / elapsed:,.0f} rows/s) | " +
+          " | ".join(f"{tier}: {count:,}" for tier, count in summary.items()))
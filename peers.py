@@ -0,0 +1,114 @@
+"""
+EduMetrics AI — Peer Comparison Index
+Puts a predicted score in context against the students in the training CSV:
+- percentiles from sorted Exam_Score arrays, overall and per level of each
+  slice feature (School_Type, Family_Income, Gender,
+  Parental_Education_Level), answered with a binary search
+- "students like you": the nearest training rows in the encoded input space,
+  queried through a BallTree built once rather than by scanning every row per
+  request.
+
+Neighbor distances use the model's own encoding (imputation included).
+Numeric inputs are z-scored, ordinal codes are scaled to 0–1, and binary
+nominals count 0/1, so no single input dominates the metric.
+"""
+import numpy as np
+
+from scoring import FEATURE_COLUMNS, ORDINAL_FEATURES, TARGET_COLUMN
+from training import DATA_PATH, load_training_data
+
+SLICE_FEATURES    = ['School_Type', 'Family_Income', 'Gender', 'Parental_Education_Level']
+DEFAULT_NEIGHBORS = 10
+LEAF_SIZE         = 40
+
+
+class PeerIndex:
+    """Sorted score arrays plus a BallTree over the encoded training rows."""
+
+    def __init__(self, predictor, frame, scores):
+        from sklearn.neighbors import BallTree
+
+        self.predictor = predictor
+        self.frame     = frame.reset_index(drop=True)
+        self.scores    = np.asarray(scores, dtype=float)
+
+        # ---- Percentile tables: one sorted array per (feature, level) ----
+        self.sorted_scores = np.sort(self.scores)
+        self.slices = {}
+        for feature in SLICE_FEATURES:
+            column = self.frame[feature]
+            self.slices[feature] = {level: np.sort(self.scores[(column == level).to_numpy()])
+                                    for level in column.dropna().unique()}
+
+        # ---- Neighbor space ----
+        numeric, codes = predictor.encode(self.frame)
+        self._mean  = numeric.mean(axis=0)
+        self._scale = numeric.std(axis=0)
+        self._scale[self._scale == 0] = 1.0
+        self._code_scale = np.array([max(len(levels) - 1, 1) if feature in ORDINAL_FEATURES else 1
+                                     for feature, levels in zip(predictor.categorical_features,
+                                                                predictor.categorical_levels)], dtype=float)
+        self.tree = BallTree(self._embed(numeric, codes), leaf_size=LEAF_SIZE)
+
+    @classmethod
+    def from_csv(cls, predictor, path=DATA_PATH):
+        """Index the same cleaned rows the model is trained on (Exam_Score ≤ 100)."""
+        X, y = load_training_data(path)
+        return cls(predictor, X[FEATURE_COLUMNS], y)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def _embed(self, numeric, codes):
+        # Unknown levels (code -1) sit one step below the lowest level
+        return np.hstack([(numeric - self._mean) / self._scale, codes / self._code_scale])
+
+    # ---- Percentiles ----
+    @staticmethod
+    def _percentile(sorted_scores, score):
+        """Mid-rank percentile: share of students below `score`, counting ties as half."""
+        n = len(sorted_scores)
+        if not n:
+            return float('nan')
+        below = np.searchsorted(sorted_scores, score, side='left')
+        upto  = np.searchsorted(sorted_scores, score, side='right')
+        return float(100.0 * (below + upto) / (2 * n))
+
+    @staticmethod
+    def _median(sorted_scores):
+        n = len(sorted_scores)
+        if not n:
+            return float('nan')
+        return float((sorted_scores[(n - 1) // 2] + sorted_scores[n // 2]) / 2)
+
+    def percentile(self, score, feature=None, level=None):
+        """Percentile of `score` overall, or within students whose `feature` equals `level`."""
+        if feature is None:
+            return self._percentile(self.sorted_scores, score)
+        if feature not in self.slices:
+            raise ValueError(f"'{feature}' is not a slice feature; choose from {SLICE_FEATURES}")
+        return self._percentile(self.slices[feature].get(level, np.empty(0)), score)
+
+    def compare(self, score, row):
+        """Overall and per-slice standing of `score` for a student described by `row`.
+
+        Returns {'overall': {...}, '<slice feature>': {...}} where each entry has
+        level, n (students in the group), percentile and median score.
+        """
+        groups = {'overall': (None, self.sorted_scores)}
+        for feature in SLICE_FEATURES:
+            level = row.get(feature)
+            groups[feature] = (level, self.slices[feature].get(level, np.empty(0)))
+        return {name: {'level': level, 'n': len(scores), 'percentile': self._percentile(scores, score),
+                       'median': self._median(scores)}
+                for name, (level, scores) in groups.items()}
+
+    # ---- Nearest neighbors ----
+    def neighbors(self, row, k=DEFAULT_NEIGHBORS):
+        """The `k` training students closest to `row`: their inputs, Exam_Score and distance."""
+        numeric, codes = self.predictor.encode_records([row])
+        distance, index = self.tree.query(self._embed(numeric, codes), k=min(k, len(self)))
+        peers = self.frame.iloc[index[0]].copy()
+        peers[TARGET_COLUMN] = self.scores[index[0]]
+        peers['distance']    = distance[0]
+        return peers
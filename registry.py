@@ -0,0 +1,283 @@
+"""
+EduMetrics AI — Model Registry
+Hot reload of published model versions (models/<version>/, see training.py)
+without restarting the process. A watcher thread polls the models directory.
+When a newer version appears it is loaded in the background, checked against
+the golden predictions in models/golden.json, and only then swapped in.
+
+Each version is served through an immutable ModelHandle that owns its own
+InferenceScheduler and PredictionCache. The swap replaces the registry's
+current handle under a lock. Callers take one handle and use it for the whole
+request, so in-flight work finishes on the version it started on. The retired
+handle drains its queued batches, then drops its cached predictions.
+Each handle also keeps a DriftSketch of the rows it scored (drift.py).
+
+    python registry.py golden        # snapshot golden predictions from the newest version
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from artifact import (MANIFEST_NAME, MODELS_DIR, latest_version, list_versions, load_version, model_fingerprint,
+                      version_paths)
+from cache import PredictionCache, DEFAULT_CACHE_SIZE
+from drift import DriftSketch, compare, load_reference
+from scheduler import InferenceScheduler, DEFAULT_WINDOW_MS, DEFAULT_MAX_BATCH
+from scoring import FEATURE_COLUMNS
+from telemetry import span
+
+GOLDEN_PATH       = os.path.join(MODELS_DIR, 'golden.json')
+GOLDEN_ROWS       = 256
+GOLDEN_TOLERANCE  = 1.0   # max |Δ| in exam points a new version may differ by on the golden rows
+DEFAULT_POLL_S    = 5.0
+HISTORY_SIZE      = 50
+
+
+# ==========================================
+# 1. Golden Predictions
+# ==========================================
+def write_golden(predictor, csv_path='StudentPerformanceFactors.csv', path=GOLDEN_PATH,
+                 n_rows=GOLDEN_ROWS, tolerance=GOLDEN_TOLERANCE, seed=0):
+    """Snapshot `predictor`'s scores on a fixed sample of CSV rows (missing values included)."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)[FEATURE_COLUMNS]
+    df = df.sample(n=min(n_rows, len(df)), random_state=seed)
+    records = [{k: (None if v != v else v) for k, v in row.items()} for row in df.to_dict('records')]
+    doc = {'tolerance': tolerance, 'records': records,
+           'expected': np.asarray(predictor.predict_records(records), dtype=float).tolist()}
+    with open(path, 'w') as fh:
+        json.dump(doc, fh, indent=1)
+    return path
+
+
+def read_golden(path=GOLDEN_PATH):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def check_golden(predictor, golden):
+    """Raise ValueError unless `predictor` reproduces the golden scores within tolerance."""
+    raw = np.asarray(predictor.predict_records(golden['records']), dtype=float)
+    if not np.all(np.isfinite(raw)):
+        raise ValueError("Golden check failed: non-finite predictions")
+    deviation = float(np.max(np.abs(raw - np.asarray(golden['expected'], dtype=float))))
+    if deviation > golden['tolerance']:
+        raise ValueError(f"Golden check failed: max deviation {deviation:.3f} > {golden['tolerance']} points")
+    return deviation
+
+
+def publish_key(version_dir):
+    """(model hash, manifest mtime, manifest size): changes whenever a version is re-published.
+
+    A rejection is remembered under this key, so a poll that caught a version
+    mid-publish retries it once the manifest changes, instead of until restart.
+    """
+    stat = os.stat(os.path.join(version_dir, MANIFEST_NAME))
+    return model_fingerprint(*version_paths(version_dir)), stat.st_mtime_ns, stat.st_size
+
+
+# ==========================================
+# 2. Version Handles
+# ==========================================
+class ModelHandle:
+    """One loaded model version with its own micro-batching queue and prediction cache."""
+
+    def __init__(self, version_dir, model_hash, predictor, manifest, window_ms, max_batch, cache_size, audit=None):
+        self.version_dir = version_dir
+        self.version     = manifest['version']
+        self.model_hash  = model_hash
+        self.predictor   = predictor
+        self.manifest    = manifest
+        self.scheduler   = InferenceScheduler(self._score_records, window_ms, max_batch)
+        self.cache       = PredictionCache(cache_size)
+        self.cache.bind(model_hash)
+        self.drift       = DriftSketch.for_predictor(predictor)
+        self.audit       = audit
+        self.retired     = False
+        self._reference  = None
+        self._lock       = threading.Lock()
+
+    def _score_records(self, records):
+        with span('preprocess'):
+            numeric, codes = self.predictor.encode_records(records)
+        with span('predict'):
+            raw = self.predictor.predict_encoded(numeric, codes)
+        # Cache hits never reach here, so the sketch counts distinct scoring work, not reruns
+        with span('drift_update'):
+            self.drift.update_encoded(numeric, codes, raw)
+        if self.audit is not None:
+            # Hands over the arrays already encoded for scoring; the writer thread does the rest
+            self.audit.log_encoded(self.predictor, self.model_hash, numeric, codes, raw, source='api')
+        return raw
+
+    def submit(self, records):
+        """Future of raw scores for `records`, always computed by this version."""
+        with self._lock:
+            if not self.retired:
+                return self.scheduler.submit(records)
+        # Retired while a caller still held this handle: score directly, unbatched
+        future = Future()
+        future.set_result(np.asarray(self._score_records(records), dtype=float))
+        return future
+
+    def predict_one(self, record, timeout=None):
+        return float(self.submit([record]).result(timeout)[0])
+
+    def predict_cached(self, record):
+        return self.cache.get_or_compute(record, self.predict_one)
+
+    def drift_report(self):
+        """`drift.compare` of the rows this version has scored against its training reference."""
+        if self._reference is None:
+            self._reference = load_reference(self.version_dir, self.predictor)
+        return compare(self._reference, self.drift)
+
+    def retire(self):
+        """Stop accepting batched work, drain what is queued, and evict cached predictions."""
+        with self._lock:
+            self.retired = True
+        self.scheduler.close()
+        self.cache.clear()
+
+
+# ==========================================
+# 3. Registry
+# ==========================================
+class ModelRegistry:
+    """Serves the newest validated version under `models_dir` and hot-swaps to newer ones."""
+
+    def __init__(self, models_dir=MODELS_DIR, golden_path=GOLDEN_PATH, poll_interval=DEFAULT_POLL_S,
+                 window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH, cache_size=DEFAULT_CACHE_SIZE, audit=None):
+        self.models_dir    = models_dir
+        self.golden_path   = golden_path
+        self.poll_interval = poll_interval
+        self.window_ms     = window_ms
+        self.max_batch     = max_batch
+        self.cache_size    = cache_size
+        self.audit         = audit   # optional auditlog.AuditLog for every batch scored
+
+        self.history   = deque(maxlen=HISTORY_SIZE)
+        self._current  = None
+        self._rejected = {}   # version_dir → publish key that failed, so it is not retried every poll
+        self._lock     = threading.Lock()
+        self._stop     = threading.Event()
+        self._watcher  = None
+
+    # ---- Lifecycle ----
+    def start(self, watch=True):
+        """Load the newest usable version synchronously, then start watching.
+
+        Versions that fail to load or miss the golden check are skipped (and
+        recorded in `history`), so one bad publish does not stop a restart.
+        Raises only if no version at all is usable.
+        """
+        versions = list_versions(self.models_dir)
+        if not versions:
+            raise FileNotFoundError(f"No trained model found under {self.models_dir}/ — run `python training.py fit`")
+        handle = self._load_newest(reversed(versions))
+        if handle is None:
+            newest = next(h['detail'] for h in self.history if h['event'] == 'rejected')
+            raise ValueError(f"No usable model version under {self.models_dir}/ — newest rejected: {newest}")
+        self._swap(handle)
+        if watch and self.poll_interval:
+            self._watcher = threading.Thread(target=self._watch, name='model-registry', daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        with self._lock:
+            handle, self._current = self._current, None
+        if handle is not None:
+            handle.retire()
+
+    # ---- Client API ----
+    def current(self):
+        """The handle to use for one request; hold on to it until the request is done."""
+        with self._lock:
+            if self._current is None:
+                raise RuntimeError("ModelRegistry has no model loaded")
+            return self._current
+
+    def check_now(self):
+        """Look for a newer version once; returns True if one was swapped in."""
+        current = self.current()
+        # Version names sort by publish time; the newest usable one newer than what is served wins
+        newer  = [v for v in list_versions(self.models_dir) if os.path.basename(v) > os.path.basename(current.version_dir)]
+        handle = self._load_newest(reversed(newer))
+        if handle is None:
+            return False
+        self._swap(handle)
+        return True
+
+    def status(self):
+        handle = self.current()
+        return {
+            'version':     handle.version,
+            'model_hash':  handle.model_hash,
+            'scheduler':   handle.scheduler.metrics(),
+            'cache':       handle.cache.stats(),
+            'drift_rows':  len(handle.drift),
+            'history':     list(self.history),
+        }
+
+    # ---- Internals ----
+    def _load_newest(self, version_dirs):
+        """Handle for the first of `version_dirs` that loads and passes the golden check, else None."""
+        for version_dir in version_dirs:
+            key = None
+            try:
+                key = publish_key(version_dir)
+                if self._rejected.get(version_dir) == key:
+                    continue
+                return self._load(version_dir, key[0])
+            except Exception as e:
+                # A broken artifact must never take down the watcher or the version being served
+                self._rejected[version_dir] = key
+                self._record(version_dir, 'rejected', str(e))
+        return None
+
+    def _load(self, version_dir, model_hash=None):
+        model_hash = model_hash or model_fingerprint(*version_paths(version_dir))
+        predictor, manifest = load_version(version_dir)
+        detail = 'no golden set'
+        if self.golden_path and os.path.exists(self.golden_path):
+            detail = f"golden max |Δ| {check_golden(predictor, read_golden(self.golden_path)):.2e}"
+        handle = ModelHandle(version_dir, model_hash, predictor, manifest,
+                             self.window_ms, self.max_batch, self.cache_size, self.audit)
+        self._record(version_dir, 'validated', detail)
+        return handle
+
+    def _swap(self, handle):
+        with self._lock:
+            old, self._current = self._current, handle
+        self._record(handle.version_dir, 'serving', handle.model_hash[:12])
+        if old is not None:
+            old.retire()
+            self._record(old.version_dir, 'retired', '')
+
+    def _record(self, version_dir, event, detail):
+        self.history.append({'time': time.time(), 'version': os.path.basename(version_dir),
+                             'event': event, 'detail': detail})
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check_now()
+
+
+if __name__ == '__main__':
+    import sys
+
+    if sys.argv[1:] != ['golden']:
+        sys.exit("usage: python registry.py golden")
+    version_dir = latest_version()
+    predictor, _ = load_version(version_dir)
+    print(f"Wrote {write_golden(predictor)} from {version_dir}")
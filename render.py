@@ -0,0 +1,121 @@
+"""
+EduMetrics AI — Render Templates
+Static parts of the dashboard, built once instead of on every rerun:
+- minify_css / compact_html shrink the inline stylesheet and landing-page
+  HTML the app re-sends on every run
+- gauge_figure / driver_figure build the plotly figures with all styling and
+  layout applied, and fill_gauge / fill_drivers then only write the new data
+  into them in place.
+
+A submit therefore costs one vectorized bar trace plus the gauge value,
+instead of rebuilding a trace per bar and the whole gauge. plotly is
+imported inside the builders so the landing page never loads it.
+"""
+import re
+
+import numpy as np
+
+GAUGE_STEPS = [
+    {'range': [0,  60],  'color': 'rgba(252,129,129,0.06)'},
+    {'range': [60, 80],  'color': 'rgba(246,173,85,0.06)'},
+    {'range': [80, 100], 'color': 'rgba(104,211,145,0.06)'},
+]
+POSITIVE_COLOR = '#48bb78'
+NEGATIVE_COLOR = '#fc8181'
+LABEL_FONT     = dict(family='DM Mono', size=11, color='#8a93a8')
+
+
+# ==========================================
+# 1. Static HTML / CSS
+# ==========================================
+def minify_css(html):
+    """Strip comments and redundant whitespace from an inline <style> block.
+
+    Conservative: only whitespace next to CSS punctuation is removed, so
+    selectors like `.a .b` and values like `0 2px 4px` keep their meaning.
+    """
+    html = re.sub(r'/\*.*?\*/', '', html, flags=re.S)
+    html = re.sub(r'\s+', ' ', html)
+    html = re.sub(r'\s*([{};,>])\s*', r'\1', html)
+    html = re.sub(r':\s+', ':', html)
+    return html.replace(';}', '}').strip()
+
+
+def compact_html(html):
+    """Fold the source indentation of an HTML block onto one line (inline spacing is kept)."""
+    return re.sub(r'\s*\n\s*', ' ', html).strip()
+
+
+# ==========================================
+# 2. Figure Templates
+# ==========================================
+def gauge_figure():
+    """Score gauge with the dashboard's dark styling; the value is set by fill_gauge."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode   = "gauge+number",
+        value  = 0,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        number = {'font': {'size': 72, 'color': '#e8eaf0', 'family': 'Syne'}, 'valueformat': ".1f"},
+        gauge  = {
+            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': '#2a2f3e',
+                     'tickfont': {'color': '#4a5068', 'family': 'DM Mono', 'size': 10}, 'nticks': 6},
+            'bar':         {'thickness': 0.22},
+            'bgcolor':     'rgba(0,0,0,0)',
+            'borderwidth': 0,
+            'steps':       GAUGE_STEPS,
+            'threshold':   {'line': {'color': '#e8eaf0', 'width': 2}, 'thickness': 0.7, 'value': 0},
+        },
+    ))
+    fig.update_layout(height=300, margin=dict(l=24, r=24, t=24, b=0), font_family='DM Mono',
+                      paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
+    fig.add_annotation(text="<b>/100</b>", x=0.5, y=0.30, xref="paper", yref="paper", showarrow=False,
+                       font=dict(size=18, color='#4a5068', family='DM Mono'))
+    return fig
+
+
+def fill_gauge(fig, score, bar_color):
+    indicator = fig.data[0]
+    with fig.batch_update():
+        indicator.value                 = score
+        indicator.gauge.bar.color       = bar_color
+        indicator.gauge.threshold.value = score
+    return fig
+
+
+def driver_figure():
+    """Diverging horizontal bars of score contributions; bars and axis range are set by fill_drivers."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        orientation='h', textposition='outside', textfont=LABEL_FONT, cliponaxis=False,
+        marker=dict(line=dict(width=0)), hovertemplate="<b>%{y}</b>: %{x:+.2f} points<extra></extra>",
+    ))
+    fig.update_layout(
+        showlegend    = False,
+        paper_bgcolor = 'rgba(0,0,0,0)',
+        plot_bgcolor  = 'rgba(0,0,0,0)',
+        height        = 300,
+        margin        = dict(l=10, r=40, t=10, b=10),
+        xaxis         = dict(showgrid=False, zeroline=True, zerolinecolor='#2a2f3e', zerolinewidth=1,
+                             showticklabels=False),
+        yaxis         = dict(showgrid=False, tickfont=LABEL_FONT, ticklabelposition='outside',
+                             autorange='reversed'),
+        bargap        = 0.35,
+    )
+    return fig
+
+
+def fill_drivers(fig, labels, values):
+    """Write one bar per driver (largest first), green when it lifts the score and red when it lowers it."""
+    values = np.asarray(values, dtype=float)
+    reach  = float(np.abs(values).max(initial=0.0)) or 1.0
+    bars   = fig.data[0]
+    with fig.batch_update():
+        bars.y            = list(labels)
+        bars.x            = values
+        bars.text         = [f"{v:+.1f}" for v in values]
+        bars.marker.color = np.where(values >= 0, POSITIVE_COLOR, NEGATIVE_COLOR).tolist()
+        fig.layout.xaxis.range = [-1.3 * reach, 1.3 * reach]
+    return fig
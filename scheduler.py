@@ -0,0 +1,160 @@
+"""
+EduMetrics AI — Inference Scheduler
+Shared in-process micro-batcher. Any thread (Streamlit sessions, the asyncio
+scoring service, batch helpers) submits records and gets a Future back; a
+single worker collects everything that arrives within `window_ms` (or until
+`max_batch` rows are queued), runs one batched predict, and fans the results
+back out. Queue depth, batch sizes and wait times are tracked for tuning.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+DEFAULT_WINDOW_MS = 2.0
+DEFAULT_MAX_BATCH = 1024
+WAIT_SAMPLE_SIZE  = 4096
+
+
+class InferenceScheduler:
+    """Collect predict requests from many threads into batched calls.
+
+    `predict_fn(records)` receives a flat list of input dicts and must return
+    one raw score per record.
+    """
+
+    def __init__(self, predict_fn, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.predict_fn = predict_fn
+        self.window     = window_ms / 1000.0
+        self.max_batch  = max_batch
+
+        self._queue       = queue.Queue()
+        self._lock        = threading.Lock()
+        self._queued_rows = 0
+        self._batches     = 0
+        self._rows        = 0
+        self._errors      = 0
+        # Batch-size histogram over power-of-two buckets: ≤1, ≤2, ≤4, … ≤max_batch
+        self._bucket_edges = [2 ** k for k in range(int(np.ceil(np.log2(max(max_batch, 1)))) + 1)]
+        self._batch_hist   = [0] * (len(self._bucket_edges) + 1)
+        self._waits        = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name='inference-scheduler', daemon=True)
+        self._worker.start()
+
+    # ---- Client API ----
+    def submit(self, records):
+        """Queue a list of input dicts; returns a Future resolving to their raw scores."""
+        if self._closed:
+            raise RuntimeError("InferenceScheduler is closed")
+        future = Future()
+        with self._lock:
+            self._queued_rows += len(records)
+        self._queue.put((records, future, time.perf_counter()))
+        return future
+
+    def predict(self, records, timeout=None):
+        return self.submit(records).result(timeout)
+
+    def predict_one(self, record, timeout=None):
+        return float(self.predict([record], timeout)[0])
+
+    def close(self):
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+
+    # ---- Worker ----
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        pending  = [first]
+        n_rows   = len(first[0])
+        deadline = time.perf_counter() + self.window
+        while n_rows < self.max_batch:
+            try:
+                remaining = deadline - time.perf_counter()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            pending.append(item)
+            n_rows += len(item[0])
+        return pending, n_rows
+
+    def _run(self):
+        while True:
+            collected = self._collect()
+            if collected is None:
+                return
+            pending, n_rows = collected
+            started = time.perf_counter()
+            with self._lock:
+                self._queued_rows -= n_rows
+                self._waits.extend(started - enqueued for _, _, enqueued in pending)
+
+            records = [record for recs, _, _ in pending for record in recs]
+            try:
+                raw = np.asarray(self.predict_fn(records), dtype=float)
+            except Exception as e:
+                if len(pending) == 1:
+                    with self._lock:
+                        self._errors += 1
+                    pending[0][1].set_exception(e)
+                else:
+                    self._run_isolated(pending)
+                continue
+
+            with self._lock:
+                self._batches += 1
+                self._rows    += n_rows
+                self._batch_hist[int(np.searchsorted(self._bucket_edges, n_rows))] += 1
+            offset = 0
+            for recs, future, _ in pending:
+                future.set_result(raw[offset:offset + len(recs)])
+                offset += len(recs)
+
+    def _run_isolated(self, pending):
+        # A coalesced batch failed: re-score each request on its own so one bad
+        # record only fails its own caller, not everyone who shared the window
+        for recs, future, _ in pending:
+            try:
+                raw = np.asarray(self.predict_fn(recs), dtype=float)
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                future.set_exception(e)
+                continue
+            with self._lock:
+                self._batches += 1
+                self._rows    += len(recs)
+                self._batch_hist[int(np.searchsorted(self._bucket_edges, len(recs)))] += 1
+            future.set_result(raw)
+
+    # ---- Metrics ----
+    def metrics(self):
+        """Snapshot of queue depth, batch-size histogram and queue-wait percentiles (ms)."""
+        with self._lock:
+            waits  = np.array(self._waits) * 1000
+            labels = [f"le_{edge}" for edge in self._bucket_edges] + ['le_inf']
+            return {
+                'queue_depth_requests': self._queue.qsize(),
+                'queue_depth_rows':     self._queued_rows,
+                'batches':              self._batches,
+                'rows':                 self._rows,
+                'errors':               self._errors,
+                'mean_batch_size':      self._rows / self._batches if self._batches else 0.0,
+                'batch_size_histogram': dict(zip(labels, self._batch_hist)),
+                'wait_ms_p50':          float(np.percentile(waits, 50)) if waits.size else 0.0,
+                'wait_ms_p99':          float(np.percentile(waits, 99)) if waits.size else 0.0,
+                'wait_ms_max':          float(waits.max()) if waits.size else 0.0,
+                'window_ms':            self.window * 1000,
+                'max_batch':            self.max_batch,
+            }
@@ -0,0 +1,154 @@
+"""
+EduMetrics AI — Cohort Scoring
+Shared schema, vectorized clamp/tiering and chunked batch scoring used by the
+Streamlit dashboard and by headless jobs.
+"""
+import numpy as np
+import pandas as pd
+
+
+# ==========================================
+# 1. Feature Schema (mirrors notebook.ipynb)
+# ==========================================
+MODEL_PATH = 'ultimate_student_huber_pipeline.pkl'
+
+NUMERIC_FEATURES = ['Hours_Studied', 'Attendance', 'Sleep_Hours',
+                    'Previous_Scores', 'Tutoring_Sessions', 'Physical_Activity']
+
+ORDINAL_FEATURES = ['Parental_Involvement', 'Access_to_Resources', 'Motivation_Level',
+                    'Family_Income', 'Teacher_Quality', 'Parental_Education_Level',
+                    'Distance_from_Home', 'Peer_Influence']
+
+ORDINAL_CATEGORIES = [
+    ['Low', 'Medium', 'High'],                   # Parental_Involvement
+    ['Low', 'Medium', 'High'],                   # Access_to_Resources
+    ['Low', 'Medium', 'High'],                   # Motivation_Level
+    ['Low', 'Medium', 'High'],                   # Family_Income
+    ['Low', 'Medium', 'High'],                   # Teacher_Quality
+    ['High School', 'College', 'Postgraduate'],  # Parental_Education_Level
+    ['Near', 'Moderate', 'Far'],                 # Distance_from_Home
+    ['Negative', 'Neutral', 'Positive'],         # Peer_Influence
+]
+
+NOMINAL_FEATURES = ['Extracurricular_Activities', 'Internet_Access',
+                    'School_Type', 'Learning_Disabilities', 'Gender']
+
+# OneHotEncoder sorts levels; drop='first' removes the first of each
+NOMINAL_CATEGORIES = [
+    ['No', 'Yes'],          # Extracurricular_Activities
+    ['No', 'Yes'],          # Internet_Access
+    ['Private', 'Public'],  # School_Type
+    ['No', 'Yes'],          # Learning_Disabilities
+    ['Female', 'Male'],     # Gender
+]
+
+CATEGORY_LEVELS = dict(zip(ORDINAL_FEATURES + NOMINAL_FEATURES, ORDINAL_CATEGORIES + NOMINAL_CATEGORIES))
+
+# Bounds of the sidebar sliders in app.py (inclusive, integer steps)
+NUMERIC_RANGES = {
+    'Hours_Studied':     (0, 40),
+    'Attendance':        (0, 100),
+    'Sleep_Hours':       (4, 12),
+    'Previous_Scores':   (0, 100),
+    'Tutoring_Sessions': (0, 10),
+    'Physical_Activity': (0, 20),
+}
+
+# Column order of StudentPerformanceFactors.csv (and of `input_data` in app.py)
+FEATURE_COLUMNS = [
+    'Hours_Studied', 'Attendance', 'Parental_Involvement', 'Access_to_Resources',
+    'Extracurricular_Activities', 'Sleep_Hours', 'Previous_Scores', 'Motivation_Level',
+    'Internet_Access', 'Tutoring_Sessions', 'Family_Income', 'Teacher_Quality',
+    'School_Type', 'Peer_Influence', 'Physical_Activity', 'Learning_Disabilities',
+    'Parental_Education_Level', 'Distance_from_Home', 'Gender',
+]
+TARGET_COLUMN = 'Exam_Score'
+
+
+# ==========================================
+# 2. Clamping & Grade Tiers
+# ==========================================
+PASS_THRESHOLD        = 60
+DISTINCTION_THRESHOLD = 80
+TIER_LABELS = np.array(["AT RISK", "PASS", "DISTINCTION"], dtype=object)
+
+RAW_SCORE_COLUMN = 'Predicted_Score_Raw'
+SCORE_COLUMN     = 'Predicted_Score'
+TIER_COLUMN      = 'Grade_Tier'
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def clamp_scores(raw_scores):
+    """Clamp raw regression output onto the 0–100 exam scale."""
+    return np.clip(np.asarray(raw_scores, dtype=float), 0.0, 100.0)
+
+
+def assign_tiers(scores):
+    """Map clamped scores to DISTINCTION / PASS / AT RISK labels."""
+    scores = np.asarray(scores, dtype=float)
+    tier_idx = (scores >= PASS_THRESHOLD).astype(np.int8) + (scores >= DISTINCTION_THRESHOLD)
+    return TIER_LABELS[tier_idx]
+
+
+# ==========================================
+# 3. Batch Scoring
+# ==========================================
+def validate_columns(df):
+    """Raise ValueError if any of the 19 model inputs is missing from `df`."""
+    missing = [col for col in FEATURE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Roster is missing required columns: {', '.join(missing)}")
+    return df
+
+
+def iter_scored_chunks(pipeline, df, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield `df` in row chunks with raw score, clamped score and tier appended.
+
+    Extra columns (student IDs, the true Exam_Score, ...) are passed through
+    untouched so results can be joined back to the roster.
+    """
+    validate_columns(df)
+    for start in range(0, len(df), chunk_size):
+        chunk  = df.iloc[start:start + chunk_size]
+        raw    = np.asarray(pipeline.predict(chunk[FEATURE_COLUMNS]), dtype=float)
+        scores = clamp_scores(raw)
+
+        out = chunk.copy()
+        out[RAW_SCORE_COLUMN] = raw
+        out[SCORE_COLUMN]     = scores
+        out[TIER_COLUMN]      = assign_tiers(scores)
+        yield out
+
+
+def score_frame(pipeline, df, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score a whole roster and return it as one DataFrame."""
+    chunks = list(iter_scored_chunks(pipeline, df, chunk_size))
+    if not chunks:
+        out = df.copy()
+        out[RAW_SCORE_COLUMN] = pd.Series(dtype=float)
+        out[SCORE_COLUMN]     = pd.Series(dtype=float)
+        out[TIER_COLUMN]      = pd.Series(dtype=object)
+        return out
+    return pd.concat(chunks, ignore_index=False)
+
+
+def write_scored_csv(pipeline, df, out, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Stream scored chunks to a writable text buffer as CSV.
+
+    `progress`, if given, is called as progress(rows_done, rows_total) after
+    each chunk. Returns (per-tier row counts, raw scores) for the whole
+    roster, so callers can reuse the predictions without scoring again.
+    """
+    tier_counts = dict.fromkeys(TIER_LABELS, 0)
+    raw_scores  = []
+    rows_done   = 0
+    for i, chunk in enumerate(iter_scored_chunks(pipeline, df, chunk_size)):
+        chunk.to_csv(out, index=False, header=(i == 0))
+        for tier, count in chunk[TIER_COLUMN].value_counts().items():
+            tier_counts[tier] += int(count)
+        raw_scores.append(chunk[RAW_SCORE_COLUMN].to_numpy())
+        rows_done += len(chunk)
+        if progress is not None:
+            progress(rows_done, len(df))
+    return tier_counts, (np.concatenate(raw_scores) if raw_scores else np.empty(0))
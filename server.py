@@ -0,0 +1,250 @@
+"""
+EduMetrics AI — Headless Scoring Service
+A dependency-free asyncio HTTP/1.1 server for machine clients (SIS integration).
+Serves the newest published model version through the ModelRegistry, which
+hot-swaps in new versions without a restart, and merges concurrent requests
+into one vectorized predict call per batch. Does not import Streamlit.
+
+    python server.py --port 8000 --window-ms 2 --max-batch 1024
+
+Endpoints
+    GET  /health          → {"status": "ok", "version": ..., "scheduler": {...metrics}, ...}
+    GET  /metrics         → Prometheus text: span histograms + scheduler/cache gauges
+    GET  /drift           → {"version": ..., "rows": n, "features": [{feature, psi, ks, status, ...}]}
+    GET  /drift/sketch    → this replica's raw drift sketch; merge dumps with `python drift.py report`
+    POST /predict         → one student object (the 19 `input_data` fields)
+    POST /predict/batch   → {"students": [ {...}, ... ]} or a bare JSON list
+
+With --audit-log PATH, every scored student is appended to the auditlog.py
+binary log under source "api", from the arrays each batch was scored with.
+
+Payloads pass through validation.py first. Null or blank fields are imputed
+and mis-cased levels fixed, both reported under "warnings". A student with an
+absent field or a non-numeric, out-of-range or unknown value is not scored: /predict answers
+400, and /predict/batch returns {"errors": [...]} in that student's slot
+while still scoring the rest.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from artifact import MODELS_DIR
+from auditlog import AuditLog
+from registry import ModelRegistry, DEFAULT_POLL_S
+from scheduler import DEFAULT_WINDOW_MS, DEFAULT_MAX_BATCH
+from scoring import clamp_scores, assign_tiers
+from telemetry import TELEMETRY, span
+from validation import ERROR, validate_records
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class RequestError(Exception):
+    """Client-side problem with a request; rendered as a JSON error response."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ==========================================
+# 1. Scoring
+# ==========================================
+def check_records(records):
+    if not isinstance(records, list) or not records:
+        raise RequestError(400, "Expected a non-empty list of student objects")
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise RequestError(400, f"Student #{i} is not a JSON object")
+    return records
+
+
+def _problem_text(problems):
+    return [f"{p['column']}: {p['problem']}" for p in problems]
+
+
+def format_predictions(raw, problems=None):
+    scores = clamp_scores(raw)
+    tiers  = assign_tiers(scores)
+    out = [{'raw_score': float(r), 'score': float(s), 'tier': t} for r, s, t in zip(raw, scores, tiers)]
+    for prediction, row_problems in zip(out, problems or ()):
+        if row_problems:
+            prediction['warnings'] = _problem_text(row_problems)
+    return out
+
+
+# ==========================================
+# 2. HTTP Layer
+# ==========================================
+class ScoringServer:
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.started  = time.time()
+
+    async def predict(self, records):
+        # The handle is taken once, so a hot swap mid-request still answers from one version
+        handle = self.registry.current()
+        return await asyncio.wrap_future(handle.submit(records))
+
+    async def predict_validated(self, records):
+        """One result per student: a prediction, or {'errors': [...]} if its inputs are unusable."""
+        with span('validate'):
+            clean, valid, problems = validate_records(check_records(records))
+        rows    = [problems.get(i, ()) for i in range(len(records))]
+        results = [None] * len(records)
+        keep    = [i for i in range(len(records)) if valid[i]]
+        if keep:
+            raw = await self.predict([clean[i] for i in keep])
+            for i, prediction in zip(keep, format_predictions(raw, [rows[i] for i in keep])):
+                results[i] = prediction
+        for i in range(len(records)):
+            if results[i] is None:
+                results[i] = {'errors': _problem_text(p for p in rows[i] if p['severity'] == ERROR),
+                              'warnings': _problem_text(p for p in rows[i] if p['severity'] != ERROR)}
+        return results
+
+    def metrics_text(self):
+        status = self.registry.status()
+        gauges = {f"scheduler_{k}": v for k, v in status['scheduler'].items()}
+        gauges.update({f"cache_{k}": v for k, v in status['cache'].items()})
+        gauges['drift_rows']     = status['drift_rows']
+        gauges['uptime_seconds'] = time.time() - self.started
+        return TELEMETRY.prometheus_text(gauges=gauges)
+
+    async def handle_request(self, method, path, body):
+        if path == '/metrics':
+            if method != 'GET':
+                raise RequestError(405, "Use GET")
+            return self.metrics_text()
+        if path == '/health':
+            if method != 'GET':
+                raise RequestError(405, "Use GET")
+            return {'status': 'ok', 'uptime_s': round(time.time() - self.started, 1),
+                    **self.registry.status()}
+        if path in ('/drift', '/drift/sketch'):
+            if method != 'GET':
+                raise RequestError(405, "Use GET")
+            handle = self.registry.current()
+            if path == '/drift/sketch':
+                return handle.drift.to_dict()
+            # The first report per version may build the reference from the CSV, so keep it off the loop
+            report = await asyncio.to_thread(handle.drift_report)
+            return {'version': handle.version, 'rows': len(handle.drift),
+                    'features': json.loads(report.to_json(orient='records'))}
+
+        if path not in ('/predict', '/predict/batch'):
+            raise RequestError(404, f"No route for {path}")
+        if method != 'POST':
+            raise RequestError(405, "Use POST")
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            raise RequestError(400, "Body is not valid JSON")
+
+        if path == '/predict':
+            with span('http_predict'):
+                result = (await self.predict_validated([payload]))[0]
+                if 'errors' in result:
+                    raise RequestError(400, "Invalid student: " + "; ".join(result['errors']))
+                return result
+
+        if isinstance(payload, dict):
+            payload = payload.get('students')
+        with span('http_predict_batch'):
+            return {'predictions': await self.predict_validated(payload)}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = request_line.split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                try:
+                    try:
+                        length = int(headers.get('content-length') or 0)
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        # Without a usable length the body cannot be framed, so the connection ends here
+                        keep_alive = False
+                        raise RequestError(400, "Invalid Content-Length header")
+                    if length > MAX_BODY_BYTES:
+                        keep_alive = False
+                        raise RequestError(413, f"Body exceeds {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b''
+                    status, result = 200, await self.handle_request(method, target.split('?', 1)[0], body)
+                except RequestError as e:
+                    status, result = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, result = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                if isinstance(result, str):
+                    payload, content_type = result.encode(), 'text/plain; version=0.0.4'
+                else:
+                    payload, content_type = json.dumps(result).encode(), 'application/json'
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f"EduMetrics scoring service listening on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.registry.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EduMetrics headless scoring service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--poll-s', type=float, default=DEFAULT_POLL_S, help="seconds between checks for new versions")
+    parser.add_argument('--window-ms', type=float, default=DEFAULT_WINDOW_MS, help="micro-batch collection window")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="rows that close a batch early")
+    parser.add_argument('--audit-log', default=None, help="append every scored student to this audit log")
+    args = parser.parse_args(argv)
+
+    audit    = AuditLog(args.audit_log) if args.audit_log else None
+    registry = ModelRegistry(args.models_dir, poll_interval=args.poll_s, window_ms=args.window_ms,
+                             max_batch=args.max_batch, audit=audit).start()
+    server = ScoringServer(registry)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if audit is not None:
+            audit.close()
+
+
+if __name__ == '__main__':
+    main()
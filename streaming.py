@@ -0,0 +1,176 @@
+"""
+EduMetrics AI — Streaming Scorer
+Out-of-core scoring for rosters that do not fit in memory. The input (a CSV or
+a columnar store, see columnar.py) is read as a stream of fixed-size chunks;
+each chunk is encoded, scored by the compiled kernel and appended to the
+output CSV with its raw score, clamped score and grade tier, so peak memory
+depends on the chunk size only.
+
+After every chunk the output is fsynced and a checkpoint (rows done, output
+bytes, tier counts) is written next to it. An interrupted run picks up where
+it stopped: the output is truncated back to the last checkpoint and the rows
+already scored are skipped.
+
+    python streaming.py national_roster.csv scored.csv
+    python streaming.py students.edustore scored.csv --chunksize 200000
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar import ColumnStore
+from scoring import (FEATURE_COLUMNS, RAW_SCORE_COLUMN, SCORE_COLUMN, TIER_COLUMN, TIER_LABELS,
+                     assign_tiers, clamp_scores, validate_columns)
+
+DEFAULT_STREAM_CHUNK = 100_000
+CHECKPOINT_SUFFIX    = '.checkpoint.json'
+
+
+# ==========================================
+# 1. Chunk Sources
+# ==========================================
+def is_column_store(path):
+    return os.path.isfile(os.path.join(path, 'manifest.json'))
+
+
+def iter_csv_chunks(path, chunksize=DEFAULT_STREAM_CHUNK, skip_rows=0):
+    """Yield DataFrame chunks of a CSV, skipping the first `skip_rows` data rows."""
+    skip = (lambda i: 0 < i <= skip_rows) if skip_rows else None
+    yield from pd.read_csv(path, chunksize=chunksize, skiprows=skip)
+
+
+def iter_store_chunks(store, chunksize=DEFAULT_STREAM_CHUNK, skip_rows=0):
+    """Yield decoded DataFrame chunks of a ColumnStore, starting at row `skip_rows`."""
+    for start in range(skip_rows, len(store), chunksize):
+        yield store.to_frame(start=start, stop=min(start + chunksize, len(store)))
+
+
+def source_signature(path):
+    """Identity of an input recorded in checkpoints so a resume never mixes sources."""
+    if is_column_store(path):
+        return {'kind': 'columnar', 'path': os.path.abspath(path)}
+    stat = os.stat(path)
+    return {'kind': 'csv', 'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+# ==========================================
+# 2. Checkpoints
+# ==========================================
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def write_checkpoint(path, state):
+    """Atomically replace the checkpoint file (write temp, fsync, rename)."""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as fh:
+        json.dump(state, fh, indent=1)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+# ==========================================
+# 3. Streaming Scorer
+# ==========================================
+def score_stream(predictor, source, out_path, chunksize=DEFAULT_STREAM_CHUNK, resume=True,
+                 model_hash=None, progress=None):
+    """Score `source` (CSV path or columnar store path) into `out_path` chunk by chunk.
+
+    `progress`, if given, is called after each chunk with a dict of
+    rows_done, rows_total (None for CSV input), elapsed_s and rows_per_s.
+    Returns the final checkpoint state, including per-tier counts.
+    """
+    checkpoint_path = out_path + CHECKPOINT_SUFFIX
+    signature = source_signature(source)
+    state = read_checkpoint(checkpoint_path) if resume else None
+
+    if state is not None:
+        if state['source'] != signature or state['model_hash'] != model_hash:
+            raise ValueError(f"{checkpoint_path} belongs to a different input or model; "
+                             f"remove it or restart without resume")
+        if state['complete']:
+            return state
+    else:
+        state = {'source': signature, 'model_hash': model_hash, 'rows_done': 0, 'bytes_done': 0,
+                 'tier_counts': dict.fromkeys(TIER_LABELS, 0), 'complete': False}
+
+    if is_column_store(source):
+        store      = ColumnStore.open(source)
+        rows_total = len(store)
+        chunks     = iter_store_chunks(store, chunksize, skip_rows=state['rows_done'])
+    else:
+        rows_total = None
+        chunks     = iter_csv_chunks(source, chunksize, skip_rows=state['rows_done'])
+
+    started, rows_this_run = time.perf_counter(), 0
+    with open(out_path, 'r+b' if state['bytes_done'] else 'wb') as out:
+        out.truncate(state['bytes_done'])
+        out.seek(state['bytes_done'])
+
+        for chunk in chunks:
+            validate_columns(chunk)
+            raw    = predictor.predict_encoded(*predictor.encode(chunk[FEATURE_COLUMNS]))
+            scores = clamp_scores(raw)
+            tiers  = assign_tiers(scores)
+
+            chunk = chunk.copy()
+            chunk[RAW_SCORE_COLUMN] = raw
+            chunk[SCORE_COLUMN]     = scores
+            chunk[TIER_COLUMN]      = tiers
+            out.write(chunk.to_csv(index=False, header=(state['bytes_done'] == 0)).encode())
+            out.flush()
+            os.fsync(out.fileno())
+
+            labels, counts = np.unique(tiers, return_counts=True)
+            for tier, count in zip(labels, counts):
+                state['tier_counts'][tier] += int(count)
+            state['rows_done']  += len(chunk)
+            state['bytes_done']  = out.tell()
+            write_checkpoint(checkpoint_path, state)
+
+            rows_this_run += len(chunk)
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                progress({'rows_done': state['rows_done'], 'rows_total': rows_total, 'elapsed_s': elapsed,
+                          'rows_per_s': rows_this_run / elapsed if elapsed > 0 else 0.0})
+
+    state['complete'] = True
+    write_checkpoint(checkpoint_path, state)
+    return state
+
+
+def _print_progress(report):
+    total = f"/{report['rows_total']:,}" if report['rows_total'] is not None else ''
+    print(f"\r{report['rows_done']:,}{total} rows | {report['rows_per_s']:,.0f} rows/s | "
+          f"{report['elapsed_s']:.1f} s", end='', file=sys.stderr, flush=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from artifact import latest_version, load_version, model_fingerprint, version_paths
+
+    parser = argparse.ArgumentParser(description="Stream-score a roster CSV or columnar store")
+    parser.add_argument('source', help="roster CSV or .edustore directory")
+    parser.add_argument('output', help="scored CSV to write")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_STREAM_CHUNK)
+    parser.add_argument('--restart', action='store_true', help="ignore an existing checkpoint")
+    parser.add_argument('--version', default=None, help="model version directory (default: newest, as served)")
+    args = parser.parse_args()
+
+    version_dir  = args.version or latest_version()
+    predictor, _ = load_version(version_dir)
+    state = score_stream(predictor, args.source, args.output, args.chunksize,
+                         resume=not args.restart, model_hash=model_fingerprint(*version_paths(version_dir)),
+                         progress=_print_progress)
+    print(file=sys.stderr)
+    print(f"{args.output}: {state['rows_done']:,} rows | " +
+          " | ".join(f"{tier}: {count:,}" for tier, count in state['tier_counts'].items()))
@@ -0,0 +1,107 @@
+"""
+EduMetrics AI — Telemetry
+Lightweight timing spans for the hot paths (model load, input assembly,
+preprocessing, predict, advice, chart builds, HTTP routes). Each span name
+feeds a RollingHistogram, which keeps:
+- the last `window` durations, used for live percentiles in the dashboard's
+  performance panel
+- cumulative fixed-bucket counts, exported in Prometheus text format by the
+  scoring service's GET /metrics.
+
+    from telemetry import span
+    with span('predict'):
+        ...
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_WINDOW = 1024
+
+# Upper bounds (seconds) of the exported histogram buckets, 50 µs … 5 s
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+           0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RollingHistogram:
+    """Durations of one span: a rolling sample window plus cumulative bucket counters."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.buckets = [0] * (len(BUCKETS) + 1)   # last slot is +Inf
+        self.count   = 0
+        self.total   = 0.0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.buckets[int(np.searchsorted(BUCKETS, seconds))] += 1
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        """Count plus rolling-window mean / p50 / p95 / p99 / max, in milliseconds."""
+        window = np.array(self.samples) * 1000
+        if not window.size:
+            return {'count': self.count, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        p50, p95, p99 = np.percentile(window, [50, 95, 99])
+        return {'count': self.count, 'mean_ms': float(window.mean()), 'p50_ms': float(p50),
+                'p95_ms': float(p95), 'p99_ms': float(p99), 'max_ms': float(window.max())}
+
+
+class Telemetry:
+    """Thread-safe collection of named RollingHistograms."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._hists = {}
+        self._lock  = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._hists.get(name)
+            if hist is None:
+                hist = self._hists[name] = RollingHistogram(self.window)
+            hist.observe(seconds)
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block into histogram `name` (recorded even if it raises)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def snapshot(self):
+        with self._lock:
+            return {name: hist.summary() for name, hist in sorted(self._hists.items())}
+
+    def reset(self):
+        with self._lock:
+            self._hists.clear()
+
+    def prometheus_text(self, prefix='edumetrics', gauges=None):
+        """Prometheus text exposition (v0.0.4) of every span histogram, plus optional flat gauges."""
+        lines = [f"# HELP {prefix}_span_seconds Wall-clock duration of instrumented code paths.",
+                 f"# TYPE {prefix}_span_seconds histogram"]
+        with self._lock:
+            for name, hist in sorted(self._hists.items()):
+                cumulative = np.cumsum(hist.buckets)
+                for le, count in zip(BUCKETS, cumulative):
+                    lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="{le:g}"}} {count}')
+                lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="+Inf"}} {cumulative[-1]}')
+                lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {hist.total:.9f}')
+                lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {hist.count}')
+        for name, value in (gauges or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                lines.append(f"# TYPE {prefix}_{name} gauge")
+                lines.append(f"{prefix}_{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide default used by the app, the registry and the server
+TELEMETRY = Telemetry()
+span      = TELEMETRY.span
@@ -0,0 +1,403 @@
+"""
+EduMetrics AI — Training Harness
+Script form of the notebook's model search. Instead of GridSearchCV re-running
+the whole ColumnTransformer for every candidate on every fold, the
+preprocessor is fitted once per fold and the transformed fold matrices are
+cached and shared by all candidates.
+
+- Huber: for each epsilon, one warm-started regressor per fold walks the
+  alpha grid from strongest to weakest penalty, so each fit starts from the
+  previous solution.
+- XGBoost: successive halving on boosting rounds. Every configuration gets a
+  small number of rounds, and only the best 1/factor advance to a larger
+  budget.
+
+Wall-clock fit time is recorded for every candidate.
+
+`fit` rebuilds the production model from the CSV: it picks the Huber
+hyperparameters by the search above, fits on the training split, evaluates
+on the held-out split, and publishes a versioned directory under models/
+(see artifact.py) that the dashboard loads.
+
+    python training.py huber
+    python training.py xgb --jobs 8
+    python training.py fit
+"""
+import json
+import os
+import platform
+import time
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from scoring import (NOMINAL_FEATURES, NUMERIC_FEATURES, ORDINAL_CATEGORIES, ORDINAL_FEATURES,
+                     TARGET_COLUMN)
+
+DATA_PATH    = 'StudentPerformanceFactors.csv'
+RANDOM_STATE = 42
+TEST_SIZE    = 0.2
+CV_FOLDS     = 5
+
+# Grids from notebook.ipynb
+HUBER_EPSILONS = [1.1, 1.2, 1.35, 1.5, 1.75, 2.0]
+HUBER_ALPHAS   = [0.0001, 0.001, 0.01, 0.1, 1.0]
+HUBER_MAX_ITER = 2000
+
+XGB_GRID = {
+    'max_depth':        [3, 5],
+    'learning_rate':    [0.01, 0.05, 0.1],
+    'subsample':        [0.8, 1.0],
+    'colsample_bytree': [0.8, 1.0],
+    'reg_alpha':        [0, 0.1, 1.0],
+    'reg_lambda':       [1.0, 5.0, 10.0],
+}
+# n_estimators is the halving resource rather than a grid axis
+XGB_MIN_ROUNDS = 25
+XGB_MAX_ROUNDS = 300
+HALVING_FACTOR = 3
+
+
+# ==========================================
+# 1. Data & Pipeline
+# ==========================================
+def load_training_data(path=DATA_PATH):
+    """(X, y) from the CSV, dropping the out-of-range Exam_Score > 100 rows as the notebook does."""
+    df = pd.read_csv(path)
+    df = df[df[TARGET_COLUMN] <= 100]
+    return df.drop(columns=[TARGET_COLUMN]), df[TARGET_COLUMN]
+
+
+def train_test_split_data(X, y):
+    from sklearn.model_selection import train_test_split
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+
+
+def build_preprocessor():
+    """The notebook's ColumnTransformer: median/scale, ordinal encode, one-hot (drop first)."""
+    from sklearn.compose import ColumnTransformer
+    from sklearn.impute import SimpleImputer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+
+    numeric_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='median')),
+        ('scaler', StandardScaler()),
+    ])
+    ordinal_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('encoder', OrdinalEncoder(categories=ORDINAL_CATEGORIES, handle_unknown='use_encoded_value',
+                                   unknown_value=-1)),
+    ])
+    nominal_transformer = Pipeline(steps=[
+        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('encoder', OneHotEncoder(drop='first', handle_unknown='ignore')),
+    ])
+    return ColumnTransformer(transformers=[
+        ('num', numeric_transformer, NUMERIC_FEATURES),
+        ('ord', ordinal_transformer, ORDINAL_FEATURES),
+        ('nom', nominal_transformer, NOMINAL_FEATURES),
+    ])
+
+
+def build_pipeline(epsilon=2.0, alpha=1.0):
+    """Full preprocessing + HuberRegressor pipeline, shaped like the shipped pickle."""
+    from sklearn.linear_model import HuberRegressor
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline(steps=[
+        ('preprocessor', build_preprocessor()),
+        ('regressor', HuberRegressor(epsilon=epsilon, alpha=alpha, max_iter=HUBER_MAX_ITER)),
+    ])
+
+
+# ==========================================
+# 2. Fold Cache
+# ==========================================
+class FoldCache:
+    """K-fold splits with the preprocessor fitted once per training fold.
+
+    Uses unshuffled KFold, which is what GridSearchCV(cv=5) does for a
+    regressor, so scores line up with the notebook's.
+    """
+
+    def __init__(self, X, y, n_splits=CV_FOLDS):
+        from sklearn.model_selection import KFold
+
+        self.X, self.y = X, np.asarray(y, dtype=float)
+        self.splits    = list(KFold(n_splits=n_splits).split(X))
+        self._folds    = {}
+        self.preprocess_seconds = 0.0
+
+    def __len__(self):
+        return len(self.splits)
+
+    def fold(self, k):
+        """(X_train, y_train, X_val, y_val) as transformed float arrays."""
+        if k not in self._folds:
+            t0 = time.perf_counter()
+            train_idx, val_idx = self.splits[k]
+            preprocessor = build_preprocessor()
+            X_train = np.asarray(preprocessor.fit_transform(self.X.iloc[train_idx]), dtype=float)
+            X_val   = np.asarray(preprocessor.transform(self.X.iloc[val_idx]), dtype=float)
+            self._folds[k] = (X_train, self.y[train_idx], X_val, self.y[val_idx])
+            self.preprocess_seconds += time.perf_counter() - t0
+        return self._folds[k]
+
+    def folds(self):
+        return [self.fold(k) for k in range(len(self))]
+
+
+def _mae(y_true, y_pred):
+    return float(np.mean(np.abs(y_true - y_pred)))
+
+
+def _summarize(model, params, fold_maes, fold_seconds, **extra):
+    return {'model': model, 'params': params, 'mae': float(np.mean(fold_maes)),
+            'mae_std': float(np.std(fold_maes)), 'fit_seconds': float(np.sum(fold_seconds)), **extra}
+
+
+# ==========================================
+# 3. Huber Search (warm-started alpha path)
+# ==========================================
+def _huber_path(fold, epsilon, alphas):
+    """Fit one fold along `alphas` (strongest first); returns [(mae, seconds)] per alpha."""
+    from sklearn.linear_model import HuberRegressor
+
+    X_train, y_train, X_val, y_val = fold
+    model = HuberRegressor(epsilon=epsilon, max_iter=HUBER_MAX_ITER, warm_start=True)
+    path  = []
+    for alpha in alphas:
+        t0 = time.perf_counter()
+        model.set_params(alpha=alpha).fit(X_train, y_train)
+        path.append((_mae(y_val, model.predict(X_val)), time.perf_counter() - t0))
+    return path
+
+
+def huber_search(cache, epsilons=HUBER_EPSILONS, alphas=HUBER_ALPHAS, n_jobs=1):
+    """Cross-validated MAE for every (epsilon, alpha); returns result dicts sorted by MAE."""
+    from joblib import Parallel, delayed
+
+    alphas = sorted(alphas, reverse=True)
+    folds  = cache.folds()
+    tasks  = list(product(epsilons, range(len(folds))))
+    paths  = Parallel(n_jobs=n_jobs)(delayed(_huber_path)(folds[k], eps, alphas) for eps, k in tasks)
+
+    by_epsilon = {}
+    for (eps, _), path in zip(tasks, paths):
+        by_epsilon.setdefault(eps, []).append(path)
+
+    results = []
+    for eps, fold_paths in by_epsilon.items():
+        for i, alpha in enumerate(alphas):
+            maes, seconds = zip(*(path[i] for path in fold_paths))
+            results.append(_summarize('huber', {'epsilon': eps, 'alpha': alpha}, maes, seconds))
+    return sorted(results, key=lambda r: r['mae'])
+
+
+# ==========================================
+# 4. Successive Halving (XGBoost)
+# ==========================================
+def _fit_candidate(make_estimator, params, resource, folds):
+    maes, seconds = [], []
+    for X_train, y_train, X_val, y_val in folds:
+        t0 = time.perf_counter()
+        model = make_estimator(params, resource).fit(X_train, y_train)
+        seconds.append(time.perf_counter() - t0)
+        maes.append(_mae(y_val, model.predict(X_val)))
+    return maes, seconds
+
+
+def successive_halving(cache, candidates, make_estimator, min_resource, max_resource,
+                       factor=HALVING_FACTOR, n_jobs=1, model='candidate', log=None):
+    """Successive halving over `candidates` (param dicts) on the cached folds.
+
+    `make_estimator(params, resource)` returns an unfitted estimator. Each
+    rung keeps the best 1/factor of candidates and multiplies the resource by
+    `factor`, capped at `max_resource`; a lone survivor goes straight to the
+    cap. Returns the final-rung results
+    sorted by MAE; every result carries its cumulative fit time.
+    """
+    from joblib import Parallel, delayed
+
+    folds     = cache.folds()
+    survivors = [{'params': p, 'fit_seconds': 0.0} for p in candidates]
+    resource  = min_resource
+    while True:
+        scored = Parallel(n_jobs=n_jobs)(delayed(_fit_candidate)(make_estimator, s['params'], resource, folds)
+                                         for s in survivors)
+        survivors = [_summarize(model, s['params'], maes, seconds, resource=resource)
+                     | {'fit_seconds': s['fit_seconds'] + float(np.sum(seconds))}
+                     for s, (maes, seconds) in zip(survivors, scored)]
+        survivors.sort(key=lambda r: r['mae'])
+        if log is not None:
+            log(f"rung resource={resource}: {len(survivors)} candidates, best MAE {survivors[0]['mae']:.4f}")
+        if resource >= max_resource:
+            return survivors
+        survivors = survivors[:max(1, len(survivors) // factor)]
+        resource  = max_resource if len(survivors) == 1 else min(resource * factor, max_resource)
+
+
+def xgb_search(cache, grid=XGB_GRID, min_rounds=XGB_MIN_ROUNDS, max_rounds=XGB_MAX_ROUNDS,
+               factor=HALVING_FACTOR, n_jobs=1, log=None):
+    """Successive halving over the notebook's XGBoost grid, with boosting rounds as the resource."""
+    import xgboost as xgb
+
+    def make_estimator(params, rounds):
+        return xgb.XGBRegressor(objective='reg:squarederror', random_state=RANDOM_STATE, n_jobs=1,
+                                n_estimators=rounds, **params)
+
+    candidates = [dict(zip(grid, values)) for values in product(*grid.values())]
+    return successive_halving(cache, candidates, make_estimator, min_rounds, max_rounds, factor,
+                              n_jobs=n_jobs, model='xgboost', log=log)
+
+
+# ==========================================
+# 5. Versioned Fit
+# ==========================================
+def _file_entry(path):
+    from cache import file_sha256
+    return {'bytes': os.path.getsize(path), 'sha256': file_sha256(path)}
+
+
+def regression_metrics(y_true, y_pred):
+    """Held-out metrics recorded in a version manifest."""
+    y_true   = np.asarray(y_true, dtype=float)
+    residual = y_true - np.asarray(y_pred, dtype=float)
+    return {
+        'rows': len(y_true),
+        'r2':   float(1 - np.sum(residual ** 2) / np.sum((y_true - y_true.mean()) ** 2)),
+        'mae':  float(np.mean(np.abs(residual))),
+        'rmse': float(np.sqrt(np.mean(residual ** 2))),
+        'mape': float(np.mean(np.abs(residual) / np.abs(y_true))),
+    }
+
+
+def fit_model_version(csv_path=DATA_PATH, models_dir=None, epsilon=None, alpha=None, n_jobs=1, version=None):
+    """Train, evaluate and publish a model version; returns (version_dir, manifest).
+
+    Hyperparameters default to the best of `huber_search`; a given `epsilon`
+    or `alpha` is held fixed and only the other is searched. The pipeline is
+    fitted on the training split (as the notebook's shipped model was) and
+    metrics come from cross-validation on that split plus the held-out test
+    split.
+    """
+    import joblib
+    import sklearn
+
+    from artifact import (MANIFEST_FORMAT, MANIFEST_VERSION, MODELS_DIR, save_slim, version_paths,
+                          write_manifest)
+    from cache import file_sha256
+    from kernel import compile_pipeline
+    from scoring import FEATURE_COLUMNS
+
+    X, y = load_training_data(csv_path)
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y)
+    cache = FoldCache(X_train, y_train)
+
+    t0 = time.perf_counter()
+    epsilons = HUBER_EPSILONS if epsilon is None else [epsilon]
+    alphas   = HUBER_ALPHAS if alpha is None else [alpha]
+    cv = huber_search(cache, epsilons, alphas, n_jobs=n_jobs)[0]
+    search_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pipeline = build_pipeline(**cv['params']).fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - t0
+
+    test_metrics = regression_metrics(y_test, pipeline.predict(X_test))
+
+    version     = version or time.strftime('%Y%m%d-%H%M%S', time.gmtime())
+    version_dir = os.path.join(models_dir or MODELS_DIR, version)
+    os.makedirs(version_dir)
+    model_path, slim_path = version_paths(version_dir)
+    joblib.dump(pipeline, model_path)
+    save_slim(compile_pipeline(pipeline, check_df=X[FEATURE_COLUMNS]), slim_path,
+              source_sha256=file_sha256(model_path))
+
+    manifest = {
+        'format':          MANIFEST_FORMAT,
+        'format_version':  MANIFEST_VERSION,
+        'version':         version,
+        'created_utc':     time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'model':           'HuberRegressor',
+        'params':          cv['params'],
+        'data': {
+            'path':         os.path.basename(csv_path),
+            'sha256':       file_sha256(csv_path),
+            'rows':         len(X),
+            'train_rows':   len(X_train),
+            'test_rows':    len(X_test),
+            'random_state': RANDOM_STATE,
+        },
+        'python_version':  platform.python_version(),
+        'sklearn_version': sklearn.__version__,
+        'numpy_version':   np.__version__,
+        'cv':              {'folds': len(cache), 'mae': cv['mae'], 'mae_std': cv['mae_std']},
+        'test':            test_metrics,
+        'search_seconds':  search_seconds,
+        'fit_seconds':     fit_seconds,
+        'artifacts':       {os.path.basename(path): _file_entry(path) for path in (model_path, slim_path)},
+    }
+    write_manifest(version_dir, manifest)
+    return version_dir, manifest
+
+
+# ==========================================
+# 6. Reporting & CLI
+# ==========================================
+def format_results(results, top=10):
+    lines = [f"{'MAE':>8s} {'± std':>7s} {'fit s':>7s}  params"]
+    for r in results[:top]:
+        params = ', '.join(f"{k}={v}" for k, v in r['params'].items())
+        lines.append(f"{r['mae']:8.4f} {r['mae_std']:7.4f} {r['fit_seconds']:7.3f}  {params}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="EduMetrics AI model search")
+    parser.add_argument('--csv', default=DATA_PATH)
+    parser.add_argument('--folds', type=int, default=CV_FOLDS)
+    parser.add_argument('--jobs', type=int, default=-1, help="parallel workers (joblib n_jobs)")
+    parser.add_argument('--top', type=int, default=10)
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('huber', help="Huber epsilon × alpha search with warm-started alpha paths")
+    xgb_parser = sub.add_parser('xgb', help="XGBoost search with successive halving on boosting rounds")
+    xgb_parser.add_argument('--factor', type=int, default=HALVING_FACTOR)
+    xgb_parser.add_argument('--min-rounds', type=int, default=XGB_MIN_ROUNDS)
+    fit_parser = sub.add_parser('fit', help="train the production model and publish models/<version>/")
+    fit_parser.add_argument('--models-dir', default=None)
+    fit_parser.add_argument('--epsilon', type=float, default=None, help="fix epsilon instead of searching it")
+    fit_parser.add_argument('--alpha', type=float, default=None, help="fix alpha instead of searching it")
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        version_dir, manifest = fit_model_version(args.csv, args.models_dir, args.epsilon, args.alpha,
+                                                  n_jobs=args.jobs)
+        print(f"Published {version_dir}")
+        print(json.dumps({k: manifest[k] for k in ('params', 'cv', 'test', 'fit_seconds')}, indent=1))
+        return manifest
+
+    X, y = load_training_data(args.csv)
+    X_train, X_test, y_train, y_test = train_test_split_data(X, y)
+    cache = FoldCache(X_train, y_train, n_splits=args.folds)
+    cache.folds()
+
+    t0 = time.perf_counter()
+    if args.command == 'huber':
+        results = huber_search(cache, n_jobs=args.jobs)
+    else:
+        results = xgb_search(cache, min_rounds=args.min_rounds, factor=args.factor, n_jobs=args.jobs, log=print)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{args.command}: {len(results)} final candidates | search {elapsed:.1f} s | "
+          f"preprocessing {cache.preprocess_seconds:.2f} s for {len(cache)} folds")
+    print(format_results(results, args.top))
+    return results
+
+
+if __name__ == '__main__':
+    main()
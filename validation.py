@@ -0,0 +1,328 @@
+"""
+EduMetrics AI — Input Validation
+Columnar checks of batch rosters and API payloads against the 19-feature
+schema, run before anything is scored:
+- numerics: values that do not parse as numbers, and values outside the
+  physical bounds in INPUT_BOUNDS, are errors. These bounds are wider than the
+  app's sliders: the CSV itself has students studying 44 h/week.
+- categoricals: levels are matched after stripping whitespace and
+  case-folding, so ' high' becomes 'High'. Values that still match no level
+  are errors, and the corrected ones are reported as warnings.
+- blank values (empty, null) are warnings, because the pipeline imputes them (median /
+  most common level), as it does for the notebook's missing Teacher_Quality,
+  Parental_Education_Level and Distance_from_Home values.
+- Exam_Score, when present, must lie in 0–100. The CSV has a 101, which the
+  notebook strips. Bad scores are blanked with a warning; they do not block
+  scoring.
+
+Every check is a vectorized mask. Categoricals go through pd.factorize, so the
+string work is done once per distinct value, not once per row. Rows with no
+errors are still scored; the report lists every problem cell.
+
+    result = validate_frame(roster_df)
+    scored = score_frame(predictor, result.valid_frame)
+    result.errors          # row, column, value, severity, problem
+"""
+import numpy as np
+import pandas as pd
+
+from scoring import CATEGORY_LEVELS, FEATURE_COLUMNS, NUMERIC_FEATURES, TARGET_COLUMN, validate_columns
+
+# Hard limits of each numeric input, by its definition in the dataset
+INPUT_BOUNDS = {
+    'Hours_Studied':     (0, 168),   # hours per week
+    'Attendance':        (0, 100),   # percent of classes
+    'Sleep_Hours':       (0, 24),    # hours per night
+    'Previous_Scores':   (0, 100),   # exam score
+    'Tutoring_Sessions': (0, 31),    # sessions per month
+    'Physical_Activity': (0, 168),   # hours per week
+}
+TARGET_BOUNDS = (0, 100)
+
+ERROR   = 'error'
+WARNING = 'warning'
+REPORT_COLUMNS = ['row', 'column', 'value', 'severity', 'problem']
+
+
+class ValidationResult:
+    """Coerced copy of the input, the per-cell problem report and the mask of scorable rows."""
+
+    def __init__(self, frame, errors, valid):
+        self.frame  = frame
+        self.errors = errors
+        self.valid  = valid
+
+    @property
+    def valid_frame(self):
+        return self.frame if self.valid.all() else self.frame[self.valid]
+
+    @property
+    def n_invalid(self):
+        return int((~self.valid).sum())
+
+    def summary(self):
+        """Row counts plus problem counts per (column, severity)."""
+        counts = self.errors.groupby(['column', 'severity'], sort=False).size()
+        return {'rows': len(self.frame), 'valid': int(self.valid.sum()), 'invalid': self.n_invalid,
+                'errors': int((self.errors['severity'] == ERROR).sum()),
+                'warnings': int((self.errors['severity'] == WARNING).sum()),
+                'by_column': {f"{column} ({severity})": int(n) for (column, severity), n in counts.items()}}
+
+    def row_problems(self):
+        """{row label: [{'column', 'severity', 'problem'}, ...]} for rows with any problem."""
+        problems = {}
+        for row, column, _, severity, problem in self.errors.itertuples(index=False):
+            problems.setdefault(row, []).append({'column': column, 'severity': severity, 'problem': problem})
+        return problems
+
+
+# ==========================================
+# 1. Value Rules
+# ==========================================
+# Applied once per distinct value by the column checks, and once per cell by validate_record
+NOT_A_NUMBER = 'not a number'
+MISSING      = 'missing (imputed)'
+NORMALIZED   = 'normalized case/whitespace'
+ABSENT       = 'field absent (send null to impute)'
+
+
+def _outside(bounds):
+    return f"outside {bounds[0]}–{bounds[1]}"
+
+
+def _unknown(levels):
+    return f"not one of {', '.join(levels)}"
+
+
+def _parse_number(value):
+    """(float, is_blank) for one raw value; unparseable text gives (nan, False)."""
+    if value is None or value is pd.NA or value != value:   # None / NA / NaN
+        return np.nan, True
+    if isinstance(value, (int, float, np.number, np.bool_)):
+        # bools count as 0/1, as Python does; factorize hashes True and 1 together anyway
+        return float(value), False
+    text = str(value).strip()
+    if not text:
+        return np.nan, True
+    try:
+        return float(text), False
+    except ValueError:
+        return np.nan, False
+
+
+def _match_level(value, levels, canonical):
+    """(level code, was_normalized) for one raw value; len(levels) means blank, len(levels) + 1 unknown."""
+    if value is None or value is pd.NA or value != value:
+        return len(levels), False
+    text = str(value).strip()
+    if not text:
+        return len(levels), False
+    code = canonical.get(text.casefold(), len(levels) + 1)
+    return code, code < len(levels) and levels[code] != value
+
+
+# ==========================================
+# 2. Column Checks
+# ==========================================
+def _parse_numbers(column):
+    """(float values, blank mask) of a text / mixed column, parsing each distinct value once."""
+    codes, uniques = pd.factorize(column)
+    parsed = [_parse_number(value) for value in uniques] + [(np.nan, True)]   # factorize codes missing as -1
+    values = np.array([number for number, _ in parsed], dtype=float)
+    blank  = np.array([is_blank for _, is_blank in parsed])
+    return values[codes], blank[codes]
+
+
+def check_numeric(column, bounds):
+    """(coerced float array, {problem: mask}) for one numeric column."""
+    if pd.api.types.is_numeric_dtype(column.dtype):
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+        blank  = np.isnan(values)
+        bad    = np.zeros(len(values), dtype=bool)
+    else:
+        values, blank = _parse_numbers(column)
+        bad = np.isnan(values) & ~blank
+    lo, hi = bounds
+    with np.errstate(invalid='ignore'):
+        outside = ~(bad | blank) & ~((values >= lo) & (values <= hi))
+    problems = {NOT_A_NUMBER: bad, _outside(bounds): outside, MISSING: blank}
+    return np.where(bad | outside, np.nan, values), problems
+
+
+def check_categorical(column, levels):
+    """(canonical pd.Categorical, {problem: mask}) for one categorical column.
+
+    The column is factorized once, and each distinct value is matched against
+    the levels after strip + casefold. Matches that needed normalizing are
+    returned under their own key. The result is built from integer codes, so
+    no per-row strings are created.
+    """
+    canonical = {level.casefold(): i for i, level in enumerate(levels)}
+    codes, uniques = pd.factorize(column)
+    blank_code, unknown_code = len(levels), len(levels) + 1
+    matched = [_match_level(value, levels, canonical) for value in uniques] + [(blank_code, False)]
+    lookup  = np.array([code for code, _ in matched], dtype=np.intp)   # factorize codes missing as -1
+    renamed = np.array([was_renamed for _, was_renamed in matched])
+
+    mapped  = lookup[codes]
+    values  = pd.Categorical.from_codes(np.where(mapped < len(levels), mapped, -1), categories=levels)
+    problems = {_unknown(levels): mapped == unknown_code, MISSING: mapped == blank_code, NORMALIZED: renamed[codes]}
+    return values, problems
+
+
+# ==========================================
+# 3. Frame / Record Validation
+# ==========================================
+_WARNINGS = frozenset({MISSING, NORMALIZED})
+
+
+def _severity(problem):
+    return WARNING if problem in _WARNINGS else ERROR
+
+
+def _report_rows(column, problems, severity_of=_severity):
+    # Only flagged cells are materialized, so clean columns cost nothing here
+    pieces = []
+    for problem, mask in problems.items():
+        rows = np.flatnonzero(mask)
+        if rows.size:
+            pieces.append(pd.DataFrame({
+                'row':      column.index[rows],
+                'column':   column.name,
+                'value':    column.iloc[rows].to_numpy(dtype=object),
+                'severity': severity_of(problem),
+                'problem':  problem,
+            }))
+    return pieces
+
+
+def validate_frame(df, check_target=True):
+    """Validate and coerce the 19 model inputs (and Exam_Score) of a roster.
+
+    Raises ValueError if a required column is absent altogether. Otherwise
+    returns a ValidationResult:
+    - frame: a copy with float numerics and categorical columns of the
+      canonical levels. Bad cells are NaN, and extra columns pass through.
+    - errors: one report row per problem cell.
+    - valid: True for rows with no error-level problem in any input.
+    """
+    validate_columns(df)
+    frame  = df.copy()
+    valid  = np.ones(len(df), dtype=bool)
+    pieces = []
+
+    for name in FEATURE_COLUMNS:
+        column = df[name]
+        if name in NUMERIC_FEATURES:
+            values, problems = check_numeric(column, INPUT_BOUNDS[name])
+        else:
+            values, problems = check_categorical(column, CATEGORY_LEVELS[name])
+        frame[name] = values
+        for problem, mask in problems.items():
+            if _severity(problem) == ERROR:
+                valid &= ~mask
+        pieces += _report_rows(column, problems)
+
+    if check_target and TARGET_COLUMN in df.columns:
+        # A bad actual score never blocks scoring; it is blanked so audits skip it
+        column = df[TARGET_COLUMN]
+        values, problems = check_numeric(column, TARGET_BOUNDS)
+        problems.pop(MISSING)
+        frame[TARGET_COLUMN] = values
+        pieces += _report_rows(column, problems, lambda _: WARNING)
+
+    errors = (pd.concat(pieces, ignore_index=True) if pieces
+              else pd.DataFrame({c: pd.Series(dtype=object) for c in REPORT_COLUMNS}))
+    return ValidationResult(frame, errors, valid)
+
+
+_CANONICAL = {name: {level.casefold(): i for i, level in enumerate(levels)} for name, levels in CATEGORY_LEVELS.items()}
+
+# Per-feature results for values already seen, shared across requests: the inputs take few
+# distinct values, so a warm API call is 19 dict hits. Values that compare equal (1, 1.0,
+# True) get identical results, so sharing a slot is safe. Cleared when full, never stale.
+MEMO_LIMIT  = 4096
+_VALUE_MEMO = {name: {} for name in FEATURE_COLUMNS}
+
+
+def check_value(name, value):
+    """(clean value, problem or None) for one cell, by the same rules as the column checks."""
+    if name in INPUT_BOUNDS:
+        bounds = INPUT_BOUNDS[name]
+        number, is_blank = _parse_number(value)
+        if is_blank:
+            return np.nan, MISSING
+        if number != number:
+            return np.nan, NOT_A_NUMBER
+        if not bounds[0] <= number <= bounds[1]:
+            return np.nan, _outside(bounds)
+        return number, None
+    levels = CATEGORY_LEVELS[name]
+    code, was_renamed = _match_level(value, levels, _CANONICAL[name])
+    if code == len(levels):
+        return np.nan, MISSING
+    if code > len(levels):
+        return np.nan, _unknown(levels)
+    return levels[code], NORMALIZED if was_renamed else None
+
+
+def validate_records(records):
+    """(clean records, valid mask, {index: [problem dicts]}) for a list of input dicts (API payloads).
+
+    Only explicit null / blank values are imputed. An absent key is an error,
+    so a misspelt or mis-cased field name cannot turn into a silently imputed
+    input. Payloads are already Python objects, so each column is checked
+    through a memo of its distinct values (the records analogue of factorize).
+    A pandas frame would cost more to build than the checks themselves.
+    """
+    columns, problems = [], {}
+    valid = np.ones(len(records), dtype=bool)
+    for name in FEATURE_COLUMNS:
+        memo, cleaned = _VALUE_MEMO[name], []
+        if len(memo) > MEMO_LIMIT:
+            memo.clear()
+        for i, record in enumerate(records):
+            if name not in record:
+                cleaned.append(np.nan)
+                problems.setdefault(i, []).append({'column': name, 'value': None, 'severity': ERROR,
+                                                   'problem': ABSENT})
+                valid[i] = False
+                continue
+            value = record[name]
+            try:
+                result = memo.get(value)
+            except TypeError:   # unhashable junk such as a list
+                result = None
+            if result is None:
+                result = check_value(name, value)
+                try:
+                    memo[value] = result
+                except TypeError:
+                    pass
+            cleaned.append(result[0])
+            if result[1] is not None:
+                severity = _severity(result[1])
+                problems.setdefault(i, []).append({'column': name, 'value': value, 'severity': severity,
+                                                   'problem': result[1]})
+                if severity == ERROR:
+                    valid[i] = False
+        columns.append(cleaned)
+    clean = [dict(zip(FEATURE_COLUMNS, row)) for row in zip(*columns)]
+    return clean, valid, problems
+
+
+# ==========================================
+# 4. CLI
+# ==========================================
+if __name__ == '__main__':
+    import sys
+    import time
+
+    if len(sys.argv) != 2:
+        sys.exit("usage: python validation.py roster.csv")
+    roster = pd.read_csv(sys.argv[1], dtype=object)
+    t0 = time.perf_counter()
+    result = validate_frame(roster)
+    print(f"Validated {len(roster):,} rows in {time.perf_counter() - t0:.3f} s: {result.summary()}")
+    if len(result.errors):
+        print(result.errors.head(20).to_string(index=False))
@@ -0,0 +1,57 @@
+"""
+EduMetrics AI — What-If Sensitivity Engine
+Scores a grid over one or two numeric inputs around a submitted profile in a
+single batched predict call. The profile is encoded once and broadcast across
+the grid, so the full 41×101 study × attendance sweep is ~4k rows of array
+math rather than thousands of form reruns.
+"""
+import numpy as np
+
+from scoring import NUMERIC_RANGES, clamp_scores
+
+SWEEP_LABELS = {
+    'Hours_Studied':     "Weekly Study Hours",
+    'Attendance':        "Class Attendance (%)",
+    'Previous_Scores':   "Previous Exam Average",
+    'Tutoring_Sessions': "Monthly Tutoring Sessions",
+    'Sleep_Hours':       "Nightly Sleep (hrs)",
+    'Physical_Activity': "Weekly Exercise (hrs)",
+}
+
+
+def default_values(feature):
+    """Every integer step of the sidebar slider for `feature`."""
+    low, high = NUMERIC_RANGES[feature]
+    return np.arange(low, high + 1, dtype=float)
+
+
+def sweep(predictor, input_data, x_feature, x_values=None, y_feature=None, y_values=None):
+    """Score `input_data` with one or two numeric inputs swept over a grid.
+
+    Returns (x_values, y_values, scores) where scores are clamped to 0–100 and
+    shaped (len(x_values),) for a 1-D sweep or (len(y_values), len(x_values))
+    for a 2-D sweep. y_values is None for a 1-D sweep.
+    """
+    features = predictor.numeric_features
+    for feature in (x_feature, y_feature):
+        if feature is not None and feature not in features:
+            raise ValueError(f"Cannot sweep '{feature}': only numeric inputs are supported")
+    if y_feature == x_feature:
+        raise ValueError("Pick two different features for a 2-D sweep")
+
+    x_values = default_values(x_feature) if x_values is None else np.asarray(x_values, dtype=float)
+    if y_feature is not None:
+        y_values = default_values(y_feature) if y_values is None else np.asarray(y_values, dtype=float)
+    ny = 1 if y_feature is None else len(y_values)
+
+    base_numeric, base_codes = predictor.encode_records([input_data])
+    numeric = np.repeat(base_numeric, len(x_values) * ny, axis=0)
+    numeric[:, features.index(x_feature)] = np.tile(x_values, ny)
+    if y_feature is not None:
+        numeric[:, features.index(y_feature)] = np.repeat(y_values, len(x_values))
+    codes = np.broadcast_to(base_codes, (numeric.shape[0], base_codes.shape[1]))
+
+    scores = clamp_scores(predictor.predict_encoded(numeric, codes))
+    if y_feature is None:
+        return x_values, None, scores
+    return x_values, y_values, scores.reshape(ny, len(x_values))